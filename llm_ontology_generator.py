@@ -57,7 +57,6 @@ Outputs (written next to the script):
 from __future__ import annotations
 
 import argparse
-import csv
 import json
 import logging
 import os
@@ -70,6 +69,7 @@ from typing import Any
 # Reuse the engine + worked-example helpers from the prior file.
 # Both files must live in the same directory.
 from ontology_builder import Ontology  # noqa: E402
+from ontology_intake_processor import sample_csv_rows  # noqa: E402
 
 from dotenv import load_dotenv
 from datetime import datetime
@@ -297,6 +297,8 @@ def spec_to_ontology(spec: dict) -> Ontology:
         ont.add_individual(name=ind["name"], types=types)
         declared_inds.add(ind["name"])
 
+    triples: list[tuple[str, str, str]] = []
+    data_triples: list[tuple[str, str, Any]] = []
     for ind in ind_specs:
         name = ind.get("name")
         if name not in declared_inds:
@@ -305,19 +307,18 @@ def spec_to_ontology(spec: dict) -> Ontology:
         for pname, targets in (ind.get("object_props") or {}).items():
             if pname not in ont.object_properties:
                 continue
-            for tgt in targets or []:
-                if tgt not in declared_inds:
-                    continue
-                try:
-                    ont.assert_object(name, pname, tgt)
-                except ValueError as e:
-                    print(f"[skip] {name} {pname} {tgt}: {e}", file=sys.stderr)
+            triples.extend((name, pname, tgt) for tgt in targets or []
+                           if tgt in declared_inds)
         # data properties
         for pname, values in (ind.get("data_props") or {}).items():
             if pname not in ont.data_properties:
                 continue
-            for v in values or []:
-                ont.assert_data(name, pname, v)
+            data_triples.extend((name, pname, v) for v in values or [])
+
+    # One bulk pass; domain/range violations are reported, not raised.
+    report = ont.bulk_load(triples, data_triples, validate="deferred")
+    for s, p, o, reason in report.violations:
+        print(f"[skip] {s} {p} {o}: {reason}", file=sys.stderr)
 
     return ont
 
@@ -327,23 +328,20 @@ def spec_to_ontology(spec: dict) -> Ontology:
 # ---------------------------------------------------------------------------
 
 def sample_csv(path: str, max_rows: int = 8) -> str:
-    """Return a small textual sample of a CSV — header + first N rows."""
+    """Return a small textual sample of a CSV — header, row count and N rows
+    drawn from across the file, read with bounded memory."""
     p = Path(path)
     if not p.exists():
         raise SystemExit(f"Dataset not found: {path}")
-    rows: list[list[str]] = []
-    with p.open(encoding="utf-8", newline="") as f:
-        reader = csv.reader(f)
-        for i, row in enumerate(reader):
-            rows.append(row)
-            if i >= max_rows:
-                break
-    if not rows:
+    sample = sample_csv_rows(p, max_rows)
+    if not sample.header:
         return "(empty file)"
+    rows = [sample.header, *sample.rows]
     width = max(len(r) for r in rows)
     rows = [r + [""] * (width - len(r)) for r in rows]
     header, *body = rows
-    out = ["columns: " + ", ".join(header), "sample rows:"]
+    out = ["columns: " + ", ".join(header), f"rows: {sample.row_count_text()}",
+           "sample rows:"]
     for r in body:
         out.append(" | ".join(r))
     return "\n".join(out)
@@ -447,11 +445,9 @@ def generate(description: str, dataset_path: str | None = None,
     out_path.mkdir(parents=True, exist_ok=True)
 
     (out_path / f"{name}.raw.json").write_text(json.dumps(spec, indent=2), encoding="utf-8")
-    (out_path / f"{name}.ttl").write_text(ont.to_turtle(), encoding="utf-8")
-    (out_path / f"{name}.jsonld").write_text(json.dumps(ont.to_jsonld(), indent=2),
-                                             encoding="utf-8")
-    (out_path / f"{name}.json").write_text(json.dumps(ont.to_dict(), indent=2),
-                                           encoding="utf-8")
+    ont.write_turtle(out_path / f"{name}.ttl")
+    ont.write_jsonld(out_path / f"{name}.jsonld")
+    ont.write_json(out_path / f"{name}.json")
 
     issues = ont.check_consistency()
     print(f"\nOntology '{name}' built:")
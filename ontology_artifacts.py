@@ -0,0 +1,204 @@
+"""
+Ontology Artifact Writer
+========================
+
+Background, debounced persistence of an `Ontology` to its export files:
+``<name>.ttl``, ``.jsonld``, ``.rdf``, ``.nt``, ``.json`` and the
+``.raw.json`` spec.
+
+`ArtifactWriter.schedule()` returns immediately. A worker thread waits
+until no new request has arrived for `delay` seconds, then:
+
+  * skips every format already written at the ontology's current
+    ``version``;
+  * appends the N-Triples delta of the journaled changes to ``.nt`` rather
+    than rewriting it, falling back to a rewrite when a change also removed
+    triples (see `Ontology.delta_ntriples`);
+  * rewrites the other stale formats through a temporary file and a rename,
+    so readers never see a half-written file;
+  * rewrites the raw spec only when its JSON text changed.
+
+If the ontology changes while it is being exported, the pass is queued
+again. Errors are kept on ``last_error`` rather than raised. `written()`
+tells the UI which files are current, so it can serve them instead of
+exporting again; `cancel()` drops a pending request before its ontology is
+closed or replaced.
+
+Usage:
+    from ontology_artifacts import ArtifactWriter
+
+    writer = ArtifactWriter("ontology", delay=0.5)
+    ont.add_class("Pump", parents=["Equipment"])
+    writer.schedule(ont, "mfg", spec)      # returns at once
+    writer.flush()                         # optional: wait for the files
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from ontology_builder import _EXPORTS, Ontology
+
+FORMATS = ("ttl", "jsonld", "rdf", "nt", "json")
+
+
+class ArtifactWriter:
+    """Debounced background writer for one output directory."""
+
+    def __init__(self, out_dir: str | os.PathLike = "ontology", delay: float = 0.5):
+        self.out_dir = Path(out_dir)
+        self.delay = delay
+        self.last_error: Exception | None = None
+        self.files_written = 0
+        self._cond = threading.Condition()
+        self._request: tuple[Ontology, str, str | None] | None = None
+        self._due = 0.0
+        self._busy = False
+        self._generation = 0        # bumped by cancel(), so a retry is not re-queued
+        self._thread: threading.Thread | None = None
+        # What is on disk: the ontology and name it belongs to, the version
+        # each format was written at, and the last raw-spec text.
+        self._ont: Ontology | None = None
+        self._name: str | None = None
+        self._written: dict[str, int] = {}
+        self._spec_text: str | None = None
+
+    def schedule(self, ont: Ontology, name: str, spec: Any = None) -> None:
+        """Queue `ont` for writing as `name`; a newer request replaces it.
+
+        `spec` (the raw generator spec) is serialized here, on the caller's
+        thread, so later in-place edits cannot race the writer.
+        """
+        spec_text = json.dumps(spec, indent=2) if spec is not None else None
+        with self._cond:
+            self._request = (ont, name, spec_text)
+            self._due = time.monotonic() + self.delay
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="artifact-writer",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every scheduled write is on disk; False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._due = min(self._due, time.monotonic())
+            self._cond.notify_all()
+            while self._request is not None or self._busy:
+                left = None if end is None else end - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def cancel(self, timeout: float | None = None) -> bool:
+        """Drop the pending request and wait for a running pass to end;
+        False on timeout. Call before closing or replacing the ontology."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._request = None
+            self._generation += 1
+            self._cond.notify_all()
+            while self._busy:
+                left = None if end is None else end - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def written(self, ont: Ontology, name: str, fmt: str) -> Path | None:
+        """The ``<name>.<fmt>`` file, if it holds `ont` at its current version."""
+        with self._cond:
+            current = (ont is self._ont and name == self._name and not self._busy
+                       and self._written.get(fmt) == ont.version)
+        return self.out_dir / f"{name}.{fmt}" if current else None
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._request is not None or self._busy
+
+    # ------------------------------ worker --------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # Wait for a request and its debounce; cancel() may drop it meanwhile.
+                while self._request is None or (wait := self._due - time.monotonic()) > 0:
+                    self._cond.wait(None if self._request is None else wait)
+                ont, name, spec_text = self._request
+                self._request = None
+                self._busy = True
+                generation = self._generation
+            retry = False
+            try:
+                retry = not self._write(ont, name, spec_text)
+            except RuntimeError:
+                # The UI thread mutated a dict the exporter was iterating.
+                retry = True
+            except Exception as e:  # noqa: BLE001 — surfaced via last_error
+                self.last_error = e
+            with self._cond:
+                if retry and self._request is None and generation == self._generation:
+                    self._request = (ont, name, spec_text)
+                    self._due = time.monotonic() + self.delay
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, ont: Ontology, name: str, spec_text: str | None) -> bool:
+        """One pass; returns False when `ont` changed underneath it."""
+        if ont is not self._ont or name != self._name:
+            self._ont, self._name = ont, name
+            self._written.clear()
+            self._spec_text = None
+            ont.track_changes()     # before the first full .nt write
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        start = ont.version
+
+        for fmt in FORMATS:
+            if self._written.get(fmt) == start:
+                continue
+            path = self.out_dir / f"{name}.{fmt}"
+            if fmt == "nt":
+                # The drained changes only count once they are in the file:
+                # until the append or rewrite succeeds, .nt is marked
+                # unwritten, so a failed pass is followed by a full rewrite.
+                appendable = "nt" in self._written and path.exists()
+                self._written.pop(fmt, None)
+                changes = ont.drain_changes()
+                delta = ont.delta_ntriples(changes) if appendable else None
+                if delta is not None:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(delta)
+                    self._written[fmt] = start
+                    self.files_written += 1
+                    continue
+            self._replace(path, lambda tmp: getattr(ont, _EXPORTS[fmt])(tmp))
+            self._written[fmt] = start
+
+        if spec_text is not None and spec_text != self._spec_text:
+            self._replace(self.out_dir / f"{name}.raw.json",
+                          lambda tmp: tmp.write_text(spec_text, encoding="utf-8"))
+            self._spec_text = spec_text
+
+        if ont.version != start:
+            # Formats written mid-change may be stale; the next pass redoes them.
+            for fmt in FORMATS:
+                if fmt != "nt":
+                    self._written.pop(fmt, None)
+            return False
+        return True
+
+    def _replace(self, path: Path, write: Any) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        write(tmp)
+        os.replace(tmp, path)
+        self.files_written += 1
@@ -0,0 +1,428 @@
+"""
+Ontology Benchmarks
+===================
+
+Measurements for the `Ontology` engine in ``ontology_builder.py`` and the
+alternative backends next to it, reported as machine-readable JSON.
+
+  * ``suite`` — builds a synthetic ontology (see `SyntheticSpec`) one call
+    at a time and times ``add_individual``, ``assert_object``,
+    ``assert_data``, ``instances_of``, ``related`` (direct and transitive),
+    ``check_consistency`` and every ``write_*`` exporter. Each step reports
+    throughput, the process peak RSS and, with ``--trace-memory``, the
+    traced peak allocation of that step.
+  * ``scale`` — runs the suite at several sizes and fits a log-log slope
+    per step: ~1.0 is linear, noticeably above that is superlinear.
+  * ``memory`` — traced bytes per individual for a mostly sparse A-Box
+    (every individual typed, a configurable share with one edge and one
+    data value), per backend.
+
+``--baseline old.json`` compares a ``suite`` or ``scale`` run with an
+earlier one and exits with status 1 when any step slowed down by more
+than ``--tolerance``.
+
+Run:
+    python ontology_benchmark.py suite --individuals 50000 --out bench.json
+    python ontology_benchmark.py scale --sizes 1000,10000,100000
+    python ontology_benchmark.py memory --individuals 1000000 --dense 0.1
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import textwrap
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Iterator
+
+from ontology_builder import Ontology
+from ontology_store import CompactOntology
+
+BACKENDS: dict[str, type[Ontology]] = {
+    "ontology": Ontology,
+    "compact": CompactOntology,
+}
+
+EXPORTERS = ("turtle", "ntriples", "jsonld", "json", "rdf_xml")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic ontologies
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SyntheticSpec:
+    """Shape of a generated ontology."""
+    depth: int = 3                 # class levels below the root
+    breadth: int = 4               # subclasses per class
+    individuals: int = 10_000
+    edge_density: float = 2.0      # `linksTo` edges per individual
+    chain_length: int = 20         # individuals per `partOf` chain (transitive)
+    values: float = 1.0            # `reading` values per individual
+    violations: float = 0.001      # share of individuals typed as both disjoint leaves
+    seed: int = 0
+
+
+@dataclass
+class SyntheticABox:
+    """Assertions for a `SyntheticSpec`, in the order the suite applies them."""
+    types: list[tuple[str, tuple[str, ...]]] = field(default_factory=list)
+    edges: list[tuple[str, str, str]] = field(default_factory=list)
+    values: list[tuple[str, str, float]] = field(default_factory=list)
+    chain_heads: list[str] = field(default_factory=list)
+
+
+def synthetic_tbox(ont: Ontology, spec: SyntheticSpec) -> list[list[str]]:
+    """Declare the class tree and properties; returns the classes per level."""
+    ont.add_class("Entity")
+    levels = [["Entity"]]
+    for depth in range(1, spec.depth + 1):
+        level = []
+        for parent in levels[-1]:
+            for _ in range(spec.breadth):
+                name = f"C{depth}_{len(level)}"
+                ont.add_class(name, parents=[parent])
+                level.append(name)
+        levels.append(level)
+    if len(levels[-1]) > 1:
+        a, b = levels[-1][:2]
+        ont.classes[a].disjoint_with.add(b)
+        ont.classes[b].disjoint_with.add(a)
+    ont.add_object_property("linksTo", "Entity", "Entity")
+    ont.add_object_property("partOf", "Entity", "Entity", transitive=True)
+    ont.add_data_property("reading", "Entity", "xsd:double")
+    return levels
+
+
+def synthetic_abox(spec: SyntheticSpec, levels: list[list[str]]) -> SyntheticABox:
+    """Deterministic individuals, edges and values for `spec`."""
+    rng = random.Random(spec.seed)
+    leaves = levels[-1]
+    n = spec.individuals
+    names = [f"i{k}" for k in range(n)]
+    out = SyntheticABox()
+
+    for name in names:
+        if len(leaves) > 1 and rng.random() < spec.violations:
+            out.types.append((name, (leaves[0], leaves[1])))
+        else:
+            out.types.append((name, (leaves[rng.randrange(len(leaves))],)))
+
+    step = max(spec.chain_length, 1)
+    for start in range(0, n, step):
+        out.chain_heads.append(names[start])
+        out.edges.extend((names[k], "partOf", names[k + 1])
+                         for k in range(start, min(start + step, n) - 1))
+    if n:
+        out.edges.extend((names[rng.randrange(n)], "linksTo", names[rng.randrange(n)])
+                         for _ in range(round(n * spec.edge_density)))
+        out.values.extend((names[rng.randrange(n)], "reading", round(rng.random() * 100, 3))
+                          for _ in range(round(n * spec.values)))
+    return out
+
+
+def synthetic_ontology(spec: SyntheticSpec | None = None,
+                       backend: str = "ontology") -> Ontology:
+    """A ready-made ontology for `spec`, loaded through `bulk_load`."""
+    spec = spec or SyntheticSpec()
+    ont = BACKENDS[backend]()
+    abox = synthetic_abox(spec, synthetic_tbox(ont, spec))
+    ont.bulk_load(abox.edges, abox.values, validate="off",
+                  types=[(name, c) for name, classes in abox.types for c in classes])
+    return ont
+
+
+# ---------------------------------------------------------------------------
+# Suite
+# ---------------------------------------------------------------------------
+
+class _CountingSink:
+    """Text sink for the exporters that keeps only the character count."""
+
+    def __init__(self) -> None:
+        self.chars = 0
+
+    def write(self, s: str) -> int:
+        self.chars += len(s)
+        return len(s)
+
+
+def _peak_rss() -> int | None:
+    """Process high-water RSS in bytes (None where `resource` is unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def _step(results: list[dict], op: str, count: int, trace: bool) -> Iterator[dict]:
+    row: dict[str, Any] = {"op": op, "count": count}
+    gc.collect()
+    if trace:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    yield row
+    seconds = time.perf_counter() - start
+    row["seconds"] = round(seconds, 6)
+    row["ops_per_sec"] = round(count / seconds, 1) if seconds > 0 else None
+    row["peak_rss_bytes"] = _peak_rss()
+    if trace:
+        row["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1] - before
+    results.append(row)
+
+
+def run_suite(spec: SyntheticSpec | None = None, backend: str = "ontology",
+              trace_memory: bool = False, sample: int = 1000) -> dict[str, Any]:
+    """Time every benchmarked operation on a fresh synthetic ontology.
+
+    `sample` caps the number of ``related`` calls. With `trace_memory` each
+    step also reports its traced peak; tracing slows the timings down.
+    """
+    spec = spec or SyntheticSpec()
+    ont = BACKENDS[backend]()
+    levels = synthetic_tbox(ont, spec)
+    abox = synthetic_abox(spec, levels)
+    rng = random.Random(spec.seed + 1)
+    subjects = [name for name, _ in abox.types]
+    probes = rng.sample(subjects, min(sample, len(subjects)))
+    heads = abox.chain_heads[:sample]
+    steps: list[dict] = []
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with _step(steps, "add_individual", len(abox.types), trace_memory):
+            for name, classes in abox.types:
+                ont.add_individual(name, classes)
+        with _step(steps, "assert_object", len(abox.edges), trace_memory):
+            for s, p, o in abox.edges:
+                ont.assert_object(s, p, o)
+        with _step(steps, "assert_data", len(abox.values), trace_memory):
+            for s, p, v in abox.values:
+                ont.assert_data(s, p, v)
+        with _step(steps, "instances_of", len(ont.classes), trace_memory) as row:
+            row["results"] = sum(len(ont.instances_of(c)) for c in ont.classes)
+        with _step(steps, "related", len(probes), trace_memory) as row:
+            row["results"] = sum(len(ont.related(s, "linksTo")) for s in probes)
+        with _step(steps, "related_transitive", len(heads), trace_memory) as row:
+            row["results"] = sum(len(ont.related(s, "partOf", transitive=True))
+                                 for s in heads)
+        with _step(steps, "check_consistency", len(subjects), trace_memory) as row:
+            row["results"] = len(ont.check_consistency())
+        for fmt in EXPORTERS:
+            with _step(steps, f"write_{fmt}", len(subjects), trace_memory) as row:
+                sink = _CountingSink()
+                getattr(ont, f"write_{fmt}")(sink)
+                row["chars"] = sink.chars
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "spec": asdict(spec),
+        "classes": len(ont.classes),
+        "edges": len(abox.edges),
+        "steps": steps,
+    }
+
+
+def run_scaling(sizes: list[int], spec: SyntheticSpec | None = None,
+                backend: str = "ontology", trace_memory: bool = False) -> dict[str, Any]:
+    """`run_suite` at each individual count, plus per-step scaling curves."""
+    spec = spec or SyntheticSpec()
+    runs = [run_suite(replace(spec, individuals=n), backend, trace_memory)
+            for n in sizes]
+    curves: dict[str, dict[str, Any]] = {}
+    for row in runs[0]["steps"] if runs else ():
+        op = row["op"]
+        seconds = [next(s["seconds"] for s in r["steps"] if s["op"] == op) for r in runs]
+        curves[op] = {"seconds": seconds, "exponent": _loglog_slope(sizes, seconds)}
+    return {"backend": backend, "sizes": sizes, "runs": runs, "curves": curves}
+
+
+def _loglog_slope(xs: list[int], ys: list[float]) -> float | None:
+    """Least-squares slope of log(y) over log(x), ignoring zero timings."""
+    pts = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    var = sum((x - mx) ** 2 for x, _ in pts)
+    if not var:
+        return None
+    return round(sum((x - mx) * (y - my) for x, y in pts) / var, 3)
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> list[dict]:
+    """Steps of `current` more than `tolerance` slower than in `baseline`.
+
+    Both are `report()` documents of a ``suite`` or ``scale`` run; steps are
+    matched by backend, individual count and op name.
+    """
+    def timings(doc: dict) -> dict[tuple, float]:
+        runs = doc.get("runs") or [r for s in doc.get("scales", ()) for r in s["runs"]]
+        return {(r["backend"], r["spec"]["individuals"], s["op"]): s["seconds"]
+                for r in runs for s in r["steps"]}
+
+    before = timings(baseline)
+    slower = []
+    for key, seconds in timings(current).items():
+        old = before.get(key)
+        if old and seconds > old * (1 + tolerance):
+            slower.append({"backend": key[0], "individuals": key[1], "op": key[2],
+                           "baseline_seconds": old, "seconds": seconds,
+                           "ratio": round(seconds / old, 2)})
+    return slower
+
+
+def report(**sections: Any) -> dict[str, Any]:
+    """Wrap results with the interpreter and platform they were measured on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        **sections,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Memory
+# ---------------------------------------------------------------------------
+
+def memory_per_individual(backend: str = "ontology", individuals: int = 100_000,
+                          dense: float = 0.1) -> dict[str, Any]:
+    """Traced A-Box bytes per individual for `individuals` typed individuals,
+    of which a `dense` fraction also carry one edge and one data value."""
+    ont = BACKENDS[backend]()
+    ont.add_class("Asset")
+    ont.add_object_property("feeds", "Asset", "Asset")
+    ont.add_data_property("tag", "Asset")
+    names = [f"asset_{i}" for i in range(individuals)]   # keys are not counted
+    every = max(1, round(1 / dense)) if dense > 0 else 0
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for name in names:
+            ont.add_individual(name, types=("Asset",))
+        if every:
+            for i in range(0, individuals, every):
+                ont.assert_object(names[i], "feeds", names[(i + 1) % individuals])
+                ont.assert_data(names[i], "tag", i)
+        gc.collect()
+        used, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "backend": backend,
+        "individuals": individuals,
+        "dense": dense,
+        "bytes": used - base,
+        "peak_bytes": peak - base,
+        "bytes_per_individual": round((used - base) / max(individuals, 1), 1),
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _spec_arguments(p: argparse.ArgumentParser) -> None:
+    d = SyntheticSpec()
+    p.add_argument("--individuals", type=int, default=d.individuals)
+    p.add_argument("--depth", type=int, default=d.depth, help="Class levels below the root.")
+    p.add_argument("--breadth", type=int, default=d.breadth, help="Subclasses per class.")
+    p.add_argument("--edge-density", type=float, default=d.edge_density,
+                   help="linksTo edges per individual.")
+    p.add_argument("--chain-length", type=int, default=d.chain_length,
+                   help="Individuals per transitive partOf chain.")
+    p.add_argument("--values", type=float, default=d.values,
+                   help="Data values per individual.")
+    p.add_argument("--seed", type=int, default=d.seed)
+    p.add_argument("--backend", choices=sorted(BACKENDS), action="append",
+                   help="Backend to measure; repeatable (default: ontology).")
+    p.add_argument("--trace-memory", action="store_true",
+                   help="Report traced peak bytes per step (slows the timings).")
+    p.add_argument("--out", help="Write the JSON report here instead of stdout.")
+    p.add_argument("--baseline", help="Earlier JSON report to compare against.")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="Allowed slowdown before a step counts as a regression (default: 0.25).")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the ontology engine; results are printed as JSON.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=textwrap.dedent("""\
+            examples:
+              python ontology_benchmark.py suite --individuals 50000
+              python ontology_benchmark.py scale --sizes 1000,10000,100000 --out scale.json
+              python ontology_benchmark.py suite --baseline bench.json --tolerance 0.2
+              python ontology_benchmark.py memory --individuals 1000000 --backend compact
+        """),
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    _spec_arguments(sub.add_parser("suite", help="Time every operation at one size."))
+    scale = sub.add_parser("scale", help="Run the suite at several sizes.")
+    _spec_arguments(scale)
+    scale.add_argument("--sizes", default="1000,10000,100000",
+                       help="Comma-separated individual counts (default: 1000,10000,100000).")
+    mem = sub.add_parser("memory", help="Bytes per individual for a sparse A-Box.")
+    mem.add_argument("--individuals", type=int, default=100_000)
+    mem.add_argument("--dense", type=float, default=0.1,
+                     help="Share of individuals with one edge and one value (default: 0.1).")
+    mem.add_argument("--backend", choices=sorted(BACKENDS), action="append",
+                     help="Backend to measure; repeatable (default: all).")
+    mem.add_argument("--out", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args()
+
+    if args.command == "memory":
+        doc = report(memory=[memory_per_individual(b, args.individuals, args.dense)
+                             for b in args.backend or BACKENDS])
+    else:
+        spec = SyntheticSpec(depth=args.depth, breadth=args.breadth,
+                             individuals=args.individuals, edge_density=args.edge_density,
+                             chain_length=args.chain_length, values=args.values,
+                             seed=args.seed)
+        backends = args.backend or ["ontology"]
+        if args.command == "suite":
+            doc = report(runs=[run_suite(spec, b, args.trace_memory) for b in backends])
+        else:
+            sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+            doc = report(scales=[run_scaling(sizes, spec, b, args.trace_memory)
+                                 for b in backends])
+
+    regressions = None
+    if getattr(args, "baseline", None):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = doc["regressions"] = compare(doc, json.load(f), args.tolerance)
+
+    text = json.dumps(doc, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ Ontology Builder — Single-File Reference Implementation
 A self-contained ontology builder demonstrating the core concepts of an
 ontology: classes, properties (object + data), individuals, axioms,
 relationships, simple reasoning (subclass inference, domain/range checks,
-transitive closure), and export to RDF/OWL (Turtle) and JSON-LD.
+transitive closure), and export to RDF/OWL — Turtle, N-Triples and
+RDF/XML — and JSON-LD. Every format is written natively, streaming from the
+in-memory model; `rdflib`, when installed, is only used to validate RDF/XML
+output on request (``to_rdf_xml(validate=True)``).
 
 This first version intentionally has NO Microsoft Fabric dependency so it
 runs anywhere with Python 3.10+. Integration points for Fabric (Lakehouse,
@@ -27,16 +30,53 @@ Outputs:
 
 from __future__ import annotations
 
+import gzip
+import io
+import itertools
 import json
-from dataclasses import dataclass, field
-from typing import Any, Iterable
+import os
+import re
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+_NO_CLASSES: frozenset[str] = frozenset()
+
+
+class _EmptyProps(dict):
+    """The shared, immutable empty map behind `_NO_PROPS`."""
+
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("shared empty property map; assign a new dict instead")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    setdefault = update = pop = popitem = clear = _immutable
+
+    def __copy__(self) -> "_EmptyProps":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "_EmptyProps":
+        return self
+
+    def __reduce__(self) -> str:
+        return "_NO_PROPS"
+
+
+# Default for `Individual.object_props` / `data_props`: sparse individuals
+# share this one map instead of allocating two empty dicts each. Writers
+# replace it with a real dict on first use (see `_add_edge`, `_store_value`).
+_NO_PROPS: dict = _EmptyProps()
 
 
 # ---------------------------------------------------------------------------
 # Core ontology primitives
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class OntClass:
     """A concept / type. Equivalent to OWL Class."""
     name: str
@@ -45,7 +85,7 @@ class OntClass:
     disjoint_with: set[str] = field(default_factory=set)
 
 
-@dataclass
+@dataclass(slots=True)
 class ObjectProperty:
     """A relationship between two individuals. Equivalent to OWL ObjectProperty."""
     name: str
@@ -58,7 +98,7 @@ class ObjectProperty:
     comment: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DataProperty:
     """An attribute on an individual. Equivalent to OWL DatatypeProperty."""
     name: str
@@ -67,13 +107,230 @@ class DataProperty:
     comment: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Individual:
-    """An instance / named entity belonging to one or more classes."""
+    """An instance / named entity belonging to one or more classes.
+
+    The property maps start out as the shared read-only `_NO_PROPS`; assign
+    a fresh dict before adding to one (the `Ontology` writers do this).
+    """
     name: str
     types: set[str] = field(default_factory=set)
-    object_props: dict[str, set[str]] = field(default_factory=dict)
-    data_props: dict[str, list[Any]] = field(default_factory=dict)
+    object_props: dict[str, set[str]] = field(default_factory=lambda: _NO_PROPS)
+    data_props: dict[str, list[Any]] = field(default_factory=lambda: _NO_PROPS)
+
+
+@dataclass
+class BulkLoadReport:
+    """Outcome of `Ontology.bulk_load`.
+
+    `violations` holds ``(subject, predicate, object, reason)`` for every
+    assertion that was rejected; rejected assertions are not stored.
+    """
+    object_triples: int = 0        # new object-property edges stored
+    data_triples: int = 0          # data values stored
+    violations: list[tuple[str, str, Any, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+
+# ---------------------------------------------------------------------------
+# Materialized transitive closure
+# ---------------------------------------------------------------------------
+
+class _TransitiveClosure:
+    """
+    Reachability index for one object property (in one direction).
+
+    The edge graph is condensed into strongly connected components (Tarjan),
+    then each component gets interval labels over a post-order numbering of a
+    spanning forest of the condensed DAG. Tree-shaped hierarchies (partOf,
+    locatedIn, bills of materials) need one interval per node, and a query
+    is a handful of list slices, independent of graph size.
+
+    Edges asserted after the build go into a small overlay that is folded in
+    at query time; once the overlay grows past `REBUILD_AFTER` the owner
+    drops the index and it is rebuilt on the next query.
+    """
+
+    REBUILD_AFTER = 4096
+
+    def __init__(self, edges: Iterable[tuple[str, str]]):
+        self.overlay: dict[str, set[str]] = {}
+        self.pending = 0
+        self._build(edges)
+
+    # ----------------------------- build ----------------------------------
+
+    def _build(self, edges: Iterable[tuple[str, str]]) -> None:
+        adj: dict[str, list[str]] = {}
+        for s, o in edges:
+            adj.setdefault(s, []).append(o)
+            adj.setdefault(o, [])
+
+        # Iterative Tarjan. Components come out sinks-first, so every
+        # successor of component c has an id lower than c.
+        comp: dict[str, int] = {}
+        members: list[list[str]] = []
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        for root in adj:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(adj[root]))]
+            while work:
+                v, it = work[-1]
+                for w in it:
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(adj[w])))
+                        break
+                    if w in on_stack and index[w] < low[v]:
+                        low[v] = index[w]
+                else:
+                    work.pop()
+                    if work and low[v] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[v]
+                    if low[v] == index[v]:
+                        group: list[str] = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            comp[w] = len(members)
+                            group.append(w)
+                            if w == v:
+                                break
+                        members.append(group)
+
+        n = len(members)
+        succ: list[set[int]] = [set() for _ in range(n)]
+        cyclic = [len(g) > 1 for g in members]
+        has_pred = [False] * n
+        for s, targets in adj.items():
+            cs = comp[s]
+            for o in targets:
+                co = comp[o]
+                if co == cs:
+                    cyclic[cs] = True
+                else:
+                    succ[cs].add(co)
+                    has_pred[co] = True
+
+        # Post-order numbering of a spanning forest: the subtree of c owns the
+        # contiguous range [enter[c], post[c]].
+        enter = [0] * n
+        post = [0] * n
+        by_post: list[int] = []
+        visited = [False] * n
+        for root in range(n - 1, -1, -1):
+            if has_pred[root] or visited[root]:
+                continue
+            visited[root] = True
+            enter[root] = len(by_post)
+            work2 = [(root, iter(succ[root]))]
+            while work2:
+                c, it2 = work2[-1]
+                for d in it2:
+                    if not visited[d]:
+                        visited[d] = True
+                        enter[d] = len(by_post)
+                        work2.append((d, iter(succ[d])))
+                        break
+                else:
+                    work2.pop()
+                    post[c] = len(by_post)
+                    by_post.append(c)
+
+        # Interval labels, successors first (ascending component id).
+        intervals: list[tuple[tuple[int, int], ...]] = [()] * n
+        for c in range(n):
+            spans = [(enter[c], post[c])]
+            for d in succ[c]:
+                spans.extend(intervals[d])
+            spans.sort()
+            merged = [spans[0]]
+            for lo, hi in spans[1:]:
+                last_lo, last_hi = merged[-1]
+                if lo <= last_hi + 1:
+                    if hi > last_hi:
+                        merged[-1] = (last_lo, hi)
+                else:
+                    merged.append((lo, hi))
+            intervals[c] = tuple(merged)
+
+        # Flatten member names in post order so an interval maps to one slice.
+        names: list[str] = []
+        start = [0] * (n + 1)
+        for p, c in enumerate(by_post):
+            start[p] = len(names)
+            names.extend(members[c])
+        start[n] = len(names)
+
+        self._comp = comp
+        self._members = members
+        self._cyclic = cyclic
+        self._post = post
+        self._intervals = intervals
+        self._names = names
+        self._start = start
+
+    # ----------------------------- query ----------------------------------
+
+    def _base(self, node: str) -> set[str]:
+        c = self._comp.get(node)
+        if c is None:
+            return set()
+        names, start = self._names, self._start
+        out: set[str] = set()
+        for lo, hi in self._intervals[c]:
+            out.update(names[start[lo]:start[hi + 1]])
+        if not self._cyclic[c]:
+            out.discard(node)
+        return out
+
+    def _reaches(self, src: str, dst: str) -> bool:
+        cs, cd = self._comp.get(src), self._comp.get(dst)
+        if cs is None or cd is None:
+            return False
+        if cs == cd:
+            return self._cyclic[cs]
+        p = self._post[cd]
+        return any(lo <= p <= hi for lo, hi in self._intervals[cs])
+
+    def closure(self, node: str) -> set[str]:
+        """Everything reachable from `node` through one or more edges."""
+        result = self._base(node)
+        if not self.overlay:
+            return result
+        expanded: set[str] = set()
+        while True:
+            todo = [src for src in self.overlay
+                    if src not in expanded and (src == node or src in result)]
+            if not todo:
+                return result
+            for src in todo:
+                expanded.add(src)
+                for tgt in self.overlay[src]:
+                    if tgt not in result:
+                        result.add(tgt)
+                        result |= self._base(tgt)
+
+    def add_edge(self, src: str, dst: str) -> bool:
+        """Record a new edge. Returns False once a rebuild is due."""
+        if self._reaches(src, dst):
+            return True
+        self.overlay.setdefault(src, set()).add(dst)
+        self.pending += 1
+        return self.pending <= self.REBUILD_AFTER
 
 
 # ---------------------------------------------------------------------------
@@ -100,42 +357,111 @@ class Ontology:
         self.data_properties: dict[str, DataProperty] = {}
         self.individuals: dict[str, Individual] = {}
 
+        # Materialized rdfs:subClassOf closure, maintained by add_class().
+        # `_children` is keyed by parent name even when the parent has not been
+        # declared yet, so a late declaration can push its ancestry downwards.
+        self._ancestors: dict[str, frozenset[str]] = {}
+        self._descendants: dict[str, set[str]] = {}
+        self._children: dict[str, set[str]] = {}
+
+        # Inverted type index: class -> individuals asserted *directly* as that
+        # class. Subclass members are folded in at query time via _descendants.
+        self._by_type: dict[str, set[str]] = {}
+
+        # Reverse adjacency: object -> predicate -> subjects. Mirrors every
+        # Individual.object_props edge; only _add_edge() writes to either side.
+        self._incoming: dict[str, dict[str, set[str]]] = {}
+        self._edge_counts: dict[str, int] = {}      # predicate -> stored edges
+
+        # (predicate, inverse?) -> reachability index, built on first
+        # transitive query and kept current (or dropped) by _add_edge().
+        self._closures: dict[tuple[str, bool], _TransitiveClosure] = {}
+
+        # Incremental consistency state. `_violations` caches each offending
+        # individual's messages once a first check has run (None before);
+        # from then on every A-Box write adds the touched individuals to
+        # `_dirty`. T-Box edits are found by diffing the disjointness and
+        # functional-property tables against the copies taken at the last
+        # check, so direct edits to `OntClass.disjoint_with` are seen too.
+        self._violations: dict[str, list[str]] | None = None
+        self._dirty: set[str] = set()
+        self._disjoint_seen: dict[str, frozenset[str]] = {}
+        self._functional_seen: frozenset[str] = frozenset()
+
+        # Rejected assertions from the last `load()` into this ontology.
+        self.load_report: BulkLoadReport | None = None
+
+        # Bumped by every public mutator; `export()` memoizes per version.
+        # With `track_changes()` on, `_journal` also records each change as
+        # a tuple `delta_ntriples` can render, or None where the change
+        # also removed triples (redeclarations, bulk loads).
+        self.version = 0
+        self._journal: deque[tuple | None] | None = None
+        self._exports: dict[str, tuple[int, str]] = {}
+        # Also called with each change, e.g. by `ontology_reasoner.Reasoner`.
+        self._listeners: list[Callable[[tuple | None], None]] = []
+
     # ------------------------------ schema --------------------------------
 
     def add_class(self, name: str, parents: Iterable[str] = (), comment: str = "",
                   disjoint_with: Iterable[str] = ()) -> OntClass:
+        """Declare (or redeclare) a class. Use this rather than mutating
+        `OntClass.parents` directly so the subclass closure stays current."""
         cls = OntClass(name=name, parents=set(parents), comment=comment,
                        disjoint_with=set(disjoint_with))
+        old = self.classes.get(name)
         self.classes[name] = cls
+        self._reindex_class(name, old.parents if old else ())
+        self._changed(None if old else ("class", name))
         return cls
 
     def add_object_property(self, name: str, domain: str | None = None,
                             range_: str | None = None, **kwargs) -> ObjectProperty:
         prop = ObjectProperty(name=name, domain=domain, range_=range_, **kwargs)
+        new = name not in self.object_properties
         self.object_properties[name] = prop
+        self._changed(("object_property", name) if new else None)
         # Make inverse symmetric in registration: if A inverseOf B,
         # ensure B inverseOf A so assertions in either direction propagate.
         if prop.inverse_of and prop.inverse_of in self.object_properties:
             other = self.object_properties[prop.inverse_of]
             if not other.inverse_of:
                 other.inverse_of = name
+                self._changed(("object_property", other.name))
         return prop
 
     def add_data_property(self, name: str, domain: str | None = None,
                           datatype: str = "xsd:string", comment: str = "") -> DataProperty:
         prop = DataProperty(name=name, domain=domain, datatype=datatype, comment=comment)
+        new = name not in self.data_properties
         self.data_properties[name] = prop
+        self._changed(("data_property", name) if new else None)
         return prop
 
     # ------------------------------ A-Box ---------------------------------
 
     def add_individual(self, name: str, types: Iterable[str] = ()) -> Individual:
+        types = set(types)
         for t in types:
             if t not in self.classes:
                 raise ValueError(f"Unknown class '{t}' for individual '{name}'")
-        ind = Individual(name=name, types=set(types))
-        self.individuals[name] = ind
-        return ind
+        if name in self.individuals:
+            # Redeclaring drops the old types and outgoing edges.
+            self._closures.clear()
+            self._changed(None)
+        else:
+            self._changed(("individual", name))
+        self._touch((name,))
+        return self._store_individual(name, types)
+
+    def add_type(self, individual: str, cls: str) -> None:
+        """Assert an extra rdf:type on an existing individual."""
+        self._check_individual(individual)
+        if cls not in self.classes:
+            raise ValueError(f"Unknown class '{cls}' for individual '{individual}'")
+        self._touch((individual,))
+        self._store_type(individual, cls)
+        self._changed(("type", individual, cls))
 
     def assert_object(self, subject: str, predicate: str, object_: str) -> None:
         self._check_individual(subject)
@@ -154,60 +480,174 @@ class Ontology:
                 f"Range violation: {object_} is not a {prop.range_} for {predicate}"
             )
 
-        self.individuals[subject].object_props.setdefault(predicate, set()).add(object_)
+        self._add_edge(subject, predicate, object_)
+        self._touch((subject, object_) if prop.symmetric or prop.inverse_of else (subject,))
+        self._changed(("edge", subject, predicate, object_))
 
         # Symmetric properties: assert inverse direction automatically.
         if prop.symmetric:
-            self.individuals[object_].object_props.setdefault(predicate, set()).add(subject)
+            self._add_edge(object_, predicate, subject)
+            self._changed(("edge", object_, predicate, subject))
 
         # Inverse properties: assert the inverse triple automatically.
         if prop.inverse_of:
-            self.individuals[object_].object_props.setdefault(prop.inverse_of, set()).add(subject)
+            self._add_edge(object_, prop.inverse_of, subject)
+            self._changed(("edge", object_, prop.inverse_of, subject))
 
     def assert_data(self, subject: str, predicate: str, value: Any) -> None:
         self._check_individual(subject)
         if predicate not in self.data_properties:
             raise ValueError(f"Unknown data property '{predicate}'")
-        self.individuals[subject].data_props.setdefault(predicate, []).append(value)
+        self._store_value(subject, predicate, value)
+        self._changed(("value", subject, predicate, value))
+
+    def bulk_load(self, triples: Iterable[tuple[str, str, str]] = (),
+                  data_triples: Iterable[tuple[str, str, Any]] = (),
+                  validate: str = "deferred",
+                  types: Iterable[tuple[str, str]] = ()) -> BulkLoadReport:
+        """
+        Ingest many assertions in one pass.
+
+        `types` is an optional iterable of ``(individual, class)`` pairs that
+        are applied first, declaring individuals that do not exist yet.
+        `triples` are object-property assertions and `data_triples` data
+        values. Triples are grouped by predicate; the domain/range check then
+        runs once per predicate as set operations against the class index,
+        instead of once per triple.
+
+        validate:
+          * ``"deferred"`` — reject violating triples, store the rest, and
+            report the rejects (never raises).
+          * ``"strict"``   — raise ValueError if anything would be rejected;
+            nothing from `triples` / `data_triples` is stored.
+          * ``"off"``      — skip the domain/range pass. Unknown individuals
+            and properties are still reported, since they cannot be stored.
+        """
+        if validate not in ("deferred", "strict", "off"):
+            raise ValueError(f"validate must be 'deferred', 'strict' or 'off', not {validate!r}")
+        report = BulkLoadReport()
+        self._changed(None)
+
+        for name, cls in types:
+            if cls not in self.classes:
+                report.violations.append((name, "rdf:type", cls, f"Unknown class '{cls}'"))
+                continue
+            self._touch((name,))
+            if name in self.individuals:
+                self._store_type(name, cls)
+            else:
+                self._store_individual(name, {cls})
+
+        # ---- group by predicate, rejecting what cannot be stored at all ----
+        by_pred: dict[str, list[tuple[str, str]]] = {}
+        for s, p, o in triples:
+            if p not in self.object_properties:
+                report.violations.append((s, p, o, f"Unknown object property '{p}'"))
+            elif s not in self.individuals:
+                report.violations.append((s, p, o, f"Unknown individual '{s}'"))
+            elif o not in self.individuals:
+                report.violations.append((s, p, o, f"Unknown individual '{o}'"))
+            else:
+                by_pred.setdefault(p, []).append((s, o))
+
+        values: list[tuple[str, str, Any]] = []
+        for s, p, v in data_triples:
+            if p not in self.data_properties:
+                report.violations.append((s, p, v, f"Unknown data property '{p}'"))
+            elif s not in self.individuals:
+                report.violations.append((s, p, v, f"Unknown individual '{s}'"))
+            else:
+                values.append((s, p, v))
+
+        # ---- one domain/range pass per predicate ---------------------------
+        if validate != "off":
+            members: dict[str, set[str]] = {}
+
+            def _members(cls: str) -> set[str]:
+                if cls not in members:
+                    members[cls] = set(self.iter_instances(cls))
+                return members[cls]
+
+            for p, pairs in by_pred.items():
+                prop = self.object_properties[p]
+                bad_s = {s for s, _ in pairs} - _members(prop.domain) if prop.domain else ()
+                bad_o = {o for _, o in pairs} - _members(prop.range_) if prop.range_ else ()
+                if not (bad_s or bad_o):
+                    continue
+                kept: list[tuple[str, str]] = []
+                for s, o in pairs:
+                    if s in bad_s:
+                        report.violations.append(
+                            (s, p, o, f"Domain violation: {s} is not a {prop.domain} for {p}"))
+                    elif o in bad_o:
+                        report.violations.append(
+                            (s, p, o, f"Range violation: {o} is not a {prop.range_} for {p}"))
+                    else:
+                        kept.append((s, o))
+                by_pred[p] = kept
+
+        if validate == "strict" and report.violations:
+            first = report.violations[0][3]
+            raise ValueError(f"{len(report.violations)} bulk-load violation(s); first: {first}")
+
+        # ---- store, expanding symmetric / inverse once per predicate -------
+        for p, pairs in by_pred.items():
+            prop = self.object_properties[p]
+            self._touch(s for s, _ in pairs)
+            if prop.symmetric or prop.inverse_of:
+                self._touch(o for _, o in pairs)
+            report.object_triples += self._add_edges(p, pairs)
+            if prop.symmetric:
+                report.object_triples += self._add_edges(p, [(o, s) for s, o in pairs])
+            if prop.inverse_of:
+                report.object_triples += self._add_edges(prop.inverse_of, [(o, s) for s, o in pairs])
+        for s, p, v in values:
+            self._store_value(s, p, v)
+        report.data_triples = len(values)
+        return report
 
     # ------------------------------ reasoning -----------------------------
 
     def superclasses_of(self, cls: str) -> set[str]:
         """Transitive closure of rdfs:subClassOf."""
-        if cls not in self.classes:
-            return set()
-        seen, stack = set(), [cls]
-        while stack:
-            c = stack.pop()
-            for p in self.classes[c].parents:
-                if p not in seen:
-                    seen.add(p)
-                    stack.append(p)
-        return seen
+        return set(self._ancestors.get(cls, ()))
+
+    def subclasses_of(self, cls: str) -> set[str]:
+        """Inverse of `superclasses_of`: every class below `cls`."""
+        return set(self._descendants.get(cls, ()))
 
     def _is_instance_of(self, individual: str, cls: str) -> bool:
         if individual not in self.individuals:
             return False
-        types = self.individuals[individual].types
+        types = self._types_of(individual)
         if cls in types:
             return True
-        for t in types:
-            if cls in self.superclasses_of(t):
-                return True
-        return False
+        return not self._descendants.get(cls, _NO_CLASSES).isdisjoint(types)
 
-    def instances_of(self, cls: str, include_subclasses: bool = True) -> list[str]:
-        """All individuals that are (directly or via subclass) of `cls`."""
-        results: list[str] = []
-        for name, ind in self.individuals.items():
-            if cls in ind.types:
-                results.append(name)
-            elif include_subclasses:
-                for t in ind.types:
-                    if cls in self.superclasses_of(t):
-                        results.append(name)
-                        break
-        return sorted(results)
+    def instances_of(self, cls: str, include_subclasses: bool = True,
+                     sort: bool = True) -> list[str]:
+        """All individuals that are (directly or via subclass) of `cls`.
+
+        Pass ``sort=False`` to skip ordering the result, or use
+        `iter_instances` to stream it without building a list.
+        """
+        results = list(self.iter_instances(cls, include_subclasses))
+        return sorted(results) if sort else results
+
+    def iter_instances(self, cls: str, include_subclasses: bool = True) -> Iterator[str]:
+        """Lazily yield instances of `cls`; cost is proportional to the answer."""
+        yield from self._direct_instances(cls)
+        if not include_subclasses:
+            return
+        below = self._descendants.get(cls, ())
+        if not below:
+            return
+        seen = set(self._direct_instances(cls))
+        for sub in below:
+            for name in self._direct_instances(sub):
+                if name not in seen:
+                    seen.add(name)
+                    yield name
 
     def related(self, subject: str, predicate: str, transitive: bool | None = None) -> set[str]:
         """Follow an object property; optionally compute transitive closure."""
@@ -216,51 +656,400 @@ class Ontology:
         prop = self.object_properties.get(predicate)
         is_transitive = prop.transitive if (transitive is None and prop) else bool(transitive)
 
-        direct = self.individuals[subject].object_props.get(predicate, set())
         if not is_transitive:
-            return set(direct)
+            return set(self._objects(subject, predicate))
+        return self._closure(predicate, inverse=False).closure(subject)
 
-        seen, stack = set(direct), list(direct)
-        while stack:
-            cur = stack.pop()
-            for nxt in self.individuals.get(cur, Individual(cur)).object_props.get(predicate, set()):
-                if nxt not in seen:
-                    seen.add(nxt)
-                    stack.append(nxt)
-        return seen
+    def related_inverse(self, object_: str, predicate: str,
+                        transitive: bool | None = None) -> set[str]:
+        """Subjects that reach `object_` via `predicate` (reverse of `related`)."""
+        if object_ not in self.individuals:
+            return set()
+        prop = self.object_properties.get(predicate)
+        is_transitive = prop.transitive if (transitive is None and prop) else bool(transitive)
 
-    def check_consistency(self) -> list[str]:
-        """Return a list of violations found (empty == consistent)."""
-        problems: list[str] = []
-        for ind in self.individuals.values():
-            # Disjointness check.
-            for t in ind.types:
-                cls = self.classes.get(t)
-                if not cls:
-                    continue
-                for d in cls.disjoint_with:
-                    if d in ind.types:
-                        problems.append(f"{ind.name}: classes {t} and {d} are disjoint")
-            # Functional property check.
-            for pname, targets in ind.object_props.items():
-                prop = self.object_properties.get(pname)
-                if prop and prop.functional and len(targets) > 1:
-                    problems.append(
-                        f"{ind.name}: functional property {pname} has {len(targets)} values"
-                    )
-        return problems
+        if not is_transitive:
+            return set(self._subjects(object_, predicate))
+        return self._closure(predicate, inverse=True).closure(object_)
+
+    def query(self, text: str) -> Iterator[dict[str, Any]]:
+        """Run a SPARQL-style basic-graph-pattern query; see ``ontology_query``."""
+        from ontology_query import query
+
+        return query(self, text)
+
+    def incoming(self, object_: str) -> dict[str, set[str]]:
+        """All edges pointing at `object_`, as predicate -> subjects."""
+        return {p: set(subs) for p, subs in self._incoming.get(object_, {}).items() if subs}
+
+    def check_consistency(self, incremental: bool = False,
+                          workers: int | None = None) -> list[str]:
+        """
+        Return a list of violations found (empty == consistent).
+
+        With ``incremental=True`` only individuals touched since the previous
+        check — plus the instances of classes whose disjointness changed and
+        the subjects of properties whose `functional` flag changed — are
+        re-checked, and the result is merged into the cached violations.
+        The first call, or any call without `incremental`, scans everything.
+        Messages are the same as a full scan's; their order may differ.
+
+        ``workers=N`` (N > 1) runs a full scan across N processes. Each worker
+        gets the disjointness table once and then shards of
+        ``(name, types, functional-property value counts)`` rows; results come
+        back in shard order, so the output matches the serial scan exactly.
+        Only worth it for very large A-Boxes — pickling the rows is not free.
+        """
+        affected = self._schema_changes()
+        names = self._dirty | affected
+        self._dirty = set()
+        disjoint, functional = tables = self._consistency_tables()
+        if not incremental or self._violations is None:
+            if workers and workers > 1:
+                self._violations = dict(self._parallel_problems(workers, tables))
+            else:
+                self._violations = {}
+                for ind in self.individuals.values():
+                    found = _row_problems(_consistency_row(ind, functional), disjoint)
+                    if found:
+                        self._violations[ind.name] = found
+        else:
+            for name in names:
+                ind = self.individuals.get(name)
+                found = _row_problems(_consistency_row(ind, functional), disjoint) if ind else []
+                if found:
+                    self._violations[name] = found
+                else:
+                    self._violations.pop(name, None)
+        return [p for found in self._violations.values() for p in found]
+
+    def _individual_problems(self, name: str) -> list[str]:
+        disjoint, functional = self._consistency_tables()
+        return _row_problems(_consistency_row(self.individuals[name], functional), disjoint)
+
+    def _consistency_tables(self) -> tuple[dict[str, tuple[str, ...]], frozenset[str]]:
+        """Picklable snapshot of what the checks read from the T-Box."""
+        disjoint = {n: tuple(c.disjoint_with) for n, c in self.classes.items() if c.disjoint_with}
+        return disjoint, frozenset(n for n, p in self.object_properties.items() if p.functional)
+
+    def _parallel_problems(self, workers: int, tables: tuple) -> Iterator[tuple[str, list[str]]]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        functional = tables[1]
+        inds = list(self.individuals.values())
+        size = max(1, -(-len(inds) // (workers * 4)))
+        # Types go over as tuples: a set rebuilt in another process (with its
+        # own string-hash seed) could iterate in a different order.
+        shards = ([(name, tuple(types), counts)
+                   for name, types, counts in (_consistency_row(i, functional)
+                                               for i in inds[k:k + size])]
+                  for k in range(0, len(inds), size))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_tables,
+                                 initargs=(tables[0],)) as pool:
+            for found in pool.map(_check_shard, shards):
+                yield from found
+
+    def _schema_changes(self) -> set[str]:
+        """Individuals whose checks depend on T-Box entries changed since the last check."""
+        disjoint = {n: frozenset(c.disjoint_with)
+                    for n, c in self.classes.items() if c.disjoint_with}
+        functional = frozenset(n for n, p in self.object_properties.items() if p.functional)
+        affected: set[str] = set()
+        if self._violations is not None:
+            for cls in disjoint.keys() | self._disjoint_seen.keys():
+                if disjoint.get(cls) != self._disjoint_seen.get(cls):
+                    affected.update(self._direct_instances(cls))
+            for pname in functional ^ self._functional_seen:
+                affected.update(s for s, _ in self._edges(pname))
+        self._disjoint_seen, self._functional_seen = disjoint, functional
+        return affected
 
     # ------------------------------ helpers -------------------------------
 
+    def _touch(self, names: Iterable[str]) -> None:
+        """Record A-Box changes for the next incremental consistency check."""
+        if self._violations is not None:
+            self._dirty.update(names)
+
     def _check_individual(self, name: str) -> None:
         if name not in self.individuals:
             raise ValueError(f"Unknown individual '{name}'")
 
+    def _edge_added(self, subject: str, predicate: str, object_: str) -> None:
+        """Keep cached closures current after a new edge is stored."""
+        for inverse in (False, True):
+            tc = self._closures.get((predicate, inverse))
+            if tc is not None and not (tc.add_edge(object_, subject) if inverse
+                                       else tc.add_edge(subject, object_)):
+                del self._closures[(predicate, inverse)]
+
+    def _edge_removed(self, predicate: str) -> None:
+        """Drop cached closures after an edge is removed; they cannot shrink."""
+        self._closures.pop((predicate, False), None)
+        self._closures.pop((predicate, True), None)
+
+    def _closure(self, predicate: str, inverse: bool) -> _TransitiveClosure:
+        """Return (building on demand) the reachability index for `predicate`."""
+        key = (predicate, inverse)
+        tc = self._closures.get(key)
+        if tc is None:
+            edges = self._edges(predicate)
+            if inverse:
+                edges = ((o, s) for s, o in edges)
+            tc = self._closures[key] = _TransitiveClosure(edges)
+        return tc
+
+    def _walk_superclasses(self, cls: str) -> set[str]:
+        """Uncached subClassOf walk; undeclared parents are kept as leaves."""
+        seen, stack = set(), [cls]
+        while stack:
+            c = stack.pop()
+            node = self.classes.get(c)
+            if node is None:
+                continue
+            for p in node.parents:
+                if p not in seen:
+                    seen.add(p)
+                    stack.append(p)
+        return seen
+
+    def _reindex_class(self, name: str, old_parents: Iterable[str]) -> None:
+        """Refresh the closure for `name` and everything that inherits from it.
+
+        Only the subtree under the changed class is re-walked; the rest of the
+        index is untouched, so adding a leaf class costs O(depth).
+        """
+        for p in old_parents:
+            self._children.get(p, set()).discard(name)
+        for p in self.classes[name].parents:
+            self._children.setdefault(p, set()).add(name)
+
+        affected, seen = [name], {name}
+        for c in affected:
+            for child in self._children.get(c, ()):
+                if child not in seen and child in self.classes:
+                    seen.add(child)
+                    affected.append(child)
+
+        for c in affected:
+            new = frozenset(self._walk_superclasses(c))
+            old = self._ancestors.get(c, frozenset())
+            for a in old - new:
+                self._descendants[a].discard(c)
+            for a in new - old:
+                self._descendants.setdefault(a, set()).add(c)
+            self._ancestors[c] = new
+
+    def _drop_schema(self, name: str, keep: Iterable[str] = ()) -> None:
+        """Undeclare the class and properties called `name`, except the
+        kinds (``owl:Class`` ... IRIs) in `keep`. Used by patch removals."""
+        dropped = False
+        if name in self.classes and self._OWL + "Class" not in keep:
+            old = self.classes.pop(name)
+            for p in old.parents:
+                self._children.get(p, set()).discard(name)
+            for a in self._ancestors.pop(name, ()):
+                self._descendants[a].discard(name)
+            # Subclasses now keep `name` only as an undeclared leaf parent.
+            for child in list(self._children.get(name, ())):
+                if child in self.classes:
+                    self._reindex_class(child, self.classes[child].parents)
+            dropped = True
+        if name in self.object_properties and self._OWL + "ObjectProperty" not in keep:
+            del self.object_properties[name]
+            dropped = True
+        if name in self.data_properties and self._OWL + "DatatypeProperty" not in keep:
+            del self.data_properties[name]
+            dropped = True
+        if dropped:
+            self._changed(None)
+
+    # ------------------------------ versioning ----------------------------
+
+    def _changed(self, change: tuple | None = None) -> None:
+        self.version += 1
+        if self._journal is not None:
+            self._journal.append(change)
+        for listener in self._listeners:
+            listener(change)
+
+    def track_changes(self) -> None:
+        """Start (or restart, discarding what was recorded) the change journal."""
+        self._journal = deque()
+
+    def diff(self, other: "Ontology") -> Any:
+        """The `ontology_diff.Patch` that turns this ontology into `other`."""
+        from ontology_diff import diff
+
+        return diff(self, other)
+
+    def apply_patch(self, patch: Any) -> None:
+        """Apply an `ontology_diff.Patch` in place; see ``ontology_diff``."""
+        from ontology_diff import apply_patch
+
+        apply_patch(self, patch)
+
+    def drain_changes(self) -> list[tuple | None]:
+        """Pop every change recorded since the last drain.
+
+        Safe against a concurrent writer thread: entries appended while
+        draining are either returned now or left for the next call.
+        """
+        journal, out = self._journal, []
+        if journal is None:
+            raise ValueError("Change tracking is off; call track_changes() first")
+        while journal:
+            out.append(journal.popleft())
+        return out
+
+    # ------------------------------ storage -------------------------------
+    # All A-Box reads and writes funnel through this block, so an alternative
+    # backend (see `ontology_store.CompactOntology`) only overrides these.
+
+    def _store_individual(self, name: str, types: set[str]) -> Individual:
+        old = self.individuals.get(name)
+        if old is not None:
+            for t in old.types:
+                self._by_type[t].discard(name)
+            # Unhook the old outgoing edges from the reverse index. Edges
+            # pointing *at* `name` are left untouched.
+            for pname, targets in old.object_props.items():
+                self._edge_counts[pname] -= len(targets)
+                for tgt in targets:
+                    self._incoming[tgt][pname].discard(name)
+        ind = Individual(name=name, types=types)
+        self.individuals[name] = ind
+        for t in types:
+            self._by_type.setdefault(t, set()).add(name)
+        return ind
+
+    def _store_type(self, individual: str, cls: str) -> None:
+        self.individuals[individual].types.add(cls)
+        self._by_type.setdefault(cls, set()).add(individual)
+
+    def _store_value(self, subject: str, predicate: str, value: Any) -> None:
+        ind = self.individuals[subject]
+        if ind.data_props is _NO_PROPS:
+            ind.data_props = {}
+        ind.data_props.setdefault(predicate, []).append(value)
+
+    def _add_edge(self, subject: str, predicate: str, object_: str) -> bool:
+        """Store one object-property edge in both directions.
+
+        Returns False when the edge was already present.
+        """
+        ind = self.individuals[subject]
+        if ind.object_props is _NO_PROPS:
+            ind.object_props = {}
+        targets = ind.object_props.setdefault(predicate, set())
+        if object_ in targets:
+            return False
+        targets.add(object_)
+        self._incoming.setdefault(object_, {}).setdefault(predicate, set()).add(subject)
+        self._edge_counts[predicate] = self._edge_counts.get(predicate, 0) + 1
+        self._edge_added(subject, predicate, object_)
+        return True
+
+    def _add_edges(self, predicate: str, pairs: Iterable[tuple[str, str]]) -> int:
+        """Store many edges of one predicate; returns how many were new."""
+        # Cached closures for this predicate are cheaper to rebuild than to
+        # patch edge by edge.
+        self._closures.pop((predicate, False), None)
+        self._closures.pop((predicate, True), None)
+        return sum(self._add_edge(s, predicate, o) for s, o in pairs)
+
+    def _remove_individual(self, name: str) -> None:
+        """Drop an individual with its types, values and edges in both directions."""
+        ind = self.individuals.pop(name)
+        for t in ind.types:
+            self._by_type[t].discard(name)
+        for pname, targets in ind.object_props.items():
+            self._edge_counts[pname] -= len(targets)
+            for tgt in targets:
+                self._incoming[tgt][pname].discard(name)
+        for pname, sources in self._incoming.pop(name, {}).items():
+            self._edge_counts[pname] -= len(sources)
+            for src in sources:
+                props = self.individuals[src].object_props
+                props[pname].discard(name)
+                if not props[pname]:
+                    del props[pname]
+        self._closures.clear()
+
+    def _remove_type(self, individual: str, cls: str) -> None:
+        self.individuals[individual].types.discard(cls)
+        self._by_type.get(cls, set()).discard(individual)
+
+    def _remove_value(self, subject: str, predicate: str, value: Any) -> bool:
+        """Remove one stored `value`; False if there is none.
+
+        Types must match as well: ``1 == True`` in Python, but not in RDF.
+        """
+        props = self.individuals[subject].data_props
+        values = props.get(predicate, ())
+        for k, v in enumerate(values):
+            if type(v) is type(value) and v == value:
+                del values[k]
+                if not values:
+                    del props[predicate]
+                return True
+        return False
+
+    def _remove_edge(self, subject: str, predicate: str, object_: str) -> bool:
+        """Remove one object-property edge; False if it was not stored."""
+        props = self.individuals[subject].object_props
+        targets = props.get(predicate)
+        if not targets or object_ not in targets:
+            return False
+        targets.discard(object_)
+        if not targets:
+            del props[predicate]
+        self._incoming[object_][predicate].discard(subject)
+        self._edge_counts[predicate] -= 1
+        self._edge_removed(predicate)
+        return True
+
+    def _types_of(self, individual: str) -> set[str]:
+        return self.individuals[individual].types
+
+    def _direct_instances(self, cls: str) -> Iterable[str]:
+        return self._by_type.get(cls, ())
+
+    def _objects(self, subject: str, predicate: str) -> Iterable[str]:
+        return self.individuals[subject].object_props.get(predicate, ())
+
+    def _subjects(self, object_: str, predicate: str) -> Iterable[str]:
+        return self._incoming.get(object_, {}).get(predicate, ())
+
+    def _edges(self, predicate: str) -> Iterator[tuple[str, str]]:
+        for s, ind in self.individuals.items():
+            for o in ind.object_props.get(predicate, ()):
+                yield s, o
+
+    def _edge_count(self, predicate: str) -> int:
+        return self._edge_counts.get(predicate, 0)
+
+    def _values(self, subject: str, predicate: str) -> Iterable[Any]:
+        return self.individuals[subject].data_props.get(predicate, ())
+
     # ------------------------------ export --------------------------------
 
     def to_turtle(self) -> str:
         """Minimal RDF/Turtle serialization. Good enough for round-tripping in Protégé / rdflib."""
-        lines = [
+        return "\n".join(self._iter_turtle_blocks())
+
+    def write_turtle(self, fp: Any, compress: bool = False) -> None:
+        """Stream `to_turtle()` to a path or writable text file, one subject block at a time."""
+        with _text_sink(fp, compress) as out:
+            blocks = self._iter_turtle_blocks()
+            out.write(next(blocks))
+            for block in blocks:
+                out.write("\n")
+                out.write(block)
+
+    def _iter_turtle_blocks(self) -> Iterator[str]:
+        """Turtle text in per-subject blocks; joined with newlines they form the document."""
+        yield "\n".join([
             f"@prefix {self.prefix}: <{self.iri}> .",
             "@prefix rdf:  <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .",
             "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .",
@@ -269,40 +1058,43 @@ class Ontology:
             "",
             f"<{self.iri.rstrip('/')}> a owl:Ontology .",
             "",
-        ]
+        ])
 
         for cls in self.classes.values():
-            lines.append(f"{self.prefix}:{cls.name} a owl:Class ;")
+            lines = [f"{self.prefix}:{cls.name} a owl:Class ;"]
             for p in sorted(cls.parents):
                 lines.append(f"    rdfs:subClassOf {self.prefix}:{p} ;")
             for d in sorted(cls.disjoint_with):
                 lines.append(f"    owl:disjointWith {self.prefix}:{d} ;")
             if cls.comment:
-                lines.append(f'    rdfs:comment "{cls.comment}" ;')
+                lines.append(f'    rdfs:comment "{_nt_escape(cls.comment)}" ;')
             lines[-1] = lines[-1].rstrip(" ;") + " ."
             lines.append("")
+            yield "\n".join(lines)
 
         for prop in self.object_properties.values():
             types = ["owl:ObjectProperty"]
             if prop.transitive:  types.append("owl:TransitiveProperty")
             if prop.symmetric:   types.append("owl:SymmetricProperty")
             if prop.functional:  types.append("owl:FunctionalProperty")
-            lines.append(f"{self.prefix}:{prop.name} a {', '.join(types)} ;")
+            lines = [f"{self.prefix}:{prop.name} a {', '.join(types)} ;"]
             if prop.domain:    lines.append(f"    rdfs:domain {self.prefix}:{prop.domain} ;")
             if prop.range_:    lines.append(f"    rdfs:range  {self.prefix}:{prop.range_} ;")
             if prop.inverse_of:lines.append(f"    owl:inverseOf {self.prefix}:{prop.inverse_of} ;")
             lines[-1] = lines[-1].rstrip(" ;") + " ."
             lines.append("")
+            yield "\n".join(lines)
 
         for prop in self.data_properties.values():
-            lines.append(f"{self.prefix}:{prop.name} a owl:DatatypeProperty ;")
+            lines = [f"{self.prefix}:{prop.name} a owl:DatatypeProperty ;"]
             if prop.domain:   lines.append(f"    rdfs:domain {self.prefix}:{prop.domain} ;")
             lines.append(f"    rdfs:range  {prop.datatype} .")
             lines.append("")
+            yield "\n".join(lines)
 
         for ind in self.individuals.values():
             type_iris = ", ".join(f"{self.prefix}:{t}" for t in sorted(ind.types)) or "owl:NamedIndividual"
-            lines.append(f"{self.prefix}:{ind.name} a {type_iris} ;")
+            lines = [f"{self.prefix}:{ind.name} a {type_iris} ;"]
             for pname, targets in ind.object_props.items():
                 joined = ", ".join(f"{self.prefix}:{t}" for t in sorted(targets))
                 lines.append(f"    {self.prefix}:{pname} {joined} ;")
@@ -311,23 +1103,36 @@ class Ontology:
                 lines.append(f"    {self.prefix}:{pname} {joined} ;")
             lines[-1] = lines[-1].rstrip(" ;") + " ."
             lines.append("")
-
-        return "\n".join(lines)
+            yield "\n".join(lines)
 
     def to_jsonld(self) -> dict:
-        ctx = {
+        return {"@context": self._jsonld_context(), "@graph": list(self._iter_jsonld_nodes())}
+
+    def write_jsonld(self, fp: Any, indent: int | None = 2, compress: bool = False) -> None:
+        """Stream `to_jsonld()` as JSON, one @graph node at a time.
+
+        Output is identical to ``json.dump(self.to_jsonld(), fp, indent=indent)``.
+        """
+        doc = {"@context": self._jsonld_context(),
+               "@graph": _JSONStream(self._iter_jsonld_nodes())}
+        with _text_sink(fp, compress) as out:
+            _write_json(out, doc, indent)
+
+    def _jsonld_context(self) -> dict:
+        return {
             self.prefix: self.iri,
             "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
             "owl":  "http://www.w3.org/2002/07/owl#",
             "xsd":  "http://www.w3.org/2001/XMLSchema#",
         }
-        graph: list[dict] = []
+
+    def _iter_jsonld_nodes(self) -> Iterator[dict]:
         for cls in self.classes.values():
-            graph.append({
+            yield {
                 "@id": f"{self.prefix}:{cls.name}",
                 "@type": "owl:Class",
                 "rdfs:subClassOf": [{"@id": f"{self.prefix}:{p}"} for p in sorted(cls.parents)],
-            })
+            }
         for ind in self.individuals.values():
             node: dict[str, Any] = {
                 "@id": f"{self.prefix}:{ind.name}",
@@ -339,16 +1144,15 @@ class Ontology:
                 ]
             for pname, values in ind.data_props.items():
                 node[f"{self.prefix}:{pname}"] = values
-            graph.append(node)
-        return {"@context": ctx, "@graph": graph}
+            yield node
 
     # --------------------------- RDF/XML + N-Triples ----------------------
     # Both formats are W3C-standard RDF serializations that can be loaded
     # directly into any RDF-compatible triplestore (GraphDB, Stardog, Apache
     # Jena Fuseki, Blazegraph, AnzoGraph, Neo4j n10s, AWS Neptune, etc.).
-    # If `rdflib` is installed we use it for a fully-spec-compliant round-trip
-    # via Turtle; otherwise we emit a minimal but valid serialization
-    # directly from the in-memory model.
+    # Both are written natively from `_iter_triples`, one line (N-Triples) or
+    # one rdf:Description (RDF/XML) per subject. `rdflib` is optional and is
+    # only used to parse RDF/XML back when validation is requested.
 
     def _expand(self, local: str) -> str:
         """Expand a local name to a full IRI under this ontology's namespace."""
@@ -372,170 +1176,814 @@ class Ontology:
         """
         ont_iri = self.iri.rstrip("/")
         yield (ont_iri, self._RDF + "type", (self._OWL + "Ontology", "iri"))
-
-        # Classes
         for cls in self.classes.values():
-            s = self._expand(cls.name)
-            yield (s, self._RDF + "type", (self._OWL + "Class", "iri"))
-            for p in sorted(cls.parents):
-                yield (s, self._RDFS + "subClassOf", (self._expand(p), "iri"))
-            for d in sorted(cls.disjoint_with):
-                yield (s, self._OWL + "disjointWith", (self._expand(d), "iri"))
-            if cls.comment:
-                yield (s, self._RDFS + "comment", (cls.comment, self._XSD + "string"))
-
-        # Object properties
+            yield from self._class_triples(cls)
         for prop in self.object_properties.values():
-            s = self._expand(prop.name)
-            yield (s, self._RDF + "type", (self._OWL + "ObjectProperty", "iri"))
-            if prop.transitive:
-                yield (s, self._RDF + "type", (self._OWL + "TransitiveProperty", "iri"))
-            if prop.symmetric:
-                yield (s, self._RDF + "type", (self._OWL + "SymmetricProperty", "iri"))
-            if prop.functional:
-                yield (s, self._RDF + "type", (self._OWL + "FunctionalProperty", "iri"))
-            if prop.domain:
-                yield (s, self._RDFS + "domain", (self._expand(prop.domain), "iri"))
-            if prop.range_:
-                yield (s, self._RDFS + "range", (self._expand(prop.range_), "iri"))
-            if prop.inverse_of:
-                yield (s, self._OWL + "inverseOf", (self._expand(prop.inverse_of), "iri"))
-
-        # Data properties
-        for prop in self.data_properties.values():
-            s = self._expand(prop.name)
-            yield (s, self._RDF + "type", (self._OWL + "DatatypeProperty", "iri"))
-            if prop.domain:
-                yield (s, self._RDFS + "domain", (self._expand(prop.domain), "iri"))
-            yield (s, self._RDFS + "range", (self._xsd_iri(prop.datatype), "iri"))
-            if prop.comment:
-                yield (s, self._RDFS + "comment", (prop.comment, self._XSD + "string"))
-
-        # Individuals (A-Box)
+            yield from self._object_property_triples(prop)
+        for dprop in self.data_properties.values():
+            yield from self._data_property_triples(dprop)
         for ind in self.individuals.values():
-            s = self._expand(ind.name)
-            yield (s, self._RDF + "type", (self._OWL + "NamedIndividual", "iri"))
-            for t in sorted(ind.types):
-                yield (s, self._RDF + "type", (self._expand(t), "iri"))
-            for pname, targets in ind.object_props.items():
-                p_iri = self._expand(pname)
-                for tgt in sorted(targets):
-                    yield (s, p_iri, (self._expand(tgt), "iri"))
-            for pname, values in ind.data_props.items():
-                p_iri = self._expand(pname)
-                dp = self.data_properties.get(pname)
-                dt_iri = self._xsd_iri(dp.datatype) if dp else self._XSD + "string"
-                for v in values:
-                    if isinstance(v, bool):
-                        yield (s, p_iri, ("true" if v else "false", self._XSD + "boolean"))
-                    elif isinstance(v, int):
-                        yield (s, p_iri, (str(v), self._XSD + "integer"))
-                    elif isinstance(v, float):
-                        yield (s, p_iri, (str(v), self._XSD + "double"))
-                    else:
-                        yield (s, p_iri, (str(v), dt_iri))
+            yield from self._individual_triples(ind)
+
+    def _schema_triples(self, name: str) -> Iterator[tuple[str, str, tuple[str, str]]]:
+        """Triples of the class and properties called `name`, if declared."""
+        if name in self.classes:
+            yield from self._class_triples(self.classes[name])
+        if name in self.object_properties:
+            yield from self._object_property_triples(self.object_properties[name])
+        if name in self.data_properties:
+            yield from self._data_property_triples(self.data_properties[name])
+
+    def _class_triples(self, cls: OntClass) -> Iterator[tuple[str, str, tuple[str, str]]]:
+        s = self._expand(cls.name)
+        yield (s, self._RDF + "type", (self._OWL + "Class", "iri"))
+        for p in sorted(cls.parents):
+            yield (s, self._RDFS + "subClassOf", (self._expand(p), "iri"))
+        for d in sorted(cls.disjoint_with):
+            yield (s, self._OWL + "disjointWith", (self._expand(d), "iri"))
+        if cls.comment:
+            yield (s, self._RDFS + "comment", (cls.comment, self._XSD + "string"))
+
+    def _object_property_triples(self, prop: ObjectProperty
+                                 ) -> Iterator[tuple[str, str, tuple[str, str]]]:
+        s = self._expand(prop.name)
+        yield (s, self._RDF + "type", (self._OWL + "ObjectProperty", "iri"))
+        if prop.transitive:
+            yield (s, self._RDF + "type", (self._OWL + "TransitiveProperty", "iri"))
+        if prop.symmetric:
+            yield (s, self._RDF + "type", (self._OWL + "SymmetricProperty", "iri"))
+        if prop.functional:
+            yield (s, self._RDF + "type", (self._OWL + "FunctionalProperty", "iri"))
+        if prop.domain:
+            yield (s, self._RDFS + "domain", (self._expand(prop.domain), "iri"))
+        if prop.range_:
+            yield (s, self._RDFS + "range", (self._expand(prop.range_), "iri"))
+        if prop.inverse_of:
+            yield (s, self._OWL + "inverseOf", (self._expand(prop.inverse_of), "iri"))
+
+    def _data_property_triples(self, prop: DataProperty
+                               ) -> Iterator[tuple[str, str, tuple[str, str]]]:
+        s = self._expand(prop.name)
+        yield (s, self._RDF + "type", (self._OWL + "DatatypeProperty", "iri"))
+        if prop.domain:
+            yield (s, self._RDFS + "domain", (self._expand(prop.domain), "iri"))
+        yield (s, self._RDFS + "range", (self._xsd_iri(prop.datatype), "iri"))
+        if prop.comment:
+            yield (s, self._RDFS + "comment", (prop.comment, self._XSD + "string"))
+
+    def _individual_triples(self, ind: Individual) -> Iterator[tuple[str, str, tuple[str, str]]]:
+        s = self._expand(ind.name)
+        yield (s, self._RDF + "type", (self._OWL + "NamedIndividual", "iri"))
+        for t in sorted(ind.types):
+            yield (s, self._RDF + "type", (self._expand(t), "iri"))
+        for pname, targets in ind.object_props.items():
+            p_iri = self._expand(pname)
+            for tgt in sorted(targets):
+                yield (s, p_iri, (self._expand(tgt), "iri"))
+        for pname, values in ind.data_props.items():
+            for v in values:
+                yield self._value_triple(s, pname, v)
+
+    def _value_triple(self, s: str, pname: str, v: Any) -> tuple[str, str, tuple[str, str]]:
+        p_iri = self._expand(pname)
+        if isinstance(v, bool):
+            return (s, p_iri, ("true" if v else "false", self._XSD + "boolean"))
+        if isinstance(v, int):
+            return (s, p_iri, (str(v), self._XSD + "integer"))
+        if isinstance(v, float):
+            return (s, p_iri, (str(v), self._XSD + "double"))
+        dp = self.data_properties.get(pname)
+        return (s, p_iri, (str(v), self._xsd_iri(dp.datatype) if dp else self._XSD + "string"))
+
+    def export(self, fmt: str) -> str:
+        """
+        The ontology as ``"ttl"``, ``"nt"``, ``"rdf"``, ``"jsonld"`` or
+        ``"json"`` text (as the matching ``write_*`` method writes it),
+        memoized until the next change to `version`.
+        """
+        if fmt not in _EXPORTS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(_EXPORTS)}")
+        version = self.version
+        hit = self._exports.get(fmt)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        buf = io.StringIO()
+        getattr(self, _EXPORTS[fmt])(buf)
+        self._exports = {f: e for f, e in self._exports.items() if e[0] == version}
+        self._exports[fmt] = (version, buf.getvalue())
+        return self._exports[fmt][1]
+
+    def delta_ntriples(self, changes: Iterable[tuple | None]) -> str | None:
+        """
+        N-Triples lines that bring a file written before `changes` (from
+        `drain_changes`) up to date when appended, or None when a change
+        also removed triples and the file has to be rewritten. Lines may
+        repeat triples already in the file, which N-Triples allows.
+        """
+        lines: list[str] = []
+        for change in changes:
+            if change is None:
+                return None
+            kind, name = change[0], change[1]
+            if kind == "class":
+                triples = self._class_triples(self.classes[name])
+            elif kind == "object_property":
+                triples = self._object_property_triples(self.object_properties[name])
+            elif kind == "data_property":
+                triples = self._data_property_triples(self.data_properties[name])
+            elif kind == "individual":
+                s = self._expand(name)
+                triples = [(s, self._RDF + "type", (self._OWL + "NamedIndividual", "iri"))]
+                triples += [(s, self._RDF + "type", (self._expand(t), "iri"))
+                            for t in sorted(self._types_of(name))]
+            elif kind == "type":
+                triples = [(self._expand(name), self._RDF + "type",
+                            (self._expand(change[2]), "iri"))]
+            elif kind == "edge":
+                triples = [(self._expand(name), self._expand(change[2]),
+                            (self._expand(change[3]), "iri"))]
+            else:
+                triples = [self._value_triple(self._expand(name), change[2], change[3])]
+            lines.extend(map(_nt_line, triples))
+        return "".join(lines)
 
     def to_ntriples(self) -> str:
         """W3C N-Triples serialization (one triple per line). RFC-compliant."""
+        buf = io.StringIO()
+        self.write_ntriples(buf)
+        return buf.getvalue()
+
+    def write_ntriples(self, fp: Any, compress: bool = False) -> None:
+        """Stream N-Triples straight from `_iter_triples` in bounded batches."""
+        with _text_sink(fp, compress) as out:
+            batch: list[str] = []
+            for triple in self._iter_triples():
+                batch.append(_nt_line(triple))
+                if len(batch) >= 4096:
+                    out.write("".join(batch))
+                    batch.clear()
+            out.write("".join(batch))
+
+    def to_rdf_xml(self, validate: bool = False) -> str:
+        """
+        RDF/XML serialization: one rdf:Description per subject, streamed from
+        `_iter_triples` like N-Triples. With `validate`, the document is
+        parsed back with rdflib and checked against the triple count.
+        """
+        buf = io.StringIO()
+        self._write_rdf_xml(buf)
+        text = buf.getvalue()
+        if validate:
+            self._validate_rdf_xml(text)
+        return text
+
+    def write_rdf_xml(self, fp: Any, compress: bool = False, validate: bool = False) -> None:
+        """Stream RDF/XML to a path or writable text file, one subject at a
+        time. `validate` (rdflib) needs the whole document in memory."""
+        with _text_sink(fp, compress) as out:
+            if validate:
+                out.write(self.to_rdf_xml(validate=True))
+            else:
+                self._write_rdf_xml(out)
 
-        def _esc(s: str) -> str:
-            return (s.replace("\\", "\\\\")
-                     .replace('"', '\\"')
-                     .replace("\n", "\\n")
-                     .replace("\r", "\\r")
-                     .replace("\t", "\\t"))
+    def _write_rdf_xml(self, out: Any) -> None:
+        """rdf:Description-per-subject RDF/XML, written to `out` in batches."""
+        from xml.sax.saxutils import escape
 
-        lines: list[str] = []
+        declared = [(self._RDF, "rdf"), (self._RDFS, "rdfs"), (self._OWL, "owl"),
+                    (self._XSD, "xsd"), (self.iri, self.prefix)]
+        # Longest namespace first, so an ontology IRI nested under another
+        # namespace still gets its own prefix.
+        namespaces = sorted(declared, key=lambda ns: -len(ns[0]))
+        tags: dict[str, str] = {}
+
+        def tag(iri: str) -> str:
+            for ns_uri, pfx in namespaces:
+                if iri.startswith(ns_uri):
+                    t = f"{pfx}:{iri[len(ns_uri):]}"
+                    break
+            else:
+                raise ValueError(f"Predicate {iri} is outside the declared namespaces")
+            tags[iri] = t
+            return t
+
+        def attr(value: str) -> str:
+            return escape(value, _XML_ATTR) if _XML_SPECIAL.search(value) else value
+
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n<rdf:RDF ')
+        out.write(" ".join(f'xmlns:{pfx}="{attr(ns_uri)}"' for ns_uri, pfx in declared))
+        out.write(">\n")
+
+        # _iter_triples emits each subject's triples contiguously, so one
+        # Description per run of equal subjects needs no grouping dict.
+        batch: list[str] = []
+        current: str | None = None
         for s, p, (o, kind) in self._iter_triples():
+            if s != current:
+                if current is not None:
+                    batch.append("  </rdf:Description>\n")
+                    if len(batch) >= 4096:
+                        out.write("".join(batch))
+                        batch.clear()
+                batch.append(f'  <rdf:Description rdf:about="{attr(s)}">\n')
+                current = s
+            t = tags.get(p) or tag(p)
             if kind == "iri":
-                obj = f"<{o}>"
+                batch.append(f'    <{t} rdf:resource="{attr(o)}" />\n')
             else:
-                obj = f'"{_esc(o)}"^^<{kind}>'
-            lines.append(f"<{s}> <{p}> {obj} .")
-        return "\n".join(lines) + "\n"
-
-    def to_rdf_xml(self) -> str:
-        """
-        RDF/XML serialization. Prefers rdflib (round-trip via Turtle) for
-        a fully canonical output; falls back to a flat rdf:Description-based
-        emission that is still valid RDF/XML.
-        """
+                text = escape(o) if _XML_SPECIAL.search(o) else o
+                batch.append(f'    <{t} rdf:datatype="{attr(kind)}">{text}</{t}>\n')
+        if current is not None:
+            batch.append("  </rdf:Description>\n")
+        batch.append("</rdf:RDF>\n")
+        out.write("".join(batch))
+
+    def _validate_rdf_xml(self, text: str) -> None:
+        """Parse `text` with rdflib; raise ValueError unless it holds exactly
+        the distinct triples `_iter_triples` yields."""
         try:
             import rdflib  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "rdflib is required for RDF/XML validation.  "
+                "Install with: pip install rdflib"
+            ) from e
+        g = rdflib.Graph()
+        try:
+            g.parse(data=text, format="xml")
+        except Exception as e:  # noqa: BLE001 — rdflib raises parser-specific types
+            raise ValueError(f"RDF/XML output does not parse: {e}") from e
+        expected = len({_nt_line(t) for t in self._iter_triples()})
+        if len(g) != expected:
+            raise ValueError(f"RDF/XML output holds {len(g)} triples; expected {expected}")
 
-            g = rdflib.Graph()
-            g.parse(data=self.to_turtle(), format="turtle")
-            g.bind(self.prefix, rdflib.Namespace(self.iri))
-            return g.serialize(format="xml")
-        except Exception:
-            pass
-
-        from xml.sax.saxutils import escape, quoteattr
-
-        ns_to_prefix = {
-            self._RDF: "rdf",
-            self._RDFS: "rdfs",
-            self._OWL: "owl",
-            self._XSD: "xsd",
-            self.iri: self.prefix,
-        }
+    def to_dict(self) -> dict:
+        d = self._dict_header()
+        d["individuals"] = dict(self._iter_dict_individuals())
+        return d
 
-        def _qname(iri: str) -> str:
-            for ns_uri, pfx in ns_to_prefix.items():
-                if iri.startswith(ns_uri):
-                    return f"{pfx}:{iri[len(ns_uri):]}"
-            # Unknown namespace — emit as rdf:Description child with full IRI
-            # is not legal as an element name, so wrap under a generic prefix.
-            return f"ex:{iri.rsplit('/', 1)[-1].rsplit('#', 1)[-1]}"
-
-        out: list[str] = ['<?xml version="1.0" encoding="UTF-8"?>']
-        out.append(
-            f'<rdf:RDF xmlns:rdf={quoteattr(self._RDF)} '
-            f'xmlns:rdfs={quoteattr(self._RDFS)} '
-            f'xmlns:owl={quoteattr(self._OWL)} '
-            f'xmlns:xsd={quoteattr(self._XSD)} '
-            f'xmlns:{self.prefix}={quoteattr(self.iri)}>'
-        )
-
-        by_subject: dict[str, list[tuple[str, tuple[str, str | None]]]] = {}
-        for s, p, obj in self._iter_triples():
-            by_subject.setdefault(s, []).append((p, obj))
-
-        for subject, preds in by_subject.items():
-            out.append(f'  <rdf:Description rdf:about={quoteattr(subject)}>')
-            for p, (o, kind) in preds:
-                tag = _qname(p)
-                if kind == "iri":
-                    out.append(f'    <{tag} rdf:resource={quoteattr(o)} />')
-                else:
-                    out.append(
-                        f'    <{tag} rdf:datatype={quoteattr(kind)}>'
-                        f'{escape(o)}</{tag}>'
-                    )
-            out.append("  </rdf:Description>")
+    def write_json(self, fp: Any, indent: int | None = 2, compress: bool = False) -> None:
+        """Stream `to_dict()` as JSON, one individual at a time."""
+        doc = self._dict_header()
+        doc["individuals"] = _JSONStream(self._iter_dict_individuals(), mapping=True)
+        with _text_sink(fp, compress) as out:
+            _write_json(out, doc, indent)
 
-        out.append("</rdf:RDF>")
-        return "\n".join(out) + "\n"
+    def save_snapshot(self, path: str | os.PathLike) -> None:
+        """Write a memory-mappable binary snapshot; see ``ontology_snapshot``."""
+        from ontology_snapshot import save_snapshot
 
-    def to_dict(self) -> dict:
+        save_snapshot(self, path)
+
+    def _dict_header(self) -> dict:
         return {
             "iri": self.iri,
-            "classes": {n: c.__dict__ | {"parents": sorted(c.parents),
+            "prefix": self.prefix,
+            "classes": {n: _fields(c) | {"parents": sorted(c.parents),
                                          "disjoint_with": sorted(c.disjoint_with)}
                         for n, c in self.classes.items()},
-            "object_properties": {n: p.__dict__ for n, p in self.object_properties.items()},
-            "data_properties":   {n: p.__dict__ for n, p in self.data_properties.items()},
-            "individuals": {n: {"types": sorted(i.types),
-                                "object_props": {k: sorted(v) for k, v in i.object_props.items()},
-                                "data_props": i.data_props}
-                            for n, i in self.individuals.items()},
+            "object_properties": {n: _fields(p) for n, p in self.object_properties.items()},
+            "data_properties":   {n: _fields(p) for n, p in self.data_properties.items()},
         }
 
+    def _iter_dict_individuals(self) -> Iterator[tuple[str, dict]]:
+        for n, i in self.individuals.items():
+            yield n, {"types": sorted(i.types),
+                      "object_props": {k: sorted(v) for k, v in i.object_props.items()},
+                      "data_props": i.data_props}
+
+    # ------------------------------ import --------------------------------
+
+    @classmethod
+    def load(cls, source: Any, format: str | None = None, prefix: str | None = None,
+             validate: str = "deferred") -> "Ontology":
+        """
+        Read an ontology written by `write_ntriples`, `write_turtle` or
+        `write_json` (optionally gzipped) without going through rdflib.
+
+        `source` is a path, or an open file object together with `format`
+        (``"nt"``, ``"ttl"`` or ``"json"``). N-Triples and Turtle are parsed
+        line by line; the A-Box goes in through one `bulk_load` call, whose
+        report is kept on ``load_report``. `prefix` overrides the prefix
+        found in (or guessed from) the file.
+        """
+        if format is None:
+            if not isinstance(source, (str, os.PathLike)):
+                raise ValueError("format is required when loading from a file object")
+            suffixes = [x.lower() for x in Path(source).suffixes]
+            if suffixes[-1:] == [".gz"]:
+                suffixes.pop()
+            format = suffixes[-1].lstrip(".") if suffixes else ""
+        format = {"ntriples": "nt", "turtle": "ttl"}.get(format, format)
+        if format not in ("nt", "ttl", "json"):
+            raise ValueError(f"Cannot load format {format!r}; expected nt, ttl or json")
+
+        with _text_source(source) as lines:
+            if format == "json":
+                return cls.from_dict(json.load(lines), prefix=prefix, validate=validate)
+            prefixes: dict[str, str] = {}
+            triples = _iter_ntriples(lines) if format == "nt" else _iter_turtle(lines, prefixes)
+            return cls._from_triples(triples, prefixes, prefix, validate)
+
+    @staticmethod
+    def open_snapshot(path: str | os.PathLike) -> "Ontology":
+        """Map a file written by `save_snapshot` as a read-only ontology."""
+        from ontology_snapshot import SnapshotOntology
+
+        return SnapshotOntology(path)
+
+    @classmethod
+    def from_dict(cls, d: dict, prefix: str | None = None,
+                  validate: str = "deferred") -> "Ontology":
+        """Inverse of `to_dict()`."""
+        iri = d.get("iri") or "https://example.org/ont/"
+        ont = cls(iri=iri, prefix=prefix or d.get("prefix") or _guess_prefix(iri))
+        for name, c in (d.get("classes") or {}).items():
+            ont.add_class(name, c.get("parents", ()), c.get("comment", ""),
+                          c.get("disjoint_with", ()))
+        for name, p in (d.get("object_properties") or {}).items():
+            ont.add_object_property(**{**p, "name": name})
+        for name, p in (d.get("data_properties") or {}).items():
+            ont.add_data_property(**{**p, "name": name})
+
+        individuals = d.get("individuals") or {}
+        triples = [(s, p, o) for s, i in individuals.items()
+                   for p, targets in (i.get("object_props") or {}).items() for o in targets]
+        data_triples = [(s, p, v) for s, i in individuals.items()
+                        for p, values in (i.get("data_props") or {}).items() for v in values]
+        ont._load_abox({s: i.get("types", ()) for s, i in individuals.items()},
+                       triples, data_triples, validate)
+        return ont
+
+    @classmethod
+    def _from_triples(cls, triples: Iterable[tuple[str, str, tuple[str, str]]],
+                      prefixes: dict[str, str], prefix: str | None,
+                      validate: str) -> "Ontology":
+        """Rebuild an ontology from `_iter_triples`-shaped (s, p, (o, kind)) tuples."""
+        rdf_type = cls._RDF + "type"
+        schema_preds = {cls._RDFS + "subClassOf", cls._RDFS + "domain", cls._RDFS + "range",
+                        cls._RDFS + "comment", cls._OWL + "disjointWith", cls._OWL + "inverseOf"}
+        schema_types = (cls._OWL, cls._RDFS)
+
+        ont_iri: str | None = None
+        schema: dict[str, dict[str, list[str]]] = {}
+        types: dict[str, list[str]] = {}
+        links: list[tuple[str, str, str]] = []
+        values: list[tuple[str, str, Any]] = []
+        for s, p, (o, kind) in triples:
+            if p == rdf_type:
+                if o == cls._OWL + "Ontology":
+                    ont_iri = ont_iri or s
+                elif o == cls._OWL + "NamedIndividual":
+                    types.setdefault(s, [])
+                elif o.startswith(schema_types):
+                    schema.setdefault(s, {}).setdefault(p, []).append(o)
+                else:
+                    types.setdefault(s, []).append(o)
+            elif p in schema_preds:
+                schema.setdefault(s, {}).setdefault(p, []).append(o)
+            elif kind == "iri":
+                links.append((s, p, o))
+            else:
+                values.append((s, p, _literal_value(o, kind)))
+
+        if ont_iri is None:
+            ont_iri = (prefixes.get(prefix) if prefix else None) or "https://example.org/ont/"
+        base = ont_iri.rstrip("/") + "/"
+        if prefix is None:
+            prefix = next((k for k, v in prefixes.items() if v == base and k), None) \
+                or _guess_prefix(base)
+        ont = cls(iri=base, prefix=prefix)
+        cut = len(base)
+
+        def local(iri: str) -> str:
+            return iri[cut:] if iri.startswith(base) else iri
+
+        for s, props in schema.items():
+            ont._declare_schema(local(s), props, local)
+
+        ont._load_abox({local(s): [local(t) for t in ts] for s, ts in types.items()},
+                       ((local(s), local(p), local(o)) for s, p, o in links),
+                       ((local(s), local(p), v) for s, p, v in values),
+                       validate)
+        return ont
+
+    def _declare_schema(self, name: str, props: dict[str, list[str]],
+                        local: Callable[[str], str]) -> None:
+        """Declare `name` from its schema triples, grouped predicate -> objects."""
+        def first(pred: str) -> str | None:
+            found = props.get(pred)
+            return found[0] if found else None
+
+        kinds = props.get(self._RDF + "type", ())
+        comment = first(self._RDFS + "comment") or ""
+        domain = first(self._RDFS + "domain")
+        range_ = first(self._RDFS + "range")
+        if self._OWL + "Class" in kinds:
+            self.add_class(name,
+                           [local(o) for o in props.get(self._RDFS + "subClassOf", ())],
+                           comment,
+                           [local(o) for o in props.get(self._OWL + "disjointWith", ())])
+        elif self._OWL + "ObjectProperty" in kinds:
+            inverse = first(self._OWL + "inverseOf")
+            self.add_object_property(
+                name,
+                domain=local(domain) if domain else None,
+                range_=local(range_) if range_ else None,
+                inverse_of=local(inverse) if inverse else None,
+                transitive=self._OWL + "TransitiveProperty" in kinds,
+                symmetric=self._OWL + "SymmetricProperty" in kinds,
+                functional=self._OWL + "FunctionalProperty" in kinds,
+                comment=comment)
+        elif self._OWL + "DatatypeProperty" in kinds:
+            datatype = "xsd:string"
+            if range_:
+                datatype = "xsd:" + range_[len(self._XSD):] \
+                    if range_.startswith(self._XSD) else range_
+            self.add_data_property(name, domain=local(domain) if domain else None,
+                                   datatype=datatype, comment=comment)
+
+    def _load_abox(self, types: dict[str, Iterable[str]],
+                   triples: Iterable[tuple[str, str, str]],
+                   data_triples: Iterable[tuple[str, str, Any]],
+                   validate: str) -> None:
+        """Declare `types` (individual -> classes) in order, then `bulk_load` the rest."""
+        rejected: list[tuple[str, str, Any, str]] = []
+        for name, classes in types.items():
+            known: list[str] = []
+            for c in classes:
+                if c in self.classes:
+                    known.append(c)
+                else:
+                    rejected.append((name, "rdf:type", c, f"Unknown class '{c}'"))
+            self._store_individual(name, set(known))
+        self._touch(types)
+        if validate == "strict" and rejected:
+            raise ValueError(f"{len(rejected)} bulk-load violation(s); first: {rejected[0][3]}")
+        report = self.bulk_load(triples, data_triples, validate=validate)
+        report.violations[:0] = rejected
+        self.load_report = report
+
+
+# ---------------------------------------------------------------------------
+# Consistency rules (shared by the serial and process-pool checks)
+# ---------------------------------------------------------------------------
+
+def _consistency_row(ind: Individual, functional: frozenset[str]) -> tuple:
+    """``(name, types, [(functional property, value count), ...])`` for one individual."""
+    counts = [(p, len(t)) for p, t in ind.object_props.items() if p in functional] \
+        if functional else ()
+    return ind.name, ind.types, counts
+
+
+def _row_problems(row: tuple, disjoint: dict[str, tuple[str, ...]]) -> list[str]:
+    """Violations for one `_consistency_row`."""
+    name, types, counts = row
+    problems: list[str] = []
+    # Disjointness check.
+    for t in types:
+        for d in disjoint.get(t, ()):
+            if d in types:
+                problems.append(f"{name}: classes {t} and {d} are disjoint")
+    # Functional property check.
+    for pname, n in counts:
+        if n > 1:
+            problems.append(f"{name}: functional property {pname} has {n} values")
+    return problems
+
+
+# Per-worker copy of the disjointness table, installed once by the pool
+# initializer rather than pickled with every shard.
+_SHARD_DISJOINT: dict[str, tuple[str, ...]] = {}
+
+
+def _init_shard_tables(disjoint: dict[str, tuple[str, ...]]) -> None:
+    global _SHARD_DISJOINT
+    _SHARD_DISJOINT = disjoint
+
+
+def _check_shard(rows: list[tuple]) -> list[tuple[str, list[str]]]:
+    out: list[tuple[str, list[str]]] = []
+    for row in rows:
+        found = _row_problems(row, _SHARD_DISJOINT)
+        if found:
+            out.append((row[0], found))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Streaming output helpers
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _text_sink(fp: Any, compress: bool = False) -> Iterator[Any]:
+    """
+    Yield a writable text stream for `fp`.
+
+    `fp` may be a path (gzip is used when `compress` is set or the name ends
+    in ``.gz``) or an open file object. Binary file objects get a UTF-8 text
+    layer, plus a gzip layer when `compress` is set. Caller-supplied file
+    objects are never closed.
+    """
+    if isinstance(fp, (str, os.PathLike)):
+        if compress or os.fspath(fp).endswith(".gz"):
+            with gzip.open(fp, "wt", encoding="utf-8") as f:
+                yield f
+        else:
+            with open(fp, "w", encoding="utf-8") as f:
+                yield f
+    elif compress or isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        raw = gzip.GzipFile(fileobj=fp, mode="wb") if compress else fp
+        text = io.TextIOWrapper(raw, encoding="utf-8", write_through=True)
+        try:
+            yield text
+        finally:
+            text.flush()
+            text.detach()
+            if compress:
+                raw.close()     # writes the gzip trailer; leaves `fp` open
+    else:
+        yield fp
+
+
+# `Ontology.export` format -> writer method.
+_EXPORTS = {
+    "ttl": "write_turtle",
+    "nt": "write_ntriples",
+    "rdf": "write_rdf_xml",
+    "jsonld": "write_jsonld",
+    "json": "write_json",
+}
+
+# Extra entities for XML attribute values (``escape`` covers &, < and >).
+_XML_ATTR = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+_XML_SPECIAL = re.compile(r'[&<>"\n\r\t]')
+
+
+def _nt_escape(s: str) -> str:
+    return (s.replace("\\", "\\\\")
+             .replace('"', '\\"')
+             .replace("\n", "\\n")
+             .replace("\r", "\\r")
+             .replace("\t", "\\t"))
+
+
+def _nt_line(triple: tuple[str, str, tuple[str, str | None]]) -> str:
+    s, p, (o, kind) = triple
+    obj = f"<{o}>" if kind == "iri" else f'"{_nt_escape(o)}"^^<{kind}>'
+    return f"<{s}> <{p}> {obj} .\n"
+
+
+class _JSONStream:
+    """A JSON array (or object, if `mapping`) whose members are produced lazily."""
+
+    def __init__(self, items: Iterable[Any], mapping: bool = False):
+        self.items = items
+        self.mapping = mapping
+
+
+def _write_json(out: Any, value: Any, indent: int | None, level: int = 0) -> None:
+    """`json.dump` that can stream `_JSONStream` members; output is byte-identical."""
+    lazy = isinstance(value, _JSONStream)
+    if not lazy and not (isinstance(value, dict)
+                         and any(isinstance(v, _JSONStream) for v in value.values())):
+        text = json.dumps(value, indent=indent)
+        if indent and level:
+            text = text.replace("\n", "\n" + " " * (indent * level))
+        out.write(text)
+        return
+
+    mapping = value.mapping if lazy else True
+    items = value.items if lazy else value.items()
+    opener, closer = ("{", "}") if mapping else ("[", "]")
+    pad = "\n" + " " * (indent * (level + 1)) if indent is not None else ""
+    sep = "," if indent is not None else ", "
+    first = True
+    for item in items:
+        out.write(opener + pad if first else sep + pad)
+        first = False
+        if mapping:
+            key, item = item
+            out.write(json.dumps(key) + ": ")
+        _write_json(out, item, indent, level + 1)
+    if first:
+        out.write(opener + closer)
+    else:
+        out.write(("\n" + " " * (indent * level) if indent is not None else "") + closer)
+
+
+# ---------------------------------------------------------------------------
+# Native readers (N-Triples, Turtle subset) — no rdflib required
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _text_source(fp: Any) -> Iterator[Any]:
+    """Counterpart of `_text_sink`: yield a line-iterable text stream for `fp`."""
+    if isinstance(fp, (str, os.PathLike)):
+        with open(fp, "rb") as probe:
+            gzipped = probe.read(2) == b"\x1f\x8b"
+        opener = gzip.open if gzipped else open
+        with opener(fp, "rt", encoding="utf-8") as f:
+            yield f
+    elif isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        text = io.TextIOWrapper(fp, encoding="utf-8")
+        try:
+            yield text
+        finally:
+            text.detach()
+    else:
+        yield fp
+
+
+_XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+
+_NT_LINE = re.compile(
+    r'\s*(<[^>]*>|_:\S+)\s+<([^>]*)>\s+'
+    r'(?:<([^>]*)>|(_:\S+)|"((?:[^"\\]|\\.)*)"(?:\^\^<([^>]*)>|@([A-Za-z][\w-]*))?)'
+    r'\s*\.\s*(?:#.*)?$'
+)
+_ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.S)
+_ESCAPES = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f",
+            '"': '"', "'": "'", "\\": "\\"}
+
+
+def _unescape(s: str) -> str:
+    if "\\" not in s:
+        return s
+
+    def sub(m: re.Match) -> str:
+        code = m.group(1) or m.group(2)
+        if code:
+            return chr(int(code, 16))
+        return _ESCAPES.get(m.group(3), m.group(0))
+
+    return _ESCAPE.sub(sub, s)
+
+
+def _iter_ntriples(lines: Iterable[str]) -> Iterator[tuple[str, str, tuple[str, str]]]:
+    """Parse N-Triples into (subject, predicate, (object, kind)) like `_iter_triples`."""
+    match = _NT_LINE.match
+    for lineno, line in enumerate(lines, 1):
+        m = match(line)
+        if m is None:
+            if line.strip() and not line.lstrip().startswith("#"):
+                raise ValueError(f"line {lineno}: not an N-Triples statement: {line.strip()[:80]}")
+            continue
+        s, p, iri, bnode, lex, dt, lang = m.groups()
+        s = s[1:-1] if s[0] == "<" else s
+        if iri is not None:
+            yield s, p, (iri, "iri")
+        elif bnode is not None:
+            yield s, p, (bnode, "iri")
+        else:
+            kind = dt or (_RDF_LANGSTRING if lang else _XSD_NS + "string")
+            yield s, p, (_unescape(lex), kind)
+
+
+_RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+_RDF_LANGSTRING = _RDF_NS + "langString"
+
+_TTL_TOKEN = re.compile(r"""
+    (?:\s|\#[^\n]*(?:\n|$))*                      # leading whitespace / whole-line comments
+    (?:
+      (?P<iri><[^>\s]*>)
+    | (?P<long>\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\")
+    | (?P<str>"(?:[^"\\]|\\.)*")
+    | (?P<dt>\^\^)
+    | (?P<at>@[A-Za-z]+(?:-[A-Za-z0-9]+)*)
+    | (?P<num>[+-]?(?:\d+(?:\.\d+)?|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<pname>(?:[A-Za-z][\w\-.]*)?:(?:[\w\-:%]+(?:\.[\w\-:%]+)*)?|_:[\w\-]+)
+    | (?P<word>[A-Za-z]+)
+    | (?P<punct>[.;,\[\]()])
+    )
+""", re.X | re.S)
+_TTL_BLANK = re.compile(r"(?:\s|\#[^\n]*)*")
+
+
+def _iter_turtle(lines: Iterable[str],
+                 prefixes: dict[str, str] | None = None) -> Iterator[tuple[str, str, tuple[str, str]]]:
+    """
+    Parse the Turtle subset `to_turtle()` writes: @prefix/PREFIX, IRIs,
+    prefixed names, ``a``, ``;`` / ``,`` lists and plain, typed, numeric and
+    boolean literals. Blank-node brackets and collections are rejected.
+
+    Statements are tokenized as their lines arrive, so memory stays bounded
+    by the longest statement. `prefixes` is filled in as they are declared.
+    """
+    prefixes = {} if prefixes is None else prefixes
+    buf = ""
+    stmt: list[tuple[str, str]] = []
+    for line in itertools.chain(lines, [None]):
+        if line is not None:
+            buf += line
+        pos = 0
+        for m in _TTL_TOKEN.finditer(buf):
+            kind = m.lastgroup
+            if m.start() != pos or (kind == "str" and m.group(kind) == '""'
+                                    and buf.startswith('"""', m.start(kind))):
+                break                   # a string literal continues on the next line
+            text = m.group(kind)
+            pos = m.end()
+            stmt.append((kind, text))
+            if (kind == "punct" and text == ".") or (
+                    len(stmt) == 3 and stmt[0] == ("word", "PREFIX")):
+                yield from _turtle_statement(stmt, prefixes)
+                stmt = []
+        buf = "" if _TTL_BLANK.fullmatch(buf, pos) else buf[pos:]
+    if buf or stmt:
+        raise ValueError(f"Truncated or unsupported Turtle near: {(buf.strip() or stmt)!r:.80}")
+
+
+def _turtle_statement(tokens: list[tuple[str, str]],
+                      prefixes: dict[str, str]) -> Iterator[tuple[str, str, tuple[str, str]]]:
+    head = tokens[0][1]
+    if head in ("@prefix", "PREFIX"):
+        prefixes[tokens[1][1][:-1]] = tokens[2][1][1:-1]
+        return
+
+    def term(tok: tuple[str, str]) -> str:
+        kind, text = tok
+        if kind == "iri":
+            return text[1:-1]
+        if kind == "pname" and not text.startswith("_:"):
+            pfx, _, localname = text.partition(":")
+            if pfx not in prefixes:
+                raise ValueError(f"Undeclared Turtle prefix '{pfx}:'")
+            return prefixes[pfx] + localname
+        if kind == "pname":
+            return text
+        raise ValueError(f"Unsupported Turtle term {text!r}")
+
+    toks = iter(tokens)
+    subject = term(next(toks))
+    tok = next(toks)
+    while True:
+        pred = _RDF_NS + "type" if tok == ("word", "a") else term(tok)
+        while True:
+            kind, text = next(toks)
+            if kind in ("str", "long"):
+                lex = _unescape(text[3:-3] if kind == "long" else text[1:-1])
+                obj = (lex, _XSD_NS + "string")
+                kind, text = next(toks)
+                if kind == "dt":
+                    obj = (lex, term(next(toks)))
+                    kind, text = next(toks)
+                elif kind == "at":
+                    obj = (lex, _RDF_LANGSTRING)
+                    kind, text = next(toks)
+            else:
+                if kind == "num":
+                    dt = "double" if "e" in text.lower() else "decimal" if "." in text else "integer"
+                    obj = (text, _XSD_NS + dt)
+                elif (kind, text) in (("word", "true"), ("word", "false")):
+                    obj = (text, _XSD_NS + "boolean")
+                else:
+                    obj = (term((kind, text)), "iri")
+                kind, text = next(toks)
+            yield subject, pred, obj
+            if text != ",":
+                break
+        if text == ";":
+            tok = next(toks)
+            if tok == ("punct", "."):          # trailing ';' before '.'
+                return
+            continue
+        if text == ".":
+            return
+        raise ValueError(f"Unexpected Turtle token {text!r} after {subject}")
+
+
+def _literal_value(lexical: str, datatype: str) -> Any:
+    """Map a typed RDF literal back onto the Python value `_iter_triples` wrote."""
+    local = datatype[len(_XSD_NS):] if datatype.startswith(_XSD_NS) else ""
+    try:
+        if local == "boolean":
+            return lexical.strip() in ("true", "1")
+        if local in ("integer", "int", "long", "short", "byte", "nonNegativeInteger",
+                     "positiveInteger", "negativeInteger", "nonPositiveInteger"):
+            return int(lexical)
+        if local in ("double", "float", "decimal"):
+            return float(lexical)
+    except ValueError:
+        pass
+    return lexical
+
+
+def _guess_prefix(iri: str) -> str:
+    """Last path segment of `iri` if it makes a usable prefix, else ``ex``."""
+    seg = iri.rstrip("/#").rsplit("/", 1)[-1]
+    return seg if re.fullmatch(r"[A-Za-z][\w\-]*", seg) else "ex"
+
+
+def _fields(obj: Any) -> dict[str, Any]:
+    """Shallow field dict of a slotted dataclass (``asdict`` would deep-copy)."""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
 
 def _lit(v: Any) -> str:
     if isinstance(v, bool):  return "true" if v else "false"
     if isinstance(v, (int, float)): return str(v)
-    return f'"{v}"'
+    return f'"{_nt_escape(str(v))}"'
 
 
 # ---------------------------------------------------------------------------
@@ -660,13 +2108,30 @@ def demo() -> None:
 
     print("\nWhat is CNC_001 located in (transitive)?")
     print("  ", sorted(o.related("CNC_001", "locatedIn", transitive=True)))
-    # Expected: {Line_A, Site_Austin} — Line_A is partOf Site_Austin, but
-    # locatedIn is transitive only over locatedIn itself; combining with partOf
-    # would require a property chain (left as an exercise).
+    # Only {Line_A}: Line_A is partOf Site_Austin, but locatedIn is transitive
+    # only over locatedIn itself. Combining it with partOf takes a property
+    # chain, which the reasoner materializes:
+    from ontology_reasoner import Reasoner
+
+    reasoner = Reasoner(o)
+    reasoner.add_chain("locatedIn", ["locatedIn", "partOf"])
+    print("   with locatedIn ∘ partOf ⊑ locatedIn:",
+          sorted(reasoner.related("CNC_001", "locatedIn")))
+    reasoner.close()
 
     print("\nWho operates CNC_001?")
     print("  ", o.related("CNC_001", "operatedBy"))   # auto-derived inverse
 
+    print("\nWhat is located in Line_A (reverse lookup)?")
+    print("  ", sorted(o.related_inverse("Line_A", "locatedIn")))
+
+    print("\nEquipment on Line_A serviced by a Technician (BGP query):")
+    for row in o.query("""SELECT ?eq ?ev ?tech WHERE {
+                              ?eq a Equipment . ?eq locatedIn Line_A .
+                              ?ev performedOn ?eq . ?ev performedBy ?tech .
+                              ?tech a Technician . }"""):
+        print(f"   * {row['eq']} <- {row['ev']} by {row['tech']}")
+
     print("\n-- Consistency -----------------------------------------------")
     issues = o.check_consistency()
     print("   OK (no issues)" if not issues else "\n".join(f"   - {p}" for p in issues))
@@ -678,12 +2143,9 @@ def demo() -> None:
         print(f"   correctly rejected: {e}")
 
     # ---- export ----
-    with open("manufacturing.ttl", "w", encoding="utf-8") as f:
-        f.write(o.to_turtle())
-    with open("manufacturing.jsonld", "w", encoding="utf-8") as f:
-        json.dump(o.to_jsonld(), f, indent=2)
-    with open("manufacturing.json", "w", encoding="utf-8") as f:
-        json.dump(o.to_dict(), f, indent=2)
+    o.write_turtle("manufacturing.ttl")
+    o.write_jsonld("manufacturing.jsonld")
+    o.write_json("manufacturing.json")
     print("\nWrote: manufacturing.ttl, manufacturing.jsonld, manufacturing.json")
 
 
@@ -693,35 +2155,281 @@ def demo() -> None:
 
 class FabricAdapter:
     """
-    Placeholder adapter showing where Microsoft Fabric would plug in.
+    Adapter showing where Microsoft Fabric plugs in.
+
+    Data moves in Arrow record batches: Lakehouse tables are read batch by
+    batch straight into `Ontology.bulk_load`, and object-property edges are
+    written back as batches built from whole columns. With
+    `CompactOntology` the export reads the term-id columns of the triple
+    index directly (see `CompactOntology.edge_columns`).
+
+    `root` selects where tables live:
+
+      * ``None`` — the Spark session (`from_lakehouse(..., spark=...)`);
+      * a directory — ``<root>/Tables/<table>`` read and written with
+        pyarrow. In a Fabric notebook that is the mounted default Lakehouse
+        (``/lakehouse/default``); anywhere else a local folder of Parquet
+        files stands in for OneLake. Delta tables (a ``_delta_log``
+        folder) are read, and tables written, through the ``deltalake``
+        package when it is installed; otherwise plain Parquet is written.
 
     In a Fabric notebook the recipe is:
 
-        # FABRIC INTEGRATION POINT — Lakehouse read
-        df = spark.read.format("delta").load("Tables/equipment")
-        for row in df.collect():
-            ont.add_individual(row.asset_id, types=[row.class_name])
-            ont.assert_data(row.asset_id, "serialNumber", row.serial_number)
+        # FABRIC INTEGRATION POINT — Lakehouse read (see from_lakehouse)
+        adapter = FabricAdapter(ont, root="/lakehouse/default")
+        adapter.from_lakehouse("equipment")          # asset_id, class_name, ...
+        adapter.from_lakehouse_triples("relations")  # subject, predicate, object
 
         # FABRIC INTEGRATION POINT — Lakehouse write (materialize triples)
-        triples = [(s, p, o) for s, ind in ont.individuals.items()
-                              for p, ts in ind.object_props.items()
-                              for o in ts]
-        spark.createDataFrame(triples, "subject string, predicate string, object string") \
-             .write.format("delta").mode("overwrite").save("Tables/triples")
+        adapter.to_lakehouse_triples("triples")
 
         # FABRIC INTEGRATION POINT — OneLake shortcut to publish ontology.ttl
         # Save manufacturing.ttl into the Files section of the Lakehouse so that
         # Power BI semantic models, Copilot, and Real-Time Intelligence can
         # discover the schema.
+
+    Requires pyarrow (``pip install pyarrow``).
     """
-    def __init__(self, ontology: Ontology):
+    def __init__(self, ontology: Ontology, root: str | os.PathLike | None = None,
+                 batch_size: int = 65_536):
         self.ontology = ontology
+        self.root = Path(root) if root is not None else None
+        self.batch_size = batch_size
+
+    # ------------------------------ ingest --------------------------------
+
+    def from_lakehouse(self, table: str, spark: Any = None,
+                       id_column: str = "asset_id", class_column: str = "class_name",
+                       validate: str = "deferred") -> BulkLoadReport:
+        """
+        Load an entity table: one row per individual, typed by `class_column`.
+        Every other column whose name is a declared data property becomes a
+        data value. Each record batch goes through one `Ontology.bulk_load`
+        call, so memory stays bounded by the batch size. With
+        ``validate="strict"`` the batches before a failing one stay loaded.
+        """
+        report = BulkLoadReport()
+        value_columns: list[str] | None = None
+        for batch in self._read_batches(table, spark):
+            if value_columns is None:
+                value_columns = [c for c in batch.schema.names
+                                 if c in self.ontology.data_properties]
+            ids = _arrow_column(batch, id_column).to_pylist()
+            classes = _arrow_strings(_arrow_column(batch, class_column))
+            values = [(c, _arrow_column(batch, c).to_pylist()) for c in value_columns]
+            part = self.ontology.bulk_load(
+                types=((s, cls) for s, cls in zip(ids, classes) if s is not None),
+                data_triples=((s, c, v) for c, col in values
+                              for s, v in zip(ids, col) if s is not None and v is not None),
+                validate=validate)
+            report.object_triples += part.object_triples
+            report.data_triples += part.data_triples
+            report.violations += part.violations
+        return report
+
+    def from_lakehouse_triples(self, table: str = "triples", spark: Any = None,
+                               columns: tuple[str, str, str] = ("subject", "predicate", "object"),
+                               validate: str = "deferred") -> BulkLoadReport:
+        """
+        Load object-property edges from a (subject, predicate, object) table,
+        e.g. one written by `to_lakehouse_triples`. All batches stream into a
+        single `bulk_load` call, so the domain/range pass runs once.
+        """
+        def triples() -> Iterator[tuple[str, str, str]]:
+            for batch in self._read_batches(table, spark, list(columns)):
+                yield from zip(*(_arrow_strings(_arrow_column(batch, c)) for c in columns))
+
+        return self.ontology.bulk_load(triples(), validate=validate)
+
+    # ------------------------------ export --------------------------------
+
+    def iter_triple_batches(self) -> Iterator[Any]:
+        """Object-property edges as Arrow record batches of string
+        (subject, predicate, object) columns, `batch_size` rows each."""
+        pa = _pyarrow()
+        schema = _triple_schema(pa)
+        size = self.batch_size
+        ont = self.ontology
+        edge_columns = getattr(ont, "edge_columns", None)
+        if edge_columns is not None:
+            # Term ids gather straight from the index into string columns.
+            names = pa.array(list(ont.terms.names), pa.string())
+            cols = edge_columns()
+            for k in range(0, len(cols[0]), size):
+                yield pa.RecordBatch.from_arrays(
+                    [names.take(_arrow_ids(pa, col[k:k + size])) for col in cols],
+                    schema=schema)
+            return
+        # One pass over the individuals for every predicate; `_edges` per
+        # property would rescan them all once per object property.
+        props = ont.object_properties
+        rows: tuple[list[str], list[str], list[str]] = ([], [], [])
+        for s, ind in ont.individuals.items():
+            for pname, objects in ind.object_props.items():
+                if pname not in props:
+                    continue
+                for o in objects:
+                    rows[0].append(s)
+                    rows[1].append(pname)
+                    rows[2].append(o)
+                    if len(rows[0]) == size:
+                        yield pa.RecordBatch.from_arrays(
+                            [pa.array(col, pa.string()) for col in rows], schema=schema)
+                        rows = ([], [], [])
+        if rows[0]:
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(col, pa.string()) for col in rows], schema=schema)
+
+    def to_lakehouse_triples(self, table: str = "triples", spark: Any = None) -> int:
+        """Overwrite `table` with every object-property edge; returns the row count."""
+        pa = _pyarrow()
+        schema = _triple_schema(pa)
+        rows = 0
+
+        def counted() -> Iterator[Any]:
+            nonlocal rows
+            for batch in self.iter_triple_batches():
+                rows += batch.num_rows
+                yield batch
+
+        if self.root is None:
+            spark = spark or _spark_session()
+            # One DataFrame per batch: the first overwrites the table and the
+            # rest append, so the driver never holds more than one batch.
+            mode = "overwrite"
+            for batch in counted():
+                _spark_write_triples(spark, pa.Table.from_batches([batch]), table, mode)
+                mode = "append"
+            if mode == "overwrite":         # no edges: still replace the old table
+                _spark_write_triples(spark, schema.empty_table(), table, mode)
+            return rows
+
+        path = self.root / "Tables" / table
+        try:
+            from deltalake import write_deltalake  # type: ignore
+        except ImportError:
+            if (path / "_delta_log").is_dir():
+                raise ImportError(
+                    f"deltalake is required to overwrite the Delta table {path}.  "
+                    "Install with: pip install deltalake") from None
+        else:
+            write_deltalake(str(path), pa.RecordBatchReader.from_batches(schema, counted()),
+                            mode="overwrite")
+            return rows
+
+        import pyarrow.parquet as pq
+
+        # Write beside the old files (a leading '.' hides it from readers),
+        # then swap, so a failed export leaves the previous table intact.
+        path.mkdir(parents=True, exist_ok=True)
+        tmp = path / ".part-00000.parquet.tmp"
+        with pq.ParquetWriter(str(tmp), schema) as writer:
+            for batch in counted():
+                writer.write_batch(batch)
+        for old in path.glob("*.parquet"):
+            old.unlink()
+        os.replace(tmp, path / "part-00000.parquet")
+        return rows
 
-    def from_lakehouse(self, table: str): ...
-    def to_lakehouse_triples(self, table: str): ...
     def publish_to_onelake(self, path: str): ...
 
+    # ------------------------------ helpers -------------------------------
+
+    def _read_batches(self, table: str, spark: Any = None,
+                      columns: list[str] | None = None) -> Iterator[Any]:
+        pa = _pyarrow()
+        if self.root is not None:
+            yield from self._dataset(table).to_batches(columns=columns,
+                                                       batch_size=self.batch_size)
+            return
+        spark = spark or _spark_session()
+        # FABRIC INTEGRATION POINT — Lakehouse read
+        df = spark.read.format("delta").load(f"Tables/{table}")
+        if columns:
+            df = df.select(*columns)
+        # toLocalIterator() pulls one partition at a time to the driver,
+        # where rows are regrouped into `batch_size` batches; toArrow() or
+        # toPandas() would collect the whole table first.
+        names = df.columns
+        rows = df.toLocalIterator()
+        while chunk := list(itertools.islice(rows, self.batch_size)):
+            yield pa.RecordBatch.from_arrays([pa.array(col) for col in zip(*chunk)],
+                                             names=names)
+
+    def _dataset(self, table: str) -> Any:
+        path = self.root / "Tables" / table
+        if (path / "_delta_log").is_dir():
+            try:
+                from deltalake import DeltaTable  # type: ignore
+            except ImportError as e:
+                raise ImportError(
+                    f"deltalake is required to read the Delta table {path}.  "
+                    "Install with: pip install deltalake") from e
+            return DeltaTable(str(path)).to_pyarrow_dataset()
+        import pyarrow.dataset as ds
+
+        return ds.dataset(str(path), format="parquet")
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for columnar Lakehouse transfer.  "
+            "Install with: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def _spark_session() -> Any:
+    try:
+        from pyspark.sql import SparkSession  # type: ignore
+    except ImportError as e:
+        raise ImportError(
+            "pyspark is required to reach the Lakehouse without a folder.  "
+            "Install with: pip install pyspark, or pass root= to FabricAdapter"
+        ) from e
+    spark = SparkSession.getActiveSession()
+    if spark is None:
+        raise ValueError("No active Spark session: pass spark=, or root= (a Lakehouse "
+                         "folder such as /lakehouse/default) to FabricAdapter")
+    return spark
+
+
+def _spark_write_triples(spark: Any, data: Any, table: str, mode: str) -> None:
+    # Spark 4 takes an Arrow table directly; 3.x goes through pandas.
+    frame = data if int(spark.version.split(".")[0]) >= 4 else data.to_pandas()
+    # FABRIC INTEGRATION POINT — Lakehouse write
+    spark.createDataFrame(frame, schema="subject string, predicate string, object string") \
+         .write.format("delta").mode(mode).save(f"Tables/{table}")
+
+
+def _triple_schema(pa: Any) -> Any:
+    return pa.schema([("subject", pa.string()), ("predicate", pa.string()),
+                      ("object", pa.string())])
+
+
+def _arrow_column(batch: Any, name: str) -> Any:
+    i = batch.schema.get_field_index(name)
+    if i < 0:
+        raise ValueError(f"Column '{name}' not found; have {batch.schema.names}")
+    return batch.column(i)
+
+
+def _arrow_strings(column: Any) -> list[str | None]:
+    """Decode a string column, converting each distinct value once so that
+    repeated names (classes, predicates, subjects) share one str object."""
+    pa = _pyarrow()
+    encoded = column if pa.types.is_dictionary(column.type) else column.dictionary_encode()
+    names = encoded.dictionary.to_pylist()
+    return [None if i is None else names[i] for i in encoded.indices.to_pylist()]
+
+
+def _arrow_ids(pa: Any, ids: Any) -> Any:
+    """Zero-copy int32 Arrow array over an ``array('i')`` column."""
+    return pa.Array.from_buffers(pa.int32(), len(ids), [None, pa.py_buffer(ids)])
+
 
 if __name__ == "__main__":
     demo()
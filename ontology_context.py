@@ -0,0 +1,333 @@
+"""
+Prompt Context Assembler
+========================
+
+Fits intake sections (CSV samples, PDF and DOCX text) into a token budget
+before they are pasted into ``build_user_prompt``, so a large intake folder
+can neither overflow the model's context window nor run up the bill.
+
+  * Tokens are counted with tiktoken (``o200k_base``, the GPT-4o encoding)
+    when it is installed, and estimated at four bytes per token otherwise.
+  * The budget is split across source kinds by `DEFAULT_SHARES`; whatever a
+    kind does not need goes to the others.
+  * Sections that do not fit are cut into chunks — CSV column profiles and
+    sample rows, runs of PDF lines within a page, DOCX headings, paragraphs
+    and table rows — and each chunk is scored by the table names, column
+    names and request words it mentions (plurals folded, so "orders" counts
+    for ``order``), with a bonus for headings and dictionary-table rows. The
+    chunks with the best score per token are kept; a section's title lines
+    come with its first kept chunk.
+  * Kept chunks stay in document order, with ``[… omitted …]`` where text
+    was cut. The `ContextReport` says what was truncated and what was
+    dropped.
+
+Usage:
+    from ontology_context import assemble_context
+    from ontology_intake_processor import intake_sections
+
+    text, report = assemble_context(intake_sections("OntologyIntake"),
+                                    budget=24_000, query="orders and returns")
+    print(report.summary())     # 23,911 / 24,000 tokens; 1 truncated, ...
+
+Optional dependency:
+    pip install tiktoken
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+DEFAULT_BUDGET = 24_000
+DEFAULT_ENCODING = "o200k_base"
+
+# Share of the budget per source kind, before redistribution.
+DEFAULT_SHARES = {"csv": 0.35, "docx": 0.3, "pdf": 0.3, "file": 0.05}
+
+# Target size of a PDF / plain-text chunk, in characters.
+CHUNK_CHARS = 600
+
+OMITTED = "[… omitted …]"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by create for from generate give in into is it make "
+    "me model of on ontology or please the this to uploaded use using with".split())
+
+
+@dataclass
+class Section:
+    """One extracted file: ``kind`` is ``csv``, ``pdf``, ``docx`` or ``file``."""
+    kind: str
+    name: str
+    text: str
+
+
+@dataclass
+class ContextReport:
+    """What `assemble_context` kept, cut and dropped."""
+    budget: int
+    tokens: int = 0
+    exact: bool = True          # False when tiktoken was unavailable
+    by_kind: dict[str, int] = field(default_factory=dict)               # tokens kept
+    truncated: list[tuple[str, int, int]] = field(default_factory=list)  # (name, kept, total)
+    dropped: list[tuple[str, int]] = field(default_factory=list)         # (name, tokens)
+
+    def summary(self) -> str:
+        approx = "" if self.exact else "~"
+        parts = [f"{approx}{self.tokens:,} / {self.budget:,} tokens"]
+        if self.truncated:
+            parts.append(f"{len(self.truncated)} truncated")
+        if self.dropped:
+            names = ", ".join(name for name, _ in self.dropped[:3])
+            more = f" +{len(self.dropped) - 3}" if len(self.dropped) > 3 else ""
+            parts.append(f"{len(self.dropped)} dropped ({names}{more})")
+        return "; ".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Token counting
+# ---------------------------------------------------------------------------
+
+_ENCODERS: dict[str, Any] = {}
+
+
+def _encoder(encoding: str) -> Any:
+    if encoding not in _ENCODERS:
+        try:
+            import tiktoken
+
+            _ENCODERS[encoding] = tiktoken.get_encoding(encoding)
+        except Exception:  # noqa: BLE001 — not installed, or BPE file not downloadable
+            _ENCODERS[encoding] = None
+    return _ENCODERS[encoding]
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Tokens in `text`; an estimate when tiktoken is not installed."""
+    enc = _encoder(encoding)
+    if enc is None:
+        return -(-len(text.encode("utf-8")) // 4)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def join_sections(sections: Iterable[Section]) -> str:
+    """Sections as one context string, the way the intake builders return it."""
+    texts = [s.text for s in sections]
+    return "\n\n" + "\n\n".join(texts) if texts else ""
+
+
+# ---------------------------------------------------------------------------
+# Assembly
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Chunk:
+    section: int
+    index: int
+    text: str
+    tokens: int
+    score: float
+
+
+def assemble_context(sections: list[Section], budget: int = DEFAULT_BUDGET,
+                     query: str = "", shares: dict[str, float] | None = None,
+                     encoding: str = DEFAULT_ENCODING) -> tuple[str, ContextReport]:
+    """
+    Return the sections joined into at most `budget` tokens, and a report.
+
+    `query` (typically the user's request) adds its words to the relevance
+    vocabulary. `shares` overrides `DEFAULT_SHARES`; kinds missing from it
+    share nothing until other kinds leave budget over.
+    """
+    shares = DEFAULT_SHARES if shares is None else shares
+    report = ContextReport(budget=budget, exact=_encoder(encoding) is not None)
+    sep = count_tokens("\n\n", encoding)
+    sizes = [count_tokens(s.text, encoding) + sep for s in sections]
+
+    need: dict[str, int] = {}
+    for s, size in zip(sections, sizes):
+        need[s.kind] = need.get(s.kind, 0) + size
+    alloc = _allocate(budget, need, shares)
+
+    tables, columns = _vocabulary(sections)
+    asked = {w for w in _words(query) if w not in _STOPWORDS and len(w) > 2}
+
+    kept: dict[int, set[int]] = {}          # section -> kept chunk indexes
+    parts: dict[int, list[_Chunk]] = {}
+    for kind, allowance in alloc.items():
+        members = [i for i, s in enumerate(sections) if s.kind == kind]
+        if need[kind] <= allowance:
+            for i in members:
+                kept[i] = set()             # whole section, untouched
+            continue
+        chunks: list[_Chunk] = []
+        for i in members:
+            head, body = _split(sections[i])
+            parts[i] = [_Chunk(i, k, text, count_tokens(text, encoding) + 1,
+                               _score(text, tables, columns, asked))
+                        for k, text in enumerate([head, *body])]
+            chunks.extend(parts[i])
+        gap = count_tokens(OMITTED, encoding) + 1
+        left = allowance
+        # Best score per token first; ties go to the earlier text. A body
+        # chunk brings its section's title along; every chunk is charged
+        # for a possible gap marker, so the estimate errs on the safe side.
+        for c in sorted(chunks, key=lambda c: (-c.score / c.tokens, c.section, c.index)):
+            if c.section in kept:
+                if c.index in kept[c.section]:
+                    continue
+                cost = c.tokens + gap
+            else:
+                title = parts[c.section][0]
+                cost = title.tokens + sep + gap + (c.tokens if c.index else 0)
+            if cost <= left:
+                kept.setdefault(c.section, {0}).add(c.index)
+                left -= cost
+
+    texts: list[str] = []
+    for i, s in enumerate(sections):
+        if i not in kept:
+            report.dropped.append((s.name, sizes[i]))
+            continue
+        if not kept[i] or len(kept[i]) == len(parts[i]):
+            text = s.text
+        else:
+            text = _render(parts[i], kept[i])
+            report.truncated.append((s.name, count_tokens(text, encoding), sizes[i] - sep))
+        texts.append(text)
+        report.by_kind[s.kind] = report.by_kind.get(s.kind, 0) + count_tokens(text, encoding)
+
+    result = "\n\n".join(texts)
+    report.tokens = count_tokens(result, encoding)
+    return result, report
+
+
+def _allocate(budget: int, need: dict[str, int], shares: dict[str, float]) -> dict[str, int]:
+    """Split `budget` across kinds by share; a kind that needs less than its
+    share gets what it needs and the rest is re-split among the others."""
+    alloc: dict[str, int] = {}
+    open_kinds = [k for k in need if need[k] > 0]
+    left = budget
+    while open_kinds:
+        weights = {k: shares.get(k, 0.0) for k in open_kinds}
+        total = sum(weights.values())
+        if total <= 0:
+            weights = {k: 1.0 for k in open_kinds}
+            total = float(len(open_kinds))
+        fair = {k: left * w / total for k, w in weights.items()}
+        satisfied = [k for k in open_kinds if need[k] <= fair[k]]
+        if not satisfied:
+            for k in open_kinds:
+                alloc[k] = int(fair[k])
+            break
+        for k in satisfied:
+            alloc[k] = need[k]
+            left -= need[k]
+            open_kinds.remove(k)
+    return alloc
+
+
+def _split(section: Section) -> tuple[str, list[str]]:
+    """A section's title lines, and its body cut into chunks."""
+    lines = section.text.split("\n")
+    n = 1
+    csv = section.kind == "csv"
+    if csv:
+        # Title, columns and row count; a profiled CSV's per-column lines
+        # are chunks of their own, like its sample rows.
+        end = "profile:" if "profile:" in lines else "sample rows:"
+        while n < len(lines) and lines[n - 1] != end:
+            n += 1
+    head, body = "\n".join(lines[:n]), lines[n:]
+
+    # Headings, pages, table rows and CSV column profiles each start a
+    # chunk; "[TABLE]" and "sample rows:" stay with the row after them and
+    # "[/TABLE]" with the row before it.
+    chunks: list[str] = []
+    cur: list[str] = []
+    size = 0
+    for line in body:
+        starts = (line in ("[TABLE]", "sample rows:") or line.startswith(("#", "--- PDF page"))
+                  or (csv and line.startswith("- "))
+                  or (" | " in line and cur[-1:] not in (["[TABLE]"], ["sample rows:"]))
+                  or size >= CHUNK_CHARS)
+        after_row = bool(cur) and " | " in cur[-1] and line.strip() and line != "[/TABLE]"
+        if cur and (starts or after_row):
+            chunks.append("\n".join(cur))
+            cur, size = [], 0
+        cur.append(line)
+        size += len(line) + 1
+    if cur:
+        chunks.append("\n".join(cur))
+    return head, chunks
+
+
+def _render(chunks: list[_Chunk], kept: set[int]) -> str:
+    out: list[str] = []
+    last = -1
+    for c in chunks:
+        if c.index not in kept:
+            continue
+        if c.index != last + 1:
+            out.append(OMITTED)
+        out.append(c.text)
+        last = c.index
+    if last != len(chunks) - 1:
+        out.append(OMITTED)
+    return "\n".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Relevance
+# ---------------------------------------------------------------------------
+
+def _stem(word: str) -> str:
+    """`word` without a plural ending: ``orders`` → ``order``,
+    ``addresses`` → ``address``, ``categories`` → ``category``."""
+    if len(word) <= 3 or not word.endswith("s") or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return word[:-2]
+    return word[:-1]
+
+
+def _words(text: str) -> set[str]:
+    """Lower-case words with plurals stemmed, plus adjacent pairs and triples
+    run together, so ``order_lines``, ``order line`` and ``OrderLine`` all
+    yield ``orderline``."""
+    words = [_stem(w) for w in _WORD.findall(text.lower())]
+    found = set(words)
+    for n in (2, 3):
+        found.update("".join(words[k:k + n]) for k in range(len(words) - n + 1))
+    return found
+
+
+def _vocabulary(sections: list[Section]) -> tuple[set[str], set[str]]:
+    """Table names (CSV file stems) and column names, normalized like `_words`."""
+    tables: set[str] = set()
+    columns: set[str] = set()
+    for s in sections:
+        if s.kind != "csv":
+            continue
+        tables.add(_stem(re.sub(r"[^a-z0-9]", "", s.name.lower().rsplit(".", 1)[0])))
+        for line in s.text.split("\n", 3)[:3]:
+            if line.startswith("columns: "):
+                columns.update(_stem(re.sub(r"[^a-z0-9]", "", c.lower()))
+                               for c in line[9:].split(", "))
+    tables.discard("")
+    columns.discard("")
+    return tables, columns - tables
+
+
+def _score(text: str, tables: set[str], columns: set[str], asked: set[str]) -> float:
+    words = _words(text)
+    score = 1.0 + 3 * len(words & tables) + len(words & columns) + 2 * len(words & asked)
+    if text.startswith(("#", "===")):
+        score += 2                  # heading or section title
+    if " | " in text:
+        score += 1                  # dictionary entry / sample row
+    return score
@@ -0,0 +1,315 @@
+"""
+Ontology Diff & Patch
+=====================
+
+Triple-level differences between two `Ontology` objects, and a compact
+text form to ship them in, so a downstream store or UI can take a small
+delta instead of a full reload.
+
+`diff(old, new)` returns a `Patch`: the triples only `old` holds
+(``removed``) and the triples only `new` holds (``added``), in the
+``(subject, predicate, (object, kind))`` shape of `Ontology._iter_triples`.
+Entities are compared first and only the ones that differ are expanded into
+triples and hashed, so diffing two large, mostly equal A-Boxes costs one
+equality test per individual.
+
+`apply_patch(ont, patch)` replays a patch in place through the storage
+hooks, so `CompactOntology` and `DuckDBOntology` take patches too.
+Assertions go in as given: the patch already lists the inverse and
+symmetric triples, and domain/range problems are left to
+`check_consistency`.
+
+Patches are written in the RDF Patch text format: ``D`` (delete) and ``A``
+(add) rows between ``TX`` and ``TC``, with ``PA`` rows declaring the
+prefixes its terms are abbreviated with:
+
+    TX .
+    PA mfg: <https://example.org/mfg/> .
+    D mfg:CNC_001 mfg:hasStatus "idle" .
+    A mfg:CNC_001 mfg:hasStatus "running" .
+    TC .
+
+Usage:
+    from ontology_diff import Patch
+
+    patch = old.diff(new)
+    print(patch.summary())                     # {'added': 2, 'removed': 1}
+    text = patch.to_text()                     # send downstream
+    replica.apply_patch(Patch.parse(text))
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from ontology_builder import (_RDF_NS, _XSD_NS, Individual, Ontology, _iter_turtle,
+                              _literal_value, _nt_escape, _text_sink, _text_source)
+
+Triple = tuple[str, str, tuple[str, str]]
+
+_RDFS_NS = Ontology._RDFS
+_OWL_NS = Ontology._OWL
+
+# Always declared, so schema triples abbreviate well.
+_VOCAB = {"rdf": _RDF_NS, "rdfs": _RDFS_NS, "owl": _OWL_NS, "xsd": _XSD_NS}
+
+# Local names written as `prefix:local`; anything else is written as <iri>.
+_PN_LOCAL = re.compile(r"[\w\-]+")
+
+_SCHEMA_KINDS = frozenset({_OWL_NS + "Class", _OWL_NS + "ObjectProperty",
+                           _OWL_NS + "DatatypeProperty"})
+
+
+# ---------------------------------------------------------------------------
+# Patch
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Patch:
+    """Triples to remove, then triples to add."""
+    removed: list[Triple] = field(default_factory=list)
+    added: list[Triple] = field(default_factory=list)
+    prefixes: dict[str, str] = field(default_factory=dict)   # prefix -> namespace
+
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.added)
+
+    def __len__(self) -> int:
+        return len(self.removed) + len(self.added)
+
+    def summary(self) -> dict[str, int]:
+        return {"added": len(self.added), "removed": len(self.removed)}
+
+    def inverse(self) -> "Patch":
+        """The patch that undoes this one."""
+        return Patch(removed=list(self.added), added=list(self.removed),
+                     prefixes=dict(self.prefixes))
+
+    # ---- RDF Patch text ----
+
+    def to_text(self) -> str:
+        buf = io.StringIO()
+        self.write(buf)
+        return buf.getvalue()
+
+    def write(self, fp: Any, compress: bool = False) -> None:
+        """Write as RDF Patch text to a path or text file object."""
+        prefixes = {**_VOCAB, **self.prefixes}
+        # Longest namespace first, so nested namespaces abbreviate fully.
+        spaces = sorted(((ns, p) for p, ns in prefixes.items()), key=lambda x: -len(x[0]))
+
+        def term(iri: str) -> str:
+            for ns, p in spaces:
+                if iri.startswith(ns) and _PN_LOCAL.fullmatch(iri, len(ns)):
+                    return f"{p}:{iri[len(ns):]}"
+            return f"<{iri}>"
+
+        def row(op: str, triple: Triple) -> str:
+            s, p, (o, kind) = triple
+            if kind == "iri":
+                obj = term(o)
+            elif kind == _XSD_NS + "string":
+                obj = f'"{_nt_escape(o)}"'
+            else:
+                obj = f'"{_nt_escape(o)}"^^{term(kind)}'
+            return f"{op} {term(s)} {term(p)} {obj} .\n"
+
+        with _text_sink(fp, compress) as out:
+            out.write("TX .\n")
+            out.write("".join(f"PA {p}: <{ns}> .\n" for p, ns in prefixes.items()))
+            for op, triples in (("D", self.removed), ("A", self.added)):
+                for k in range(0, len(triples), 1000):
+                    out.write("".join(row(op, t) for t in triples[k:k + 1000]))
+            out.write("TC .\n")
+
+    @classmethod
+    def parse(cls, text: str) -> "Patch":
+        return cls._read(text.splitlines())
+
+    @classmethod
+    def read(cls, source: str | os.PathLike | Any) -> "Patch":
+        """Read RDF Patch text from a path (optionally gzipped) or file object."""
+        with _text_source(source) as lines:
+            return cls._read(lines)
+
+    @classmethod
+    def _read(cls, lines: Iterable[str]) -> "Patch":
+        patch = cls()
+        prefixes: dict[str, str] = {}
+        for lineno, line in enumerate(lines, 1):
+            op, _, rest = line.strip().partition(" ")
+            try:
+                if op in ("A", "D"):
+                    triples = list(_iter_turtle((rest,), prefixes))
+                    if len(triples) != 1:
+                        raise ValueError("expected exactly one triple")
+                    (patch.added if op == "A" else patch.removed).append(triples[0])
+                elif op == "PA":
+                    list(_iter_turtle(("@prefix " + rest,), prefixes))
+                elif op not in ("", "TX", "TC", "TA", "H") and not op.startswith("#"):
+                    raise ValueError(f"unsupported row {op!r}")
+            except (ValueError, RuntimeError) as e:   # RuntimeError: truncated row
+                raise ValueError(f"line {lineno}: not an RDF Patch row: {line.strip()[:80]}"
+                                 f" ({e})") from e
+        patch.prefixes = {p: ns for p, ns in prefixes.items() if _VOCAB.get(p) != ns}
+        return patch
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+def diff(old: Ontology, new: Ontology) -> Patch:
+    """The `Patch` that turns `old` into `new`."""
+    patch = Patch(prefixes={new.prefix: new.iri} if new.prefix else {})
+
+    def delta(before: Iterable[Triple], after: Iterable[Triple]) -> None:
+        before, after = list(before), list(after)
+        if before == after:
+            return
+        before_set, after_set = set(before), set(after)
+        patch.removed.extend(t for t in dict.fromkeys(before) if t not in after_set)
+        patch.added.extend(t for t in dict.fromkeys(after) if t not in before_set)
+
+    header = _RDF_NS + "type", (_OWL_NS + "Ontology", "iri")
+    delta([(old.iri.rstrip("/"), *header)], [(new.iri.rstrip("/"), *header)])
+
+    for name in dict.fromkeys([*old.classes, *old.object_properties, *old.data_properties,
+                               *new.classes, *new.object_properties, *new.data_properties]):
+        delta(old._schema_triples(name), new._schema_triples(name))
+
+    # An individual's triples depend only on itself, the namespace and the
+    # data-property datatypes; with those unchanged, equal individuals are
+    # skipped without building their triples.
+    same_context = old.iri == new.iri and (
+        {n: p.datatype for n, p in old.data_properties.items()}
+        == {n: p.datatype for n, p in new.data_properties.items()})
+    old_inds, new_inds = old.individuals, new.individuals
+    for name, ind in old_inds.items():
+        other = new_inds.get(name)
+        if other is None:
+            delta(old._individual_triples(ind), ())
+        elif not (same_context and _same(ind, other)):
+            delta(old._individual_triples(ind), new._individual_triples(other))
+    for name, ind in new_inds.items():
+        if name not in old_inds:
+            delta((), new._individual_triples(ind))
+    return patch
+
+
+def _same(a: Individual, b: Individual) -> bool:
+    """Equal individuals whose values also have equal types (``1 == True``)."""
+    return a == b and all(list(map(type, v)) == list(map(type, b.data_props[p]))
+                          for p, v in a.data_props.items())
+
+
+# ---------------------------------------------------------------------------
+# Apply
+# ---------------------------------------------------------------------------
+
+def apply_patch(ont: Ontology, patch: Patch) -> None:
+    """
+    Apply `patch` to `ont` in place: A-Box removals first, then schema
+    additions, A-Box additions and schema removals. Removing a triple that is
+    not there, or adding one that is, is a no-op.
+    """
+    rdf_type = _RDF_NS + "type"
+    named = _OWL_NS + "NamedIndividual"
+    header = ont.iri.rstrip("/")
+    base, cut = ont.iri, len(ont.iri)
+
+    def local(iri: str) -> str:
+        return iri[cut:] if iri.startswith(base) else iri
+
+    declared = {s for s, p, (o, _) in patch.added if p == rdf_type and o in _SCHEMA_KINDS}
+    tbox: dict[str, tuple[set[Triple], list[Triple]]] = {}
+    abox_removed: list[Triple] = []
+    abox_added: list[Triple] = []
+    for triples, abox, side in ((patch.removed, abox_removed, 0), (patch.added, abox_added, 1)):
+        for t in triples:
+            s = t[0]
+            if s == header:
+                continue
+            name = local(s)
+            if (s in declared or name in ont.classes or name in ont.object_properties
+                    or name in ont.data_properties):
+                entry = tbox.setdefault(name, (set(), []))
+                if side:
+                    entry[1].append(t)
+                else:
+                    entry[0].add(t)
+            else:
+                abox.append(t)
+
+    # ---- A-Box removals ----
+    # Before the schema changes: a literal is matched in the datatype it
+    # was stored under, which a redeclared data property may change.
+    touched: set[str] = set()
+    removed = False
+    for s, p, (o, kind) in abox_removed:
+        name = local(s)
+        if name not in ont.individuals:
+            continue
+        touched.add(name)
+        if p == rdf_type and o == named:
+            ont._remove_individual(name)
+            removed = True
+        elif p == rdf_type:
+            if local(o) in ont._types_of(name):
+                ont._remove_type(name, local(o))
+                removed = True
+        elif kind == "iri":
+            removed |= ont._remove_edge(name, local(p), local(o))
+        else:
+            pname = local(p)
+            # Every copy: RDF has one triple where the store may hold several.
+            for v in list(ont._values(name, pname)):
+                if ont._value_triple(s, pname, v)[2] == (o, kind):
+                    removed |= ont._remove_value(name, pname, v)
+    if removed:
+        ont._changed(None)
+
+    # ---- schema additions and changes ----
+    drops: list[tuple[str, list[str]]] = []
+    for name, (gone, new) in tbox.items():
+        props: dict[str, list[str]] = {}
+        for _, p, (o, _) in [t for t in ont._schema_triples(name) if t not in gone] + new:
+            props.setdefault(p, []).append(o)
+        kinds = props.get(rdf_type, [])
+        ont._declare_schema(name, props, local)
+        drops.append((name, kinds))
+
+    # ---- A-Box additions ----
+    def individual(name: str) -> None:
+        if name not in ont.individuals:
+            ont._store_individual(name, set())
+            ont._changed(("individual", name))
+
+    for s, p, (o, kind) in abox_added:
+        name = local(s)
+        individual(name)
+        touched.add(name)
+        if p == rdf_type:
+            if o != named:
+                ont._store_type(name, local(o))
+                ont._changed(("type", name, local(o)))
+        elif kind == "iri":
+            target = local(o)
+            individual(target)
+            if ont._add_edge(name, local(p), target):
+                ont._changed(("edge", name, local(p), target))
+        else:
+            value = _literal_value(o, kind)
+            ont._store_value(name, local(p), value)
+            ont._changed(("value", name, local(p), value))
+
+    # ---- schema removals ----
+    for name, kinds in drops:
+        ont._drop_schema(name, keep=kinds)
+    ont._touch(touched)
@@ -0,0 +1,415 @@
+"""
+DuckDB Ontology Store
+=====================
+
+A persistent backend for the `Ontology` engine in ``ontology_builder.py``.
+
+`DuckDBOntology` keeps the usual in-memory indexes for reasoning and
+validation, and mirrors every write into a DuckDB database file:
+
+  * ``classes``, ``object_properties``, ``data_properties`` — the T-Box;
+  * ``individuals`` — one row per individual, in declaration order;
+  * ``types`` — ``(individual, class)`` rdf:type assertions;
+  * ``triples`` — ``(subject, predicate, object)`` object-property edges,
+    indexed on ``(subject, predicate)`` and ``(predicate, object)``;
+  * ``data_values`` — ``(subject, predicate, value, datatype)`` literals;
+  * ``subclass_closure`` — a view of ``(class, ancestor)`` pairs, so
+    "instances of Equipment including subclasses" is a plain join.
+
+Opening an existing file rebuilds the in-memory ontology from those tables
+(no JSON or Turtle parsing). A-Box writes made through ``add_individual``,
+``add_type``, ``assert_object``, ``assert_data`` and ``bulk_load`` are
+buffered and written through in batches; the T-Box is rewritten whole on
+the next flush after any ``add_class`` / ``add_*_property`` call. `sql()`
+flushes and runs a query directly against the tables, and because the file
+is a normal DuckDB database, analysts can open it from the DuckDB CLI or a
+notebook without loading anything into Python objects.
+
+Usage:
+    from ontology_duckdb import DuckDBOntology
+
+    with DuckDBOntology("ontology/mfg.duckdb", iri="https://example.org/mfg/",
+                        prefix="mfg") as ont:
+        ont.add_class("Machine")
+        ont.add_individual("CNC_001", types=["Machine"])
+        ont.sql("SELECT predicate, count(*) FROM triples GROUP BY 1").fetchall()
+
+Requires duckdb (``pip install duckdb``); pyarrow is used for faster batch
+inserts when it is installed.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Iterable
+
+from ontology_builder import (_XSD_NS, DataProperty, Individual, ObjectProperty, OntClass,
+                              Ontology, _literal_value)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key VARCHAR, value VARCHAR);
+CREATE TABLE IF NOT EXISTS classes (
+    ord INTEGER, name VARCHAR, parents VARCHAR[], comment VARCHAR,
+    disjoint_with VARCHAR[]);
+CREATE TABLE IF NOT EXISTS object_properties (
+    ord INTEGER, name VARCHAR, domain VARCHAR, range_ VARCHAR,
+    inverse_of VARCHAR, transitive BOOLEAN, "symmetric" BOOLEAN,
+    functional BOOLEAN, comment VARCHAR);
+CREATE TABLE IF NOT EXISTS data_properties (
+    ord INTEGER, name VARCHAR, domain VARCHAR, datatype VARCHAR,
+    comment VARCHAR);
+CREATE TABLE IF NOT EXISTS individuals (ord BIGINT, name VARCHAR PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS types (individual VARCHAR, class VARCHAR);
+CREATE TABLE IF NOT EXISTS triples (subject VARCHAR, predicate VARCHAR, object VARCHAR);
+CREATE TABLE IF NOT EXISTS data_values (
+    ord BIGINT, subject VARCHAR, predicate VARCHAR, value VARCHAR, datatype VARCHAR);
+CREATE INDEX IF NOT EXISTS types_class ON types (class);
+CREATE INDEX IF NOT EXISTS types_individual ON types (individual);
+CREATE INDEX IF NOT EXISTS triples_sp ON triples (subject, predicate);
+CREATE INDEX IF NOT EXISTS triples_po ON triples (predicate, object);
+CREATE INDEX IF NOT EXISTS data_values_sp ON data_values (subject, predicate);
+CREATE OR REPLACE VIEW subclass_closure AS
+    WITH RECURSIVE c (class, ancestor) AS (
+        SELECT name, name FROM classes
+        UNION
+        SELECT c.class, p.parent
+        FROM c JOIN (SELECT name, unnest(parents) AS parent FROM classes) p
+             ON p.name = c.ancestor)
+    SELECT class, ancestor FROM c;
+"""
+
+# Column order of every buffered A-Box table.
+_COLUMNS = {
+    "individuals": ("ord", "name"),
+    "types": ("individual", "class"),
+    "triples": ("subject", "predicate", "object"),
+    "data_values": ("ord", "subject", "predicate", "value", "datatype"),
+}
+
+# Rows fetched per round trip when rebuilding the in-memory ontology.
+_FETCH = 100_000
+
+
+def _connect(path: str) -> Any:
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "duckdb is required for the DuckDB ontology store.  "
+            "Install with: pip install duckdb"
+        ) from e
+    return duckdb.connect(path)
+
+
+def _encode(value: Any) -> tuple[str, str]:
+    """Python value -> (lexical form, xsd datatype) as stored in ``data_values``."""
+    if isinstance(value, bool):
+        return ("true" if value else "false"), "xsd:boolean"
+    if isinstance(value, int):
+        return str(value), "xsd:integer"
+    if isinstance(value, float):
+        return repr(value), "xsd:double"
+    return str(value), "xsd:string"
+
+
+def _decode(lexical: str, datatype: str) -> Any:
+    return _literal_value(lexical, _XSD_NS + datatype.partition(":")[2])
+
+
+class DuckDBOntology(Ontology):
+    """
+    `Ontology` persisted to a DuckDB database, with write-through.
+
+    `path` is a database file (created if missing) or ``":memory:"``. When
+    the file already holds an ontology it is loaded on open and its stored
+    IRI and prefix win over the arguments. Buffered A-Box rows are written
+    every `batch_size` rows, on `flush()`, `sql()` and `close()`.
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:",
+                 iri: str = "https://example.org/ont/", prefix: str = "ex",
+                 batch_size: int = 50_000):
+        self.path = os.fspath(path)
+        self.con = _connect(self.path)
+        self.con.execute(_SCHEMA)
+        meta = dict(self.con.execute("SELECT key, value FROM meta").fetchall())
+        super().__init__(iri=meta.get("iri", iri), prefix=meta.get("prefix", prefix))
+        self.batch_size = batch_size
+        self._pending: dict[str, list[tuple]] = {t: [] for t in _COLUMNS}
+        self._pending_rows = 0
+        self._schema_dirty = not meta
+        self._loading = False
+        self._next_individual = 0
+        self._next_value = 0
+        if meta:
+            self._load_tables()
+        else:
+            self.flush()
+
+    # ------------------------------ schema --------------------------------
+    # The T-Box is small, so it is rewritten whole rather than diffed; a
+    # rewrite also carries any direct edits such as `OntClass.disjoint_with`.
+
+    def add_class(self, name: str, parents: Iterable[str] = (), comment: str = "",
+                  disjoint_with: Iterable[str] = ()) -> OntClass:
+        self._schema_dirty = True
+        return super().add_class(name, parents, comment, disjoint_with)
+
+    def add_object_property(self, name: str, domain: str | None = None,
+                            range_: str | None = None, **kwargs) -> ObjectProperty:
+        self._schema_dirty = True
+        return super().add_object_property(name, domain, range_, **kwargs)
+
+    def add_data_property(self, name: str, domain: str | None = None,
+                          datatype: str = "xsd:string", comment: str = "") -> DataProperty:
+        self._schema_dirty = True
+        return super().add_data_property(name, domain, datatype, comment)
+
+    def _write_schema(self) -> None:
+        con = self.con
+        for table in ("meta", "classes", "object_properties", "data_properties"):
+            con.execute(f"DELETE FROM {table}")
+        con.executemany("INSERT INTO meta VALUES (?, ?)",
+                        [("iri", self.iri), ("prefix", self.prefix)])
+        if self.classes:
+            con.executemany(
+                "INSERT INTO classes VALUES (?, ?, ?, ?, ?)",
+                [(i, c.name, sorted(c.parents), c.comment, sorted(c.disjoint_with))
+                 for i, c in enumerate(self.classes.values())])
+        if self.object_properties:
+            con.executemany(
+                "INSERT INTO object_properties VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(i, p.name, p.domain, p.range_, p.inverse_of, p.transitive,
+                  p.symmetric, p.functional, p.comment)
+                 for i, p in enumerate(self.object_properties.values())])
+        if self.data_properties:
+            con.executemany(
+                "INSERT INTO data_properties VALUES (?, ?, ?, ?, ?)",
+                [(i, p.name, p.domain, p.datatype, p.comment)
+                 for i, p in enumerate(self.data_properties.values())])
+        self._schema_dirty = False
+
+    # ------------------------------ storage -------------------------------
+
+    def _store_individual(self, name: str, types: set[str]) -> Individual:
+        if name in self.individuals:
+            # Redeclaring drops the old types, outgoing edges and values.
+            self.flush()
+            for table, col in (("types", "individual"), ("triples", "subject"),
+                               ("data_values", "subject")):
+                self.con.execute(f"DELETE FROM {table} WHERE {col} = ?", [name])
+        else:
+            self._pend("individuals", (self._next_individual, name))
+            self._next_individual += 1
+        for t in types:
+            self._pend("types", (name, t))
+        return super()._store_individual(name, types)
+
+    def _store_type(self, individual: str, cls: str) -> None:
+        if cls not in self._types_of(individual):
+            self._pend("types", (individual, cls))
+        super()._store_type(individual, cls)
+
+    def _store_value(self, subject: str, predicate: str, value: Any) -> None:
+        self._pend("data_values", (self._next_value, subject, predicate, *_encode(value)))
+        self._next_value += 1
+        super()._store_value(subject, predicate, value)
+
+    def _add_edge(self, subject: str, predicate: str, object_: str) -> bool:
+        if not super()._add_edge(subject, predicate, object_):
+            return False
+        self._pend("triples", (subject, predicate, object_))
+        return True
+
+    # Removals are rare (patches, see ``ontology_diff``): flush, then delete.
+
+    def _remove_individual(self, name: str) -> None:
+        self.flush()
+        for table, col in (("individuals", "name"), ("types", "individual"),
+                           ("triples", "subject"), ("triples", "object"),
+                           ("data_values", "subject")):
+            self.con.execute(f"DELETE FROM {table} WHERE {col} = ?", [name])
+        super()._remove_individual(name)
+
+    def _remove_type(self, individual: str, cls: str) -> None:
+        self.flush()
+        self.con.execute("DELETE FROM types WHERE individual = ? AND class = ?",
+                         [individual, cls])
+        super()._remove_type(individual, cls)
+
+    def _remove_value(self, subject: str, predicate: str, value: Any) -> bool:
+        if not super()._remove_value(subject, predicate, value):
+            return False
+        self.flush()
+        self.con.execute(
+            "DELETE FROM data_values WHERE ord = (SELECT min(ord) FROM data_values "
+            "WHERE subject = ? AND predicate = ? AND value = ? AND datatype = ?)",
+            [subject, predicate, *_encode(value)])
+        return True
+
+    def _remove_edge(self, subject: str, predicate: str, object_: str) -> bool:
+        if not super()._remove_edge(subject, predicate, object_):
+            return False
+        self.flush()
+        self.con.execute("DELETE FROM triples WHERE subject = ? AND predicate = ? "
+                         "AND object = ?", [subject, predicate, object_])
+        return True
+
+    def _drop_schema(self, name: str, keep: Iterable[str] = ()) -> None:
+        self._schema_dirty = True
+        super()._drop_schema(name, keep)
+
+    def _pend(self, table: str, row: tuple) -> None:
+        if self._loading:
+            return
+        self._pending[table].append(row)
+        self._pending_rows += 1
+        if self._pending_rows >= self.batch_size:
+            self.flush()
+
+    # ------------------------------ database ------------------------------
+
+    def flush(self) -> None:
+        """Write buffered rows (and a changed T-Box) in one transaction."""
+        if not self._pending_rows and not self._schema_dirty:
+            return
+        con = self.con
+        con.execute("BEGIN TRANSACTION")
+        try:
+            if self._schema_dirty:
+                self._write_schema()
+            for table, rows in self._pending.items():
+                if rows:
+                    self._insert(table, rows)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        for rows in self._pending.values():
+            rows.clear()
+        self._pending_rows = 0
+
+    def _insert(self, table: str, rows: list[tuple]) -> None:
+        cols = _COLUMNS[table]
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.con.executemany(
+                f"INSERT INTO {table} ({', '.join(cols)}) "
+                f"VALUES ({', '.join('?' * len(cols))})", rows)
+            return
+        batch = pa.table(dict(zip(cols, map(list, zip(*rows)))))
+        self.con.register("_pending_rows", batch)
+        try:
+            self.con.execute(f"INSERT INTO {table} ({', '.join(cols)}) "
+                             f"SELECT {', '.join(cols)} FROM _pending_rows")
+        finally:
+            self.con.unregister("_pending_rows")
+
+    def sql(self, query: str, params: Iterable[Any] | None = None) -> Any:
+        """Flush, then run `query` on the database; returns the DuckDB result
+        (call ``.fetchall()``, ``.df()`` or ``.arrow()`` on it)."""
+        self.flush()
+        return self.con.execute(query, list(params) if params is not None else None)
+
+    def predicate_counts(self) -> dict[str, int]:
+        """Stored edges per object property, counted in SQL."""
+        return dict(self.sql("SELECT predicate, count(*) FROM triples "
+                             "GROUP BY predicate ORDER BY predicate").fetchall())
+
+    def close(self) -> None:
+        self.flush()
+        self.con.close()
+
+    def __enter__(self) -> "DuckDBOntology":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------ load / copy ---------------------------
+
+    def _load_tables(self) -> None:
+        """Rebuild the in-memory ontology from the tables, without writing back."""
+        con = self.con
+        self._loading = True
+        try:
+            for _, name, parents, comment, disjoint in con.execute(
+                    "SELECT * FROM classes ORDER BY ord").fetchall():
+                Ontology.add_class(self, name, parents or (), comment or "", disjoint or ())
+            for row in con.execute(
+                    "SELECT name, domain, range_, inverse_of, transitive, \"symmetric\", "
+                    "functional, comment FROM object_properties ORDER BY ord").fetchall():
+                name, domain, range_, inverse_of, transitive, symmetric, functional, comment = row
+                Ontology.add_object_property(
+                    self, name, domain, range_, inverse_of=inverse_of,
+                    transitive=bool(transitive), symmetric=bool(symmetric),
+                    functional=bool(functional), comment=comment or "")
+            for _, name, domain, datatype, comment in con.execute(
+                    "SELECT * FROM data_properties ORDER BY ord").fetchall():
+                Ontology.add_data_property(self, name, domain, datatype, comment or "")
+
+            for rows in self._fetch("SELECT name FROM individuals ORDER BY ord"):
+                for (name,) in rows:
+                    self._store_individual(name, set())
+            for rows in self._fetch("SELECT individual, class FROM types"):
+                for name, cls in rows:
+                    self._store_type(name, cls)
+            for rows in self._fetch("SELECT predicate, subject, object FROM triples "
+                                    "ORDER BY predicate"):
+                start = 0
+                for i in range(1, len(rows) + 1):
+                    if i == len(rows) or rows[i][0] != rows[start][0]:
+                        self._add_edges(rows[start][0],
+                                        ((s, o) for _, s, o in rows[start:i]))
+                        start = i
+            for rows in self._fetch("SELECT subject, predicate, value, datatype "
+                                    "FROM data_values ORDER BY ord"):
+                for s, p, v, dt in rows:
+                    self._store_value(s, p, _decode(v, dt))
+        finally:
+            self._loading = False
+        self._next_individual, self._next_value = con.execute(
+            "SELECT (SELECT coalesce(max(ord) + 1, 0) FROM individuals), "
+            "(SELECT coalesce(max(ord) + 1, 0) FROM data_values)").fetchone()
+
+    def _fetch(self, query: str) -> Iterable[list[tuple]]:
+        cur = self.con.execute(query)
+        while rows := cur.fetchmany(_FETCH):
+            yield rows
+
+    @classmethod
+    def from_ontology(cls, source: Ontology, path: str | os.PathLike,
+                      overwrite: bool = False) -> "DuckDBOntology":
+        """Copy any `Ontology` (including `CompactOntology`) into a new database
+        at `path`. An existing database there is replaced only with `overwrite`."""
+        ont = cls(path, iri=source.iri, prefix=source.prefix)
+        if ont.classes or ont.individuals:
+            if not overwrite:
+                ont.con.close()
+                raise ValueError(f"{ont.path} already holds an ontology; pass overwrite=True")
+            for table in ("meta", "classes", "object_properties", "data_properties",
+                          *_COLUMNS):
+                ont.con.execute(f"DELETE FROM {table}")
+            ont.con.close()
+            ont = cls(path, iri=source.iri, prefix=source.prefix)
+
+        for c in source.classes.values():
+            ont.add_class(c.name, c.parents, c.comment, c.disjoint_with)
+        for p in source.object_properties.values():
+            ont.add_object_property(p.name, p.domain, p.range_, inverse_of=p.inverse_of,
+                                    transitive=p.transitive, symmetric=p.symmetric,
+                                    functional=p.functional, comment=p.comment)
+        for p in source.data_properties.values():
+            ont.add_data_property(p.name, p.domain, p.datatype, p.comment)
+        for name in source.individuals:
+            ont._store_individual(name, set(source._types_of(name)))
+        for pred in source.object_properties:
+            ont._add_edges(pred, source._edges(pred))
+        for name in source.individuals:
+            for pred in source.data_properties:
+                for v in source._values(name, pred):
+                    ont._store_value(name, pred, v)
+        ont.flush()
+        return ont
+
@@ -3,7 +3,8 @@ Ontology Intake Processor
 =========================
 
 Reads a folder (or uploaded files) containing:
-  - CSV files       → tabular data (sampled for the LLM prompt)
+  - CSV files       → tabular data (a per-column profile and a few rows
+                      sampled from across the file)
   - PDF files       → data-model diagrams / ERDs / documentation
   - DOCX files      → data dictionaries / glossaries
 
@@ -11,6 +12,15 @@ Produces a single combined context string suitable for the existing
 ``build_user_prompt`` / ``call_azure_openai`` pipeline in
 ``llm_ontology_generator.py``.
 
+Files are extracted in a process pool, and large PDFs are split into runs
+of ``PDF_PAGES_PER_TASK`` pages, so a long data-model PDF does not hold up
+the dictionaries next to it. Sections always come out in the same order as
+a one-by-one pass.
+
+Extracted text is cached on disk by content hash (see `ExtractionCache`),
+so a file that was read before — under any name, from the folder or as an
+upload — is not extracted again.
+
 Dependencies:
     pip install pdfplumber python-docx
 """
@@ -18,10 +28,143 @@ Dependencies:
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
+import json
 import os
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from ontology_context import Section, join_sections
+from ontology_profiler import TableProfile, link_references, profile_csv, resolve_engine
+
+# Pages per PDF extraction task; a PDF longer than this is split across workers.
+PDF_PAGES_PER_TASK = 16
+
+# Bump an extractor's version whenever its output changes, so cached text
+# from the old version is never served.
+EXTRACTOR_VERSIONS = {"pdf": 1, "docx": 1, "csv": 2, "profile": 2}
+
+
+# ---------------------------------------------------------------------------
+# Extraction cache (content-addressed, size-bounded LRU on disk)
+# ---------------------------------------------------------------------------
+
+class ExtractionCache:
+    """
+    Extracted text on disk, one ``<key>.txt`` file per entry. The key hashes
+    the file's bytes together with the extractor, its version and its
+    arguments, so a renamed or re-uploaded file still hits and an edited one
+    misses.
+
+    A hit refreshes the entry's mtime; when the entries outgrow `max_bytes`
+    the least recently used are deleted. Entries are written through a
+    temporary file and a rename, so processes can share a directory.
+    """
+
+    def __init__(self, root: str | os.PathLike, max_bytes: int = 256 << 20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None     # bytes on disk, scanned on first put
+
+    def key(self, kind: str, data: bytes, *args: Any) -> str:
+        h = hashlib.sha256(f"{kind}:{EXTRACTOR_VERSIONS[kind]}:{args!r}\0".encode())
+        h.update(data)
+        return h.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        path = self.root / f"{key}.txt"
+        try:
+            text = path.read_bytes().decode("utf-8")
+            os.utime(path)
+        except OSError:         # not cached, or evicted by another process
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        data = text.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        path = self.root / f"{key}.txt"
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:         # read-only or full disk: run uncached
+            tmp.unlink(missing_ok=True)
+            return
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        """``(mtime_ns, size, path)`` per entry, least recently used first."""
+        entries = []
+        for path in self.root.glob("*.txt"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        return sorted(entries)
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+
+# The cache every extractor uses; set to None to disable caching.
+CACHE: ExtractionCache | None = ExtractionCache(
+    os.environ.get("ONTOLOGY_INTAKE_CACHE")
+    or Path.home() / ".cache" / "ontology_intake")
+
+
+def _read_source(path_or_bytes: str | bytes | BytesIO) -> bytes:
+    if isinstance(path_or_bytes, bytes):
+        return path_or_bytes
+    if isinstance(path_or_bytes, BytesIO):
+        return path_or_bytes.getvalue()
+    return Path(path_or_bytes).read_bytes()
+
+
+def _cached(kind: str, path_or_bytes: str | bytes | BytesIO, args: tuple,
+            extract: Callable[[bytes], str]) -> str:
+    """`extract` the source's bytes, through `CACHE` when it is set."""
+    data = _read_source(path_or_bytes)
+    cache = CACHE
+    if cache is None:
+        return extract(data)
+    key = cache.key(kind, data, *args)
+    text = cache.get(key)
+    if text is None:
+        text = extract(data)
+        cache.put(key, text)
+    return text
+
 
 # ---------------------------------------------------------------------------
 # PDF text extraction (pdfplumber – layout-aware, table-friendly)
@@ -29,6 +172,15 @@ from typing import Any
 
 def extract_pdf_text(path_or_bytes: str | bytes | BytesIO) -> str:
     """Return the full text content of a PDF, page by page."""
+    return _cached("pdf", path_or_bytes, (),
+                   lambda data: "\n\n".join(extract_pdf_pages(data)[0]))
+
+
+def extract_pdf_pages(path_or_bytes: str | bytes | BytesIO,
+                      start: int = 0, stop: int | None = None) -> tuple[list[str], int]:
+    """Return the non-empty pages in ``[start, stop)`` as
+    ``--- PDF page N ---`` blocks, plus the document's page count.
+    Not cached; `extract_pdf_text` caches the whole document."""
     try:
         import pdfplumber
     except ImportError as e:
@@ -37,21 +189,16 @@ def extract_pdf_text(path_or_bytes: str | bytes | BytesIO) -> str:
             "Install with: pip install pdfplumber"
         ) from e
 
-    pages: list[str] = []
     if isinstance(path_or_bytes, (bytes, BytesIO)):
-        buf = BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes) else path_or_bytes
-        with pdfplumber.open(buf) as pdf:
-            for i, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ""
-                if text.strip():
-                    pages.append(f"--- PDF page {i} ---\n{text.strip()}")
-    else:
-        with pdfplumber.open(path_or_bytes) as pdf:
-            for i, page in enumerate(pdf.pages, 1):
-                text = page.extract_text() or ""
-                if text.strip():
-                    pages.append(f"--- PDF page {i} ---\n{text.strip()}")
-    return "\n\n".join(pages)
+        path_or_bytes = (BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes)
+                         else path_or_bytes)
+    pages: list[str] = []
+    with pdfplumber.open(path_or_bytes) as pdf:
+        for i, page in enumerate(pdf.pages[start:stop], start + 1):
+            text = page.extract_text() or ""
+            if text.strip():
+                pages.append(f"--- PDF page {i} ---\n{text.strip()}")
+        return pages, len(pdf.pages)
 
 
 # ---------------------------------------------------------------------------
@@ -60,6 +207,10 @@ def extract_pdf_text(path_or_bytes: str | bytes | BytesIO) -> str:
 
 def extract_docx_text(path_or_bytes: str | bytes | BytesIO) -> str:
     """Return the full text of a Word document (paragraphs + tables)."""
+    return _cached("docx", path_or_bytes, (), _docx_text)
+
+
+def _docx_text(path_or_bytes: str | bytes | BytesIO) -> str:
     try:
         import docx
     except ImportError as e:
@@ -104,44 +255,221 @@ def extract_docx_text(path_or_bytes: str | bytes | BytesIO) -> str:
 
 
 # ---------------------------------------------------------------------------
-# CSV sampling (reuses the same approach as llm_ontology_generator)
+# CSV sampling (streaming; shared with llm_ontology_generator.sample_csv)
 # ---------------------------------------------------------------------------
 
+# CSVs up to this size are read end to end (exact row count, uniform
+# reservoir sample, cached); larger ones are sampled by seeking.
+CSV_FULL_SCAN_BYTES = 32 << 20
+
+# Bytes read at each seek when sampling a large CSV.
+CSV_CHUNK_BYTES = 64 << 10
+
+
+@dataclass
+class CsvSample:
+    """Header and sampled rows of a CSV, in file order."""
+    header: list[str]
+    rows: list[list[str]]
+    row_count: int          # data rows, excluding the header
+    exact: bool             # False when `row_count` is an estimate
+
+    def row_count_text(self) -> str:
+        return f"{self.row_count:,}" if self.exact else f"~{self.row_count:,} (estimated)"
+
+
+def sample_csv_rows(path_or_bytes: str | os.PathLike | bytes | BytesIO,
+                    max_rows: int = 8, seed: int = 0) -> CsvSample:
+    """
+    Sample up to `max_rows` data rows from across a CSV without loading it.
+
+    Files up to `CSV_FULL_SCAN_BYTES` are streamed row by row through a
+    reservoir, so every row is equally likely and the count is exact.
+    Larger files are split into `max_rows` byte ranges; each contributes
+    one row picked from `CSV_CHUNK_BYTES` read at a random offset in its
+    range, and the row count is estimated from those chunks' bytes per
+    line. Rows whose width differs from the header's (a seek that landed
+    inside a quoted multi-line field) are skipped there.
+
+    The same `seed` gives the same sample, so prompts stay reproducible.
+    """
+    rng = random.Random(seed)
+    if isinstance(path_or_bytes, (bytes, BytesIO)):
+        f = BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes) else path_or_bytes
+        f.seek(0)
+        size = f.getbuffer().nbytes
+        return _sample_stream(f, size, max_rows, rng)
+    with open(path_or_bytes, "rb") as f:
+        return _sample_stream(f, os.fstat(f.fileno()).st_size, max_rows, rng)
+
+
+def _sample_stream(f: Any, size: int, max_rows: int, rng: random.Random) -> CsvSample:
+    if size <= CSV_FULL_SCAN_BYTES:
+        text = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="")
+        try:
+            reader = csv.reader(text)
+            header = next(reader, [])
+            picked: list[tuple[int, list[str]]] = []
+            n = 0
+            for row in reader:
+                if not row:
+                    continue        # blank line
+                n += 1
+                if len(picked) < max_rows:
+                    picked.append((n, row))
+                elif (j := rng.randrange(n)) < max_rows:
+                    picked[j] = (n, row)
+        finally:
+            text.detach()       # leave `f` open for the caller
+        return CsvSample(header, [row for _, row in sorted(picked)], n, True)
+
+    header = next(csv.reader([f.readline().decode("utf-8", errors="replace")]), [])
+    start = f.tell()
+    span = (size - start) / max(max_rows, 1)
+    rows: list[list[str]] = []
+    lines = read = 0
+    for k in range(max_rows):
+        lo = start + int(k * span)
+        f.seek(rng.randrange(lo, max(lo + 1, start + int((k + 1) * span))))
+        chunk = f.read(CSV_CHUNK_BYTES)
+        # Drop the partial line at each end; keep whole lines only.
+        body = chunk[chunk.find(b"\n") + 1:chunk.rfind(b"\n") + 1]
+        if not body:
+            continue
+        lines += body.count(b"\n")
+        read += len(body)
+        text = body.decode("utf-8", errors="replace").splitlines()
+        whole = [r for r in csv.reader(text) if len(r) == len(header)]
+        if whole:
+            rows.append(rng.choice(whole))
+    estimate = round((size - start) * lines / read) if read else 0
+    return CsvSample(header, rows, estimate, False)
+
+
 def sample_csv_text(path_or_bytes: str | bytes | BytesIO,
                     filename: str = "data.csv",
                     max_rows: int = 8) -> str:
-    """Return a small textual sample of a CSV — header + first N rows."""
+    """Return a small textual sample of a CSV — header, row count and N rows
+    from across the file (see `sample_csv_rows`)."""
     if isinstance(path_or_bytes, (bytes, BytesIO)):
-        buf = BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes) else path_or_bytes
-        text = buf.read().decode("utf-8", errors="replace")
-        lines = text.splitlines()
+        size = (len(path_or_bytes) if isinstance(path_or_bytes, bytes)
+                else path_or_bytes.getbuffer().nbytes)
     else:
         p = Path(path_or_bytes)
         if not p.exists():
             return f"(file not found: {path_or_bytes})"
-        lines = p.read_text(encoding="utf-8", errors="replace").splitlines()
+        size = p.stat().st_size
+    if size > CSV_FULL_SCAN_BYTES:
+        # Hashing would read the whole file; sampling it reads a few chunks.
+        return _csv_sample(path_or_bytes, filename, max_rows)
+    return _cached("csv", path_or_bytes, (filename, max_rows),
+                   lambda data: _csv_sample(data, filename, max_rows))
 
-    rows: list[list[str]] = []
-    reader = csv.reader(lines)
-    for i, row in enumerate(reader):
-        rows.append(row)
-        if i >= max_rows:
-            break
 
-    if not rows:
+def _csv_sample(path_or_bytes: str | bytes | BytesIO, filename: str, max_rows: int) -> str:
+    sample = sample_csv_rows(path_or_bytes, max_rows)
+    if not sample.header:
         return f"(empty CSV: {filename})"
 
+    rows = [sample.header, *sample.rows]
     width = max(len(r) for r in rows)
     rows = [r + [""] * (width - len(r)) for r in rows]
     header, *body = rows
     out = [f"=== CSV: {filename} ===",
            "columns: " + ", ".join(header),
+           f"rows: {sample.row_count_text()}",
            "sample rows:"]
     for r in body:
         out.append(" | ".join(r))
     return "\n".join(out)
 
 
+# CSV sections carry a column profile (type, nulls, distinct, min/max, key
+# candidates and the intake tables ``*_id`` columns reference; see
+# ontology_profiler) and this many sample rows, instead of the plain
+# eight-row sample.
+CSV_PROFILE = True
+CSV_PROFILE_SAMPLE_ROWS = 3
+
+
+def profile_csv_text(path_or_bytes: str | bytes | BytesIO,
+                     filename: str = "data.csv",
+                     sample_rows: int = CSV_PROFILE_SAMPLE_ROWS) -> str:
+    """Return a CSV's column profile with a few sample rows (see
+    `ontology_profiler.TableProfile.to_text`). A lone file references no
+    other table."""
+    if isinstance(path_or_bytes, (bytes, BytesIO)):
+        size = (len(path_or_bytes) if isinstance(path_or_bytes, bytes)
+                else path_or_bytes.getbuffer().nbytes)
+    else:
+        p = Path(path_or_bytes)
+        if not p.exists():
+            return f"(file not found: {path_or_bytes})"
+        size = p.stat().st_size
+    if size > CSV_FULL_SCAN_BYTES:
+        # Profiling reads the file once; hashing it first would read it twice.
+        payload = _csv_profile(path_or_bytes, filename, sample_rows)
+    else:
+        payload = _cached("profile", path_or_bytes, (filename, sample_rows, resolve_engine()),
+                          lambda data: _csv_profile(data, filename, sample_rows))
+    return _render_profiles([(filename, payload)])[0]
+
+
+def _csv_profile(path_or_bytes: str | bytes | BytesIO, filename: str, sample_rows: int) -> str:
+    """The profile and sample rows as JSON — what is cached, since references
+    are only linked once every CSV of an intake is profiled."""
+    profile = profile_csv(path_or_bytes, name=Path(filename).stem)
+    if not profile.columns:
+        return json.dumps({"text": f"(empty CSV: {filename})"})
+    sample = sample_csv_rows(path_or_bytes, sample_rows)
+    return json.dumps({"profile": profile.to_dict(), "rows": sample.rows})
+
+
+def _render_profiles(payloads: list[tuple[str, str]]) -> list[str]:
+    """Section texts of ``(filename, payload)`` pairs from `_csv_profile` /
+    `_csv_section`, with references linked across all of them."""
+    decoded = [json.loads(payload) for _, payload in payloads]
+    profiles = [TableProfile.from_dict(d["profile"]) for d in decoded if "profile" in d]
+    link_references(profiles)
+    tables = iter(profiles)
+    return [next(tables).to_text(d["rows"], filename) if "profile" in d else d["text"]
+            for (filename, _), d in zip(payloads, decoded)]
+
+
+def _csv_cache_args(filename: str, profile: bool) -> tuple[str, tuple]:
+    """Cache kind and arguments of the section `_csv_section` builds, the
+    same as `profile_csv_text` / `sample_csv_text` use."""
+    if profile:
+        return "profile", (filename, CSV_PROFILE_SAMPLE_ROWS, resolve_engine())
+    return "csv", (filename, 8)
+
+
+def _csv_cacheable(path_or_bytes: str | bytes | BytesIO) -> bool:
+    if isinstance(path_or_bytes, (bytes, BytesIO)):
+        size = (len(path_or_bytes) if isinstance(path_or_bytes, bytes)
+                else path_or_bytes.getbuffer().nbytes)
+    else:
+        size = os.stat(path_or_bytes).st_size
+    return size <= CSV_FULL_SCAN_BYTES
+
+
+def _csv_section(path_or_bytes: str | bytes, filename: str, profile: bool) -> str:
+    """A CSV's section, uncached (runs in the pool). With `profile` it is a
+    `_csv_profile` payload — holding the plain sample when the profiler
+    cannot parse the file — and otherwise the sample text."""
+    if isinstance(path_or_bytes, str) and not Path(path_or_bytes).exists():
+        text = f"(file not found: {path_or_bytes})"
+    elif profile:
+        try:
+            return _csv_profile(path_or_bytes, filename, CSV_PROFILE_SAMPLE_ROWS)
+        except Exception:
+            # A CSV the profiler cannot parse still gets a sample.
+            text = _csv_sample(path_or_bytes, filename, 8)
+    else:
+        return _csv_sample(path_or_bytes, filename, 8)
+    return json.dumps({"text": text}) if profile else text
+
+
 # ---------------------------------------------------------------------------
 # Folder scanner
 # ---------------------------------------------------------------------------
@@ -170,77 +498,173 @@ def scan_intake_folder(folder: str | Path) -> dict[str, list[Path]]:
 # Build combined context from a folder
 # ---------------------------------------------------------------------------
 
-def build_intake_context(folder: str | Path) -> str:
+def build_intake_context(folder: str | Path, workers: int | None = None) -> str:
     """Read all CSVs, PDFs, and DOCX files from the intake folder and
-    return a single combined context string for the LLM prompt."""
-    files = scan_intake_folder(folder)
-    sections: list[str] = []
-
-    # CSVs — tabular data samples
-    for csv_path in files["csv"]:
-        sections.append(sample_csv_text(str(csv_path), filename=csv_path.name))
+    return a single combined context string for the LLM prompt.
 
-    # PDFs — data model / ERD documentation
-    for pdf_path in files["pdf"]:
-        try:
-            text = extract_pdf_text(str(pdf_path))
-            if text.strip():
-                sections.append(f"=== PDF: {pdf_path.name} ===\n{text}")
-        except Exception as e:
-            sections.append(f"=== PDF: {pdf_path.name} === (extraction error: {e})")
+    `workers` caps the extraction processes (default: one per CPU);
+    ``workers=1`` extracts in this process. For a context that fits a
+    token budget, pass `intake_sections` to `ontology_context.assemble_context`.
+    """
+    return join_sections(intake_sections(folder, workers))
 
-    # DOCX — data dictionary / glossary
-    for docx_path in files["docx"]:
-        try:
-            text = extract_docx_text(str(docx_path))
-            if text.strip():
-                sections.append(f"=== DOCX: {docx_path.name} ===\n{text}")
-        except Exception as e:
-            sections.append(f"=== DOCX: {docx_path.name} === (extraction error: {e})")
 
-    return "\n\n" + "\n\n".join(sections) if sections else ""
+def intake_sections(folder: str | Path, workers: int | None = None) -> list[Section]:
+    """The non-empty sections `build_intake_context` joins, one per file."""
+    files = scan_intake_folder(folder)
+    # CSVs (tabular samples), then PDFs (data model / ERD), then DOCX
+    # (data dictionary / glossary).
+    items = ([("csv", p.name, str(p)) for p in files["csv"]]
+             + [("pdf", p.name, str(p)) for p in files["pdf"]]
+             + [("docx", p.name, str(p)) for p in files["docx"]])
+    return _sections(items, workers)
 
 
 # ---------------------------------------------------------------------------
 # Build combined context from uploaded files (Streamlit UploadedFile objects)
 # ---------------------------------------------------------------------------
 
-def build_uploaded_context(uploaded_files: list[Any]) -> str:
+def build_uploaded_context(uploaded_files: list[Any], workers: int | None = None) -> str:
     """Process a list of Streamlit UploadedFile objects and return
     a combined context string for the LLM prompt."""
-    sections: list[str] = []
+    return join_sections(uploaded_sections(uploaded_files, workers))
+
 
+def uploaded_sections(uploaded_files: list[Any], workers: int | None = None) -> list[Section]:
+    """The non-empty sections `build_uploaded_context` joins, one per file."""
+    items: list[tuple[str, str, Any]] = []
     for uf in uploaded_files:
         name = uf.name
         ext = Path(name).suffix.lower()
-        data = uf.getvalue()
+        kind = {".csv": "csv", ".pdf": "pdf", ".docx": "docx", ".doc": "docx"}.get(ext, "text")
+        items.append((kind, name, uf.getvalue()))
+    return _sections(items, workers)
 
-        if ext == ".csv":
-            sections.append(sample_csv_text(data, filename=name))
-        elif ext == ".pdf":
-            try:
-                text = extract_pdf_text(data)
-                if text.strip():
-                    sections.append(f"=== PDF: {name} ===\n{text}")
-            except Exception as e:
-                sections.append(f"=== PDF: {name} === (extraction error: {e})")
-        elif ext in (".docx", ".doc"):
+
+def _sections(items: list[tuple[str, str, Any]], workers: int | None) -> list[Section]:
+    return [Section("file" if kind == "text" else kind, name, text)
+            for (kind, name, _), text in zip(items, _extract_sections(items, workers)) if text]
+
+
+# ---------------------------------------------------------------------------
+# Parallel extraction
+# ---------------------------------------------------------------------------
+
+class _InlineExecutor:
+    """`ProcessPoolExecutor.submit` run on the spot, for ``workers=1``."""
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def _extract_sections(items: list[tuple[str, str, Any]],
+                      workers: int | None = None) -> list[str]:
+    """Extract ``(kind, name, path or bytes)`` items into context sections,
+    in item order; a section is empty when its file had no text.
+
+    Cached sections are read here. Profiled CSVs come back as payloads and
+    are rendered together at the end, so ``*_id`` columns can be linked to
+    the other tables of the intake. Each remaining CSV (profile or sample)
+    and DOCX is one pool task; a PDF's first task also reports its page
+    count, and the rest of its pages are then queued in runs of
+    `PDF_PAGES_PER_TASK`. Only this process reads and writes the cache;
+    CSVs over `CSV_FULL_SCAN_BYTES` are not cached, since hashing them
+    would read them whole.
+    """
+    cache = CACHE
+    profile = CSV_PROFILE
+    texts: dict[int, str] = {}
+    keys: dict[int, str] = {}
+    for i, (kind, name, source) in enumerate(items):
+        if kind not in ("csv", "pdf", "docx") or cache is None:
+            continue
+        try:
+            if kind == "csv" and not _csv_cacheable(source):
+                continue
+            data = _read_source(source)
+        except OSError:
+            continue                # the extractor reports it
+        cache_kind, args = _csv_cache_args(name, profile) if kind == "csv" else (kind, ())
+        keys[i] = cache.key(cache_kind, data, *args)
+        hit = cache.get(keys[i])
+        if hit is not None:
+            texts[i] = hit
+
+    tasks = [i for i, (kind, _, _) in enumerate(items)
+             if kind in ("csv", "pdf", "docx") and i not in texts]
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+    pool = (ProcessPoolExecutor(max_workers=workers) if workers > 1
+            else nullcontext(_InlineExecutor()))
+    with pool as executor:
+        first: dict[int, Future] = {}
+        for i in tasks:
+            kind, _, source = items[i]
+            if kind == "csv":
+                first[i] = executor.submit(_csv_section, source, items[i][1], profile)
+            elif kind == "pdf":
+                first[i] = executor.submit(extract_pdf_pages, source, 0, PDF_PAGES_PER_TASK)
+            else:
+                first[i] = executor.submit(_docx_text, source)
+
+        # Queue the rest of each PDF once its page count is known.
+        rest: dict[int, list[Future]] = {}
+        for i in tasks:
+            if items[i][0] == "pdf" and first[i].exception() is None:
+                count = first[i].result()[1]
+                rest[i] = [executor.submit(extract_pdf_pages, items[i][2], k,
+                                           k + PDF_PAGES_PER_TASK)
+                           for k in range(PDF_PAGES_PER_TASK, count, PDF_PAGES_PER_TASK)]
+
+        sections: list[str] = []
+        payloads: dict[int, str] = {}       # profiled CSVs, rendered below
+        for i, (kind, name, source) in enumerate(items):
+            if kind == "text":
+                sections.append(_text_section(name, source))
+                continue
+            label = kind.upper()
             try:
-                text = extract_docx_text(data)
-                if text.strip():
-                    sections.append(f"=== DOCX: {name} ===\n{text}")
+                if i in texts:
+                    text = texts[i]
+                else:
+                    if kind == "csv":
+                        text = first[i].result()
+                    elif kind == "pdf":
+                        pages = first[i].result()[0]
+                        for future in rest[i]:
+                            pages += future.result()[0]
+                        text = "\n\n".join(pages)
+                    else:
+                        text = first[i].result()
+                    if i in keys:
+                        cache.put(keys[i], text)
+                if kind == "csv" and profile:
+                    payloads[i] = text
+                    sections.append("")
+                elif kind == "csv":
+                    sections.append(text)       # already titled
+                else:
+                    sections.append(f"=== {label}: {name} ===\n{text}" if text.strip() else "")
             except Exception as e:
-                sections.append(f"=== DOCX: {name} === (extraction error: {e})")
-        else:
-            # Try to read as plain text
-            try:
-                text = data.decode("utf-8", errors="replace")
-                if text.strip():
-                    sections.append(f"=== FILE: {name} ===\n{text[:3000]}")
-            except Exception:
-                sections.append(f"=== FILE: {name} === (unsupported format)")
+                sections.append(f"=== {label}: {name} === (extraction error: {e})")
+    # References need every profile, so CSVs are rendered last.
+    rendered = _render_profiles([(items[i][1], payloads[i]) for i in payloads])
+    for i, text in zip(payloads, rendered):
+        sections[i] = text
+    return sections
 
-    return "\n\n" + "\n\n".join(sections) if sections else ""
+
+def _text_section(name: str, data: bytes) -> str:
+    """Try to read an unrecognised upload as plain text."""
+    try:
+        text = data.decode("utf-8", errors="replace")
+        return f"=== FILE: {name} ===\n{text[:3000]}" if text.strip() else ""
+    except Exception:
+        return f"=== FILE: {name} === (unsupported format)"
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,469 @@
+"""
+CSV Column Profiler
+===================
+
+One pass over a CSV that describes each column — inferred type, null ratio,
+distinct count, min / max — and flags candidate primary keys. Profiled
+together, `link_references` points each ``*_id`` column at the table it
+likely joins. The profile tells the LLM more about a table's schema than a
+handful of sample rows, in fewer tokens, however wide or long the table is.
+
+Two engines, same `TableProfile`:
+
+  * ``duckdb`` (when installed): one aggregate query over ``read_csv``.
+    Distinct counts are exact for files up to `EXACT_DISTINCT_BYTES` and
+    HyperLogLog estimates (``approx_count_distinct``) above that.
+  * ``python``: a streaming ``csv`` pass in bounded memory. Distinct values
+    are counted exactly up to `EXACT_DISTINCT_LIMIT` per column, then by a
+    `HyperLogLog` sketch.
+
+Both treat empty fields and ``NULL`` / ``NA`` / ``N/A`` as nulls, and infer
+one of ``boolean``, ``integer``, ``double``, ``date``, ``timestamp``,
+``time`` or ``varchar``.
+
+Usage:
+    from ontology_profiler import link_references, profile_csv
+
+    profiles = [profile_csv(p) for p in ("OntologyIntake/order.csv",
+                                         "OntologyIntake/order_line.csv")]
+    link_references(profiles)
+    print(profiles[1].primary_key)      # ['line_id']
+    print(profiles[1].to_text())        # ... order_id: ...; likely references order
+
+Optional dependency:
+    pip install duckdb
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import math
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time, timezone
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+NULLS = ("", "NULL", "null", "NA", "N/A")
+
+# Files up to this size get exact distinct counts from DuckDB.
+EXACT_DISTINCT_BYTES = 32 << 20
+
+# Distinct values the python engine counts exactly before switching to HLL.
+EXACT_DISTINCT_LIMIT = 4096
+
+# A column is a key candidate when it has no nulls and at least this share
+# of distinct values (below 1.0 only to absorb HyperLogLog error).
+KEY_DISTINCT_RATIO = 0.98
+
+_KEY_TYPES = frozenset({"integer", "varchar"})
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    type: str
+    nulls: int = 0
+    distinct: int = 0
+    approx: bool = False            # `distinct` is a HyperLogLog estimate
+    min: str | None = None
+    max: str | None = None
+    references: str | None = None   # profiled table a ``*_id`` column likely joins
+
+    def null_ratio(self, rows: int) -> float:
+        return self.nulls / rows if rows else 0.0
+
+
+@dataclass
+class TableProfile:
+    name: str                       # file stem, e.g. "order_line"
+    rows: int
+    columns: list[ColumnProfile] = field(default_factory=list)
+    primary_key: list[str] = field(default_factory=list)    # candidates, best first
+    engine: str = "python"
+
+    def to_text(self, sample_rows: list[list[str]] = (), filename: str | None = None) -> str:
+        """Compact prompt text: header, row count, one line per column, samples."""
+        out = [f"=== CSV: {filename or self.name + '.csv'} ===",
+               "columns: " + ", ".join(c.name for c in self.columns),
+               f"rows: {self.rows:,}",
+               "profile:"]
+        for c in self.columns:
+            parts = [c.type, f"{'~' if c.approx else ''}{c.distinct:,} distinct"]
+            if c.min is not None:
+                parts.append(c.min if c.min == c.max else f"{_clip(c.min)} .. {_clip(c.max)}")
+            if c.nulls:
+                parts.append(f"{c.null_ratio(self.rows):.0%} null")
+            if c.name in self.primary_key:
+                parts.append("primary key candidate")
+            if c.references:
+                parts.append(f"likely references {c.references}")
+            out.append(f"- {c.name}: " + "; ".join(parts))
+        out.append("sample rows:")
+        width = len(self.columns)
+        out.extend(" | ".join(r + [""] * (width - len(r))) for r in sample_rows)
+        return "\n".join(out)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TableProfile:
+        return cls(**{**data, "columns": [ColumnProfile(**c) for c in data["columns"]]})
+
+
+def _clip(value: str | None, limit: int = 40) -> str:
+    return value if value is None or len(value) <= limit else value[:limit - 1] + "…"
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def profile_csv(path_or_bytes: str | os.PathLike | bytes | BytesIO,
+                name: str | None = None, engine: str = "auto") -> TableProfile:
+    """
+    Profile a CSV file (or its bytes). `name` defaults to the file stem.
+
+    ``engine="auto"`` uses DuckDB when it is importable and the python
+    engine otherwise; ``"duckdb"`` requires it.
+    """
+    engine = resolve_engine(engine)
+    if name is None:
+        name = (Path(path_or_bytes).stem if not isinstance(path_or_bytes, (bytes, BytesIO))
+                else "data")
+
+    if engine == "duckdb":
+        profile = _profile_duckdb(path_or_bytes, name)
+    elif isinstance(path_or_bytes, (bytes, BytesIO)):
+        data = path_or_bytes if isinstance(path_or_bytes, bytes) else path_or_bytes.getvalue()
+        profile = _profile_python(BytesIO(data), name)
+    else:
+        with open(path_or_bytes, "rb") as f:
+            profile = _profile_python(f, name)
+    _flag_keys(profile)
+    return profile
+
+
+def resolve_engine(engine: str = "auto") -> str:
+    """The engine `profile_csv` runs for `engine`: ``"auto"`` is ``"duckdb"``
+    when duckdb is importable and ``"python"`` otherwise."""
+    if engine not in ("auto", "duckdb", "python"):
+        raise ValueError(f"engine must be 'auto', 'duckdb' or 'python', not {engine!r}")
+    if engine == "auto":
+        try:
+            import duckdb  # noqa: F401
+            return "duckdb"
+        except ImportError:
+            return "python"
+    return engine
+
+
+def _flag_keys(profile: TableProfile) -> None:
+    """Candidate primary keys, ``<table>_id`` / ``id`` first."""
+    table = profile.name.lower()
+    candidates = [c for c in profile.columns
+                  if profile.rows > 1 and c.nulls == 0 and c.type in _KEY_TYPES
+                  and c.distinct >= (KEY_DISTINCT_RATIO * profile.rows if c.approx
+                                     else profile.rows)]
+    own = (f"{table}_id", "id")
+    candidates.sort(key=lambda c: c.name.lower() not in own)
+    profile.primary_key = [c.name for c in candidates]
+
+
+def link_references(profiles: list[TableProfile]) -> None:
+    """
+    Set `ColumnProfile.references` across tables profiled together: a
+    ``<x>_id`` column (other than its table's own key) likely references
+    the table named ``x``, or else the table whose first key candidate has
+    the same name. A column that matches neither references nothing.
+    """
+    tables = {p.name.lower(): p for p in profiles}
+    keys: dict[str, TableProfile] = {}
+    for p in profiles:
+        if p.primary_key:
+            keys.setdefault(p.primary_key[0].lower(), p)
+    for p in profiles:
+        own = p.primary_key[0].lower() if p.primary_key else None
+        for c in p.columns:
+            lowered = c.name.lower()
+            c.references = None
+            if not lowered.endswith("_id") or lowered == own:
+                continue
+            target = tables.get(lowered[:-3]) or keys.get(lowered)
+            if target is not None and target is not p:
+                c.references = target.name
+
+
+# ---------------------------------------------------------------------------
+# DuckDB engine
+# ---------------------------------------------------------------------------
+
+_DUCKDB_TYPES = {
+    "BOOLEAN": "boolean",
+    **dict.fromkeys(("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT",
+                     "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT"), "integer"),
+    **dict.fromkeys(("FLOAT", "DOUBLE", "DECIMAL"), "double"),
+    "DATE": "date",
+    **dict.fromkeys(("TIMESTAMP", "TIMESTAMP WITH TIME ZONE", "TIMESTAMP_S",
+                     "TIMESTAMP_MS", "TIMESTAMP_NS"), "timestamp"),
+    **dict.fromkeys(("TIME", "TIME WITH TIME ZONE"), "time"),
+}
+
+
+def _profile_duckdb(path_or_bytes: str | os.PathLike | bytes | BytesIO,
+                    name: str) -> TableProfile:
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "duckdb is required for engine='duckdb'.  "
+            "Install with: pip install duckdb"
+        ) from e
+
+    tmp = None
+    if isinstance(path_or_bytes, (bytes, BytesIO)):
+        data = path_or_bytes if isinstance(path_or_bytes, bytes) else path_or_bytes.getvalue()
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as f:
+            f.write(data)
+        path = tmp = f.name
+    else:
+        path = os.fspath(path_or_bytes)
+    con = duckdb.connect()
+    try:
+        # Read the header the way the python engine does; an empty file has
+        # no columns (the sniffer would invent a ``column0``).
+        with open(path, encoding="utf-8", errors="replace", newline="") as f:
+            width = len(next(csv.reader(f), []))
+        if not width:
+            return TableProfile(name=name, rows=0, engine="duckdb")
+        exact = os.path.getsize(path) <= EXACT_DISTINCT_BYTES
+        nulls = ", ".join("'" + n.replace("'", "''") + "'" for n in NULLS)
+        # The python csv dialect, with short rows padded with nulls; fields
+        # past the header's width come back as extra columns, dropped below.
+        dialect = ("delim = ',', quote = '\"', escape = '\"', header = true, "
+                   "null_padding = true, strict_mode = false")
+        for options in ("", ", sample_size = -1", ", all_varchar = true"):
+            # The sniffer only reads the head; if a later row breaks its
+            # guess, sniff the whole file, and as a last resort read text.
+            source = f"read_csv(?, nullstr = [{nulls}], {dialect}{options})"
+            try:
+                described = con.execute(f"DESCRIBE SELECT * FROM {source}",
+                                        [path]).fetchall()[:width]
+                distinct = "count(DISTINCT {0})" if exact else "approx_count_distinct({0})"
+                aggregates = ["count(*)"]
+                for col, kind, *_ in described:
+                    q = '"' + col.replace('"', '""') + '"'
+                    # Zoned timestamps as naive UTC, the way the python engine shows them.
+                    v = f"timezone('UTC', {q})" if kind == "TIMESTAMP WITH TIME ZONE" else q
+                    aggregates.append(f"count({q}), {distinct.format(q)}, "
+                                      f"min({v})::VARCHAR, max({v})::VARCHAR")
+                row = con.execute(f"SELECT {', '.join(aggregates)} FROM {source}",
+                                  [path]).fetchone()
+                break
+            except duckdb.Error:
+                if options == ", all_varchar = true":
+                    raise
+    finally:
+        con.close()
+        if tmp:
+            os.unlink(tmp)
+
+    rows = row[0]
+    profile = TableProfile(name=name, rows=rows, engine="duckdb")
+    for k, (col, kind) in enumerate((r[0], r[1].upper()) for r in described):
+        present, distinct, lo, hi = row[1 + 4 * k: 5 + 4 * k]
+        ctype = _DUCKDB_TYPES.get(kind.split("(")[0], "varchar")
+        profile.columns.append(ColumnProfile(col, ctype, rows - present, distinct,
+                                             not exact, lo, hi))
+    return profile
+
+
+# ---------------------------------------------------------------------------
+# Python engine
+# ---------------------------------------------------------------------------
+
+class HyperLogLog:
+    """Cardinality sketch with ``2**p`` registers; standard error ~1.04/sqrt(2**p)."""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = bytearray(1 << p)
+
+    def add(self, value: str) -> None:
+        x = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        j = x >> (64 - self.p)
+        rank = (64 - self.p) - (x & ((1 << (64 - self.p)) - 1)).bit_length() + 1
+        if rank > self.registers[j]:
+            self.registers[j] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)      # linear counting for small sets
+        return round(estimate)
+
+
+# Like DuckDB's sniffer, a leading ``+`` or zero ("+1512…", "0042") marks an
+# identifier, not a number.
+_INTEGER = re.compile(r"-?(?:0|[1-9]\d*)")
+_DOUBLE = re.compile(r"-?(?:0|[1-9]\d*)?(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}|$)")
+_TIME = re.compile(r"\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?")
+
+
+def _parse(kind: str, value: str) -> Any:
+    """`value` as `kind`, or None if it is not one."""
+    try:
+        if kind == "boolean":
+            low = value.lower()
+            return low == "true" if low in ("true", "false") else None
+        if kind == "integer":
+            return int(value) if _INTEGER.fullmatch(value) else None
+        if kind == "double":
+            return float(value) if _DOUBLE.fullmatch(value) else None
+        if kind == "date":
+            return date.fromisoformat(value) if _DATE.fullmatch(value) else None
+        if kind == "timestamp":
+            if not _TIMESTAMP.match(value):
+                return None
+            stamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return stamp if stamp.tzinfo is None else stamp.astimezone(timezone.utc).replace(tzinfo=None)
+        if kind == "time":
+            return time.fromisoformat(value) if _TIME.fullmatch(value) else None
+    except ValueError:
+        return None
+    return value
+
+
+# Type to try first for a column's first value, and where each type widens to.
+# A date column that meets a timestamp turns to varchar, as in DuckDB's
+# sniffer; a timestamp column takes bare dates.
+_FIRST = ("boolean", "integer", "double", "date", "timestamp", "time", "varchar")
+_WIDER = {"integer": "double"}
+
+
+class _Column:
+    __slots__ = ("name", "kind", "nulls", "seen", "values", "sketch", "lo", "hi",
+                 "text_lo", "text_hi")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.kind: str | None = None
+        self.nulls = 0
+        self.seen: set[str] | None = set()      # distinct texts, until the sketch
+        self.values: set[Any] | None = set()    # distinct typed values, until varchar
+        self.sketch: HyperLogLog | None = None
+        self.lo = self.hi = None                # typed min / max
+        self.text_lo: str | None = None         # min / max as text, for varchar
+        self.text_hi: str | None = None
+
+    def add(self, value: str) -> None:
+        if value in NULLS:
+            self.nulls += 1
+            return
+        if self.seen is not None:
+            if value in self.seen:
+                return                          # type, range and count already covered
+            self.seen.add(value)
+
+        if self.text_lo is None or value < self.text_lo:
+            self.text_lo = value
+        if self.text_hi is None or value > self.text_hi:
+            self.text_hi = value
+        typed = self._typed(value)
+
+        # Distinct values are counted typed, as DuckDB does ("1.5" and "1.50"
+        # are one double), and as text once the column is varchar. Past the
+        # sketch that switch cannot be replayed, so its keys stay mixed.
+        if self.seen is None:
+            self.sketch.add(value if typed is None else _key(typed))
+            return
+        if self.values is not None:
+            self.values.add(typed)
+        if len(self.seen) > EXACT_DISTINCT_LIMIT:
+            self.sketch = HyperLogLog()
+            for key in (self.seen if self.values is None else map(_key, self.values)):
+                self.sketch.add(key)
+            self.seen = self.values = None
+
+    def _typed(self, value: str) -> Any:
+        """Infer, widen and range-track the column type; None once it is varchar."""
+        if self.kind == "varchar":
+            return None
+        if self.kind is None:
+            self.kind = next(k for k in _FIRST if k == "varchar" or _parse(k, value) is not None)
+            if self.kind == "varchar":
+                self.values = None
+                return None
+        typed = _parse(self.kind, value)
+        if typed is None:
+            wider = _WIDER.get(self.kind)
+            typed = _parse(wider, value) if wider else None
+            if typed is None:
+                self.kind, self.lo, self.hi, self.values = "varchar", None, None, None
+                return None
+            self.kind = wider
+            self.lo, self.hi = _parse(wider, str(self.lo)), _parse(wider, str(self.hi))
+            if self.values is not None:
+                self.values = {float(v) for v in self.values}
+        if self.lo is None or typed < self.lo:
+            self.lo = typed
+        if self.hi is None or typed > self.hi:
+            self.hi = typed
+        return typed
+
+    def profile(self) -> ColumnProfile:
+        if self.seen is None:
+            distinct = self.sketch.count()
+        else:
+            distinct = len(self.seen if self.values is None else self.values)
+        kind = self.kind or "varchar"
+        if kind == "varchar":
+            lo, hi = self.text_lo, self.text_hi
+        else:
+            lo, hi = (None if v is None else _format(v) for v in (self.lo, self.hi))
+        return ColumnProfile(self.name, kind, self.nulls, distinct, self.seen is None, lo, hi)
+
+
+def _key(value: Any) -> str:
+    """Sketch key for a typed value; integers and doubles share one form."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(float(value))
+    return _format(value)
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    return str(value)
+
+
+def _profile_python(f: Any, name: str) -> TableProfile:
+    text = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, [])
+        columns = [_Column(h) for h in header]
+        rows = 0
+        for row in reader:
+            if not row:
+                continue        # blank line
+            rows += 1
+            for column, value in zip(columns, row):
+                column.add(value)
+            for column in columns[len(row):]:
+                column.nulls += 1                # short row
+    finally:
+        text.detach()
+    return TableProfile(name=name, rows=rows, columns=[c.profile() for c in columns])
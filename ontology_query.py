@@ -0,0 +1,485 @@
+"""
+Ontology Query Engine
+=====================
+
+A small conjunctive query engine over `Ontology` (and `CompactOntology`):
+the basic-graph-pattern subset of SPARQL, evaluated straight against the
+engine's own indexes instead of hand-written loops.
+
+Supported:
+  * ``SELECT [DISTINCT] ?a ?b | * WHERE { ... } [LIMIT n]``
+  * triple patterns with variables in any position except the predicate;
+  * ``a`` / ``rdf:type`` — subclass-aware, like `Ontology.instances_of`;
+  * object properties — transitive ones match their closure, like
+    `Ontology.related`;
+  * data properties, matched against literals or bound to variables;
+  * ``FILTER(?x op value)`` with ``= != < <= > >=``, joined by ``&&``.
+
+Names are local names (``Machine``), prefixed names in the ontology's own
+prefix (``mfg:Machine``) or full IRIs under its namespace.
+
+Patterns are ordered greedily by estimated cardinality — given the
+variables already bound, the cheapest pattern goes next — and each FILTER
+runs as soon as its variables are bound. Results stream out as dicts.
+
+Usage:
+    from ontology_query import query
+
+    for row in query(ont, '''
+        SELECT ?eq ?ev WHERE {
+            ?eq a Equipment .
+            ?eq locatedIn Line_A .
+            ?ev performedOn ?eq .
+        }'''):
+        print(row["eq"], row["ev"])
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+import operator
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from ontology_builder import Ontology
+
+_TYPE = "rdf:type"
+
+_COMPARE: dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
+
+
+# ---------------------------------------------------------------------------
+# Parsed query
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Var:
+    name: str
+
+    def __str__(self) -> str:
+        return f"?{self.name}"
+
+
+@dataclass(frozen=True)
+class Literal:
+    value: Any
+
+    def __str__(self) -> str:
+        return repr(self.value)
+
+
+@dataclass(frozen=True)
+class TriplePattern:
+    """``subject predicate object``; the predicate is always a constant name."""
+    subject: Var | str
+    predicate: str
+    object: Var | str | Literal
+
+    def __str__(self) -> str:
+        return f"{self.subject} {self.predicate} {self.object}"
+
+
+@dataclass(frozen=True)
+class Filter:
+    left: Var | Literal
+    op: str
+    right: Var | Literal
+
+    def vars(self) -> set[str]:
+        return {t.name for t in (self.left, self.right) if isinstance(t, Var)}
+
+    def test(self, row: dict[str, Any]) -> bool:
+        a = row[self.left.name] if isinstance(self.left, Var) else self.left.value
+        b = row[self.right.name] if isinstance(self.right, Var) else self.right.value
+        try:
+            return _COMPARE[self.op](*_coerce(a, b))
+        except TypeError:
+            return False
+
+    def __str__(self) -> str:
+        return f"FILTER({self.left} {self.op} {self.right})"
+
+
+@dataclass
+class Query:
+    select: list[str] | None                     # None == SELECT *
+    patterns: list[TriplePattern]
+    filters: list[Filter] = field(default_factory=list)
+    distinct: bool = False
+    limit: int | None = None
+
+
+def _coerce(a: Any, b: Any) -> tuple[Any, Any]:
+    """Compare numbers with numeric strings numerically (literals arrive as either)."""
+    if isinstance(a, (int, float)) and isinstance(b, str):
+        try:
+            return a, float(b)
+        except ValueError:
+            return str(a), b
+    if isinstance(b, (int, float)) and isinstance(a, str):
+        try:
+            return float(a), b
+        except ValueError:
+            return a, str(b)
+    return a, b
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<var>[?$][A-Za-z_]\w*)
+    | (?P<iri><[^<>\s]*:[^<>\s]*>)
+    | (?P<str>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    | (?P<num>[+-]?(?:\d+(?:\.\d+)?|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<op>&&|!=|<=|>=|=|<|>)
+    | (?P<name>[A-Za-z_][\w\-]*(?::[\w\-]*)?|:[\w\-]+)
+    | (?P<punct>[{}().*,])
+    )""", re.X)
+
+
+def parse_query(text: str, ont: Ontology) -> Query:
+    """Parse the SPARQL BGP subset described in the module docstring."""
+    toks: list[tuple[str, str]] = []
+    pos, text = 0, text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"Cannot parse query near: {text[pos:pos + 30]!r}")
+        toks.append((m.lastgroup, m.group(m.lastgroup)))
+        pos = m.end()
+    i = 0
+
+    def peek() -> tuple[str, str]:
+        return toks[i] if i < len(toks) else ("eof", "")
+
+    def take(expected: str | None = None) -> tuple[str, str]:
+        nonlocal i
+        tok = peek()
+        if expected is not None and tok[1].upper() != expected:
+            raise ValueError(f"Expected {expected!r} in query, got {tok[1] or 'end of query'!r}")
+        if tok[0] == "eof":
+            raise ValueError("Unexpected end of query")
+        i += 1
+        return tok
+
+    def term(tok: tuple[str, str]) -> Var | str | Literal:
+        kind, text = tok
+        if kind == "var":
+            return Var(text[1:])
+        if kind == "str":
+            return Literal(re.sub(r"\\(.)", r"\1", text[1:-1]))
+        if kind == "num":
+            return Literal(float(text) if any(c in text for c in ".eE") else int(text))
+        if kind == "name" and text in ("true", "false"):
+            return Literal(text == "true")
+        if kind in ("name", "iri"):
+            return _resolve(ont, text)
+        raise ValueError(f"Unexpected {text!r} in query")
+
+    take("SELECT")
+    distinct = peek()[1].upper() == "DISTINCT"
+    if distinct:
+        take()
+    select: list[str] | None = []
+    if peek()[1] == "*":
+        take()
+        select = None
+    else:
+        while peek()[0] == "var":
+            select.append(take()[1][1:])
+        if not select:
+            raise ValueError("SELECT needs variables or *")
+    if peek()[1].upper() == "WHERE":
+        take()
+    take("{")
+
+    patterns: list[TriplePattern] = []
+    filters: list[Filter] = []
+    while peek()[1] != "}":
+        if peek()[1].upper() == "FILTER":
+            take()
+            take("(")
+            while True:
+                left = term(take())
+                kind, op = take()
+                if kind != "op" or op == "&&":
+                    raise ValueError(f"Expected a comparison operator, got {op!r}")
+                right = term(take())
+                # Resources compare by name.
+                filters.append(Filter(left if isinstance(left, (Var, Literal)) else Literal(left), op,
+                                      right if isinstance(right, (Var, Literal)) else Literal(right)))
+                if peek()[1] != "&&":
+                    break
+                take()
+            take(")")
+        else:
+            s = term(take())
+            ptok = take()
+            p = _TYPE if ptok == ("name", "a") else term(ptok)
+            if isinstance(p, (Var, Literal)):
+                raise ValueError(f"Predicate must be a property name, got {ptok[1]!r}")
+            if isinstance(s, Literal):
+                raise ValueError(f"Subject cannot be a literal: {s}")
+            patterns.append(TriplePattern(s, p, term(take())))
+            while peek()[1] == ",":            # ?s p o1, o2
+                take()
+                patterns.append(TriplePattern(s, p, term(take())))
+        if peek()[1] == ".":
+            take()
+    take("}")
+
+    limit = None
+    if peek()[1].upper() == "LIMIT":
+        take()
+        kind, n = take()
+        if kind != "num" or not n.isdigit():
+            raise ValueError(f"LIMIT needs a non-negative integer, got {n!r}")
+        limit = int(n)
+    if peek()[0] != "eof":
+        raise ValueError(f"Unexpected {peek()[1]!r} after query")
+
+    if not patterns:
+        raise ValueError("Query has no triple patterns")
+    bound = {v for tp in patterns for v in _pattern_vars(tp)}
+    for name in (select or []) + [v for f in filters for v in f.vars()]:
+        if name not in bound:
+            raise ValueError(f"Variable ?{name} does not appear in any triple pattern")
+    return Query(select, patterns, filters, distinct, limit)
+
+
+def _resolve(ont: Ontology, text: str) -> str:
+    """Map ``Machine`` / ``mfg:Machine`` / ``<iri>`` / ``rdf:type`` onto engine names."""
+    if text.startswith("<"):
+        iri = text[1:-1]
+        if iri == Ontology._RDF + "type":
+            return _TYPE
+        return iri[len(ont.iri):] if iri.startswith(ont.iri) else iri
+    if text == _TYPE:
+        return _TYPE
+    prefix, sep, local = text.partition(":")
+    if sep and prefix in (ont.prefix, ""):
+        return local
+    return text
+
+
+def _pattern_vars(tp: TriplePattern) -> list[str]:
+    return [t.name for t in (tp.subject, tp.object) if isinstance(t, Var)]
+
+
+# ---------------------------------------------------------------------------
+# Planner
+# ---------------------------------------------------------------------------
+
+def _estimate(ont: Ontology, tp: TriplePattern, bound: set[str]) -> float:
+    """Rough number of rows `tp` yields per incoming binding."""
+    s_known = not isinstance(tp.subject, Var) or tp.subject.name in bound
+    o_known = not isinstance(tp.object, Var) or tp.object.name in bound
+    n_ind = max(1, len(ont.individuals))
+
+    if tp.predicate == _TYPE:
+        if s_known:
+            return 0.5 if o_known else 4.0
+        if isinstance(tp.object, Var):
+            return float(n_ind) * (0.5 if o_known else 2.0)
+        return float(sum(len(ont._direct_instances(c))       # type: ignore[arg-type]
+                         for c in {tp.object} | ont.subclasses_of(tp.object)))
+
+    if tp.predicate in ont.data_properties:
+        if s_known:
+            return 0.5 if o_known else 1.0
+        return float(n_ind)                         # no value index: full scan
+
+    prop = ont.object_properties.get(tp.predicate)
+    if prop is None:
+        return 0.0                                  # unknown property: no rows
+    edges = float(ont._edge_count(tp.predicate))
+    if prop.transitive:
+        edges *= 4.0
+    if s_known and o_known:
+        return 0.5
+    if not isinstance(tp.subject, Var):
+        if tp.subject not in ont.individuals:
+            return 0.0
+        return float(len(ont.related(tp.subject, tp.predicate)))
+    if isinstance(tp.object, str):
+        if tp.object not in ont.individuals:
+            return 0.0
+        return float(len(ont.related_inverse(tp.object, tp.predicate)))
+    if isinstance(tp.object, Literal):
+        return 0.0
+    if s_known or o_known:
+        return max(1.0, edges / n_ind)
+    return edges
+
+
+def plan(ont: Ontology, q: Query) -> list[TriplePattern | Filter]:
+    """
+    Execution order for `q`: greedily the cheapest pattern given the
+    variables bound so far — preferring patterns that share a bound
+    variable, to avoid cross products — with each FILTER placed right after
+    the pattern that binds its last variable.
+    """
+    remaining = list(q.patterns)
+    pending = list(q.filters)
+    bound: set[str] = set()
+    steps: list[TriplePattern | Filter] = []
+    while remaining:
+        def cost(tp: TriplePattern) -> tuple[bool, float]:
+            tp_vars = _pattern_vars(tp)
+            connected = not bound or not tp_vars or any(v in bound for v in tp_vars)
+            return (not connected, _estimate(ont, tp, bound))
+
+        best = min(remaining, key=cost)
+        remaining.remove(best)
+        steps.append(best)
+        bound.update(_pattern_vars(best))
+        for f in [f for f in pending if f.vars() <= bound]:
+            pending.remove(f)
+            steps.append(f)
+    return steps
+
+
+def explain(ont: Ontology, text: str) -> list[str]:
+    """The planned steps for `text`, one line each, in execution order."""
+    q = parse_query(text, ont)
+    out, bound = [], set()
+    for step in plan(ont, q):
+        if isinstance(step, Filter):
+            out.append(str(step))
+        else:
+            out.append(f"{step}   (~{_estimate(ont, step, bound):g} rows)")
+            bound.update(_pattern_vars(step))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+def query(ont: Ontology, text: str) -> Iterator[dict[str, Any]]:
+    """Run a query and stream result rows as ``{variable: value}`` dicts."""
+    q = parse_query(text, ont)
+    return run(ont, q)
+
+
+def run(ont: Ontology, q: Query) -> Iterator[dict[str, Any]]:
+    """Evaluate an already-parsed `Query`."""
+    steps = plan(ont, q)
+    rows: Iterator[dict[str, Any]] = iter([{}])
+    for step in steps:
+        if isinstance(step, Filter):
+            rows = filter(step.test, rows)
+        else:
+            rows = _join(ont, step, rows)
+
+    if q.limit == 0:
+        return
+    seen: set[tuple] = set()
+    n = 0
+    for row in rows:
+        out = row if q.select is None else {v: row[v] for v in q.select}
+        if q.distinct:
+            key = tuple(out.items())
+            if key in seen:
+                continue
+            seen.add(key)
+        yield out
+        n += 1
+        if n == q.limit:
+            return
+
+
+def _join(ont: Ontology, tp: TriplePattern,
+          rows: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Extend each incoming binding with every match of `tp` (index nested loop)."""
+    for row in rows:
+        s = row.get(tp.subject.name) if isinstance(tp.subject, Var) else tp.subject
+        o = tp.object
+        if isinstance(o, Var):
+            o = row.get(o.name)
+        elif isinstance(o, Literal):
+            o = o.value
+        for s_val, o_val in _match(ont, tp.predicate, s, o):
+            if s is None and o is None and tp.subject == tp.object:
+                if s_val != o_val:                 # ?x p ?x
+                    continue
+            new = row
+            if s is None or o is None:
+                new = dict(row)
+                if s is None:
+                    new[tp.subject.name] = s_val
+                if o is None:
+                    new[tp.object.name] = o_val
+            yield new
+
+
+def _match(ont: Ontology, pred: str, s: Any, o: Any) -> Iterator[tuple[Any, Any]]:
+    """Every ``(subject, object)`` for `pred` consistent with `s` / `o` (None == free)."""
+    inds = ont.individuals
+    if s is not None and s not in inds:
+        return
+
+    if pred == _TYPE:
+        if s is not None:
+            types = ont._types_of(s)
+            if o is not None:
+                if isinstance(o, str) and ont._is_instance_of(s, o):
+                    yield s, o
+                return
+            classes = set(types)
+            for t in types:
+                classes |= ont.superclasses_of(t)
+            for c in classes:
+                yield s, c
+        elif o is not None:
+            if isinstance(o, str) and o in ont.classes:
+                for x in ont.iter_instances(o):
+                    yield x, o
+        else:
+            for x in inds:
+                yield from _match(ont, pred, x, None)
+        return
+
+    if pred in ont.data_properties:
+        subjects = (s,) if s is not None else inds
+        for x in subjects:
+            for v in ont._values(x, pred):
+                if o is None or _equal(v, o):
+                    yield x, v
+        return
+
+    if pred not in ont.object_properties:
+        return
+    if s is not None:
+        targets = ont.related(s, pred)
+        if o is None:
+            for t in targets:
+                yield s, t
+        elif o in targets:
+            yield s, o
+    elif o is not None:
+        if o in inds:
+            for x in ont.related_inverse(o, pred):
+                yield x, o
+    else:
+        subjects = dict.fromkeys(x for x, _ in ont._edges(pred))
+        for x in subjects:
+            for t in ont.related(x, pred):
+                yield x, t
+
+
+def _equal(a: Any, b: Any) -> bool:
+    try:
+        x, y = _coerce(a, b)
+        return x == y
+    except TypeError:
+        return False
@@ -0,0 +1,311 @@
+"""
+Ontology Reasoner
+=================
+
+A forward-chaining materializer for the OWL-RL rules our ontologies use,
+so downstream code can answer "is CNC_001 in Site_Austin?" with a set
+lookup instead of a closure walk.
+
+Rules (OWL 2 RL names):
+  * ``cax-sco``  — subclass: ``x a C``, ``C ⊑ D``  ⇒  ``x a D``;
+  * ``prp-dom`` / ``prp-rng`` — domain and range typing, for object
+    properties and data-property domains;
+  * ``prp-spo1`` — subproperty: ``s p o``, ``p ⊑ q``  ⇒  ``s q o``;
+  * ``prp-inv1/2`` — ``inverse_of`` in both directions;
+  * ``prp-symp`` — symmetric properties;
+  * ``prp-trp``  — transitive properties;
+  * ``prp-spo2`` — property chains: ``p1 ∘ … ∘ pn ⊑ q``.
+
+The T-Box has no subproperty or chain fields, so those two are declared on
+the reasoner (`add_sub_property`, `add_chain`).
+
+Evaluation is semi-naive: every derived fact is stored when it is first
+found and then joined, once, against the facts derived so far — never
+against the whole graph again. The result is kept in the reasoner's own
+indexes; the ontology itself, and therefore its exports, only hold what was
+asserted.
+
+The reasoner listens for `Ontology` changes. New individuals, types, edges
+and values are reasoned about incrementally, on the next lookup; anything
+else (schema changes, removals, bulk loads) re-materializes from the store.
+
+Usage:
+    from ontology_reasoner import Reasoner
+
+    r = Reasoner(ont)
+    r.add_chain("locatedIn", ["locatedIn", "partOf"])
+    r.related("CNC_001", "locatedIn")     # {'Line_A', 'Site_Austin'}
+    ont.assert_object("CNC_002", "locatedIn", "Line_A")
+    r.related("CNC_002", "locatedIn")     # updated incrementally
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from ontology_builder import Ontology
+
+_TYPE = "rdf:type"
+
+_Index = dict[str, dict[str, set[str]]]     # predicate -> node -> nodes
+
+
+class Reasoner:
+    """Materialized OWL-RL closure of one `Ontology`, kept current as it changes."""
+
+    def __init__(self, ont: Ontology):
+        self.ont = ont
+        self._sub_props: dict[str, set[str]] = {}
+        self._chains: list[tuple[str, tuple[str, ...]]] = []
+        # Materialized graph.
+        self._types: dict[str, set[str]] = {}
+        self._members: dict[str, set[str]] = {}
+        self._out: _Index = {}
+        self._in: _Index = {}
+        # Changes seen since the last update; `_stale` forces a full pass.
+        self._pending: list[tuple] = []
+        self._stale = True
+        ont._listeners.append(self._on_change)
+
+    def close(self) -> None:
+        """Stop following changes to the ontology."""
+        if self._on_change in self.ont._listeners:
+            self.ont._listeners.remove(self._on_change)
+
+    # ------------------------------ rules ---------------------------------
+
+    def add_sub_property(self, sub: str, sup: str) -> None:
+        """Declare ``sub ⊑ sup``: every `sub` edge is also a `sup` edge."""
+        self._check_property(sub)
+        self._check_property(sup)
+        self._sub_props.setdefault(sub, set()).add(sup)
+        self._stale = True
+
+    def add_chain(self, result: str, chain: Iterable[str]) -> None:
+        """Declare ``chain[0] ∘ … ∘ chain[-1] ⊑ result``.
+
+        ``add_chain("locatedIn", ["locatedIn", "partOf"])`` infers
+        ``x locatedIn z`` from ``x locatedIn y`` and ``y partOf z``.
+        """
+        chain = tuple(chain)
+        if len(chain) < 2:
+            raise ValueError("A property chain needs at least two properties")
+        for p in (result, *chain):
+            self._check_property(p)
+        self._chains.append((result, chain))
+        self._stale = True
+
+    def _check_property(self, name: str) -> None:
+        if name not in self.ont.object_properties:
+            raise ValueError(f"Unknown object property '{name}'")
+
+    # ------------------------------ lookups -------------------------------
+
+    def types_of(self, individual: str) -> set[str]:
+        """Asserted and inferred classes of `individual`."""
+        self.update()
+        return set(self._types.get(individual, ()))
+
+    def instances_of(self, cls: str, sort: bool = True) -> list[str]:
+        """Every individual inferred to be a `cls`."""
+        self.update()
+        results = list(self._members.get(cls, ()))
+        return sorted(results) if sort else results
+
+    def related(self, subject: str, predicate: str) -> set[str]:
+        """Objects of `predicate` from `subject` in the materialized graph."""
+        self.update()
+        return set(self._out.get(predicate, {}).get(subject, ()))
+
+    def related_inverse(self, object_: str, predicate: str) -> set[str]:
+        """Subjects that reach `object_` via `predicate`."""
+        self.update()
+        return set(self._in.get(predicate, {}).get(object_, ()))
+
+    def holds(self, subject: str, predicate: str, object_: str) -> bool:
+        """Whether the triple is asserted or inferred; `predicate` may be ``rdf:type``."""
+        self.update()
+        if predicate in (_TYPE, "a"):
+            return object_ in self._types.get(subject, ())
+        return object_ in self._out.get(predicate, {}).get(subject, ())
+
+    def inferred(self) -> Iterator[tuple[str, str, str]]:
+        """Yield the ``(subject, predicate, object)`` triples that were inferred
+        rather than asserted; types use the predicate ``rdf:type``."""
+        self.update()
+        ont = self.ont
+        for x, types in self._types.items():
+            asserted = ont._types_of(x)
+            for c in types:
+                if c not in asserted:
+                    yield x, _TYPE, c
+        for p, index in self._out.items():
+            for s, objects in index.items():
+                asserted = set(ont._objects(s, p)) if p in ont.object_properties else ()
+                for o in objects:
+                    if o not in asserted:
+                        yield s, p, o
+
+    # ------------------------------ maintenance ---------------------------
+
+    def _on_change(self, change: tuple | None) -> None:
+        if self._stale:
+            return
+        if (change is not None and change[0] == "class"
+                and not self.ont._descendants.get(change[1])):
+            return      # a new class with no subclasses has no members yet
+        if change is None or change[0] not in ("individual", "type", "edge", "value"):
+            self._stale = True
+            self._pending.clear()
+        else:
+            self._pending.append(change)
+
+    def update(self) -> None:
+        """Bring the materialized graph up to date with the ontology."""
+        if self._stale:
+            self.materialize()
+            return
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        ont = self.ont
+        agenda: list[tuple[str, str, str]] = []
+        for change in pending:
+            kind = change[0]
+            if kind == "individual":
+                name = change[1]
+                if name in ont.individuals:
+                    self._types.setdefault(name, set())
+                    for c in ont._types_of(name):
+                        self._add_type(name, c)
+            elif kind == "type":
+                self._add_type(change[1], change[2])
+            elif kind == "edge":
+                self._emit(change[1], change[2], change[3], agenda)
+            else:
+                for c in self._dp_domain.get(change[2], ()):
+                    self._add_type(change[1], c)
+        self._run(agenda)
+
+    def materialize(self) -> None:
+        """Recompute the whole closure from the asserted facts."""
+        ont = self.ont
+        self._compile()
+        self._types, self._members, self._out, self._in = {}, {}, {}, {}
+        self._pending.clear()
+        self._stale = False
+
+        names = list(ont.individuals)
+        for name in names:
+            self._types.setdefault(name, set())
+            for c in ont._types_of(name):
+                self._add_type(name, c)
+        for p, classes in self._dp_domain.items():
+            for name in names:
+                if ont._values(name, p):
+                    for c in classes:
+                        self._add_type(name, c)
+        agenda: list[tuple[str, str, str]] = []
+        for p in ont.object_properties:
+            for s, o in ont._edges(p):
+                self._emit(s, p, o, agenda)
+        self._run(agenda)
+
+    def _compile(self) -> None:
+        """Index the T-Box by predicate, so each rule is a dict lookup."""
+        ont = self.ont
+        props = ont.object_properties
+        self._domain = {n: p.domain for n, p in props.items() if p.domain}
+        self._range = {n: p.range_ for n, p in props.items() if p.range_}
+        self._dp_domain = {n: (p.domain,) for n, p in ont.data_properties.items() if p.domain}
+        self._symmetric = {n for n, p in props.items() if p.symmetric}
+        self._transitive = {n for n, p in props.items() if p.transitive}
+        self._inverse: dict[str, set[str]] = {}
+        for n, p in props.items():
+            if p.inverse_of:
+                self._inverse.setdefault(n, set()).add(p.inverse_of)
+                self._inverse.setdefault(p.inverse_of, set()).add(n)
+
+        # Subproperty closure, excluding the property itself.
+        self._super: dict[str, set[str]] = {}
+        for sub in self._sub_props:
+            seen, stack = set(), [sub]
+            while stack:
+                for sup in self._sub_props.get(stack.pop(), ()):
+                    if sup not in seen and sup != sub:
+                        seen.add(sup)
+                        stack.append(sup)
+            if seen:
+                self._super[sub] = seen
+
+        # predicate -> [(chain, position)] for every place it occurs in a chain.
+        self._chain_index: dict[str, list[tuple[int, int]]] = {}
+        for k, (_, chain) in enumerate(self._chains):
+            for i, p in enumerate(chain):
+                self._chain_index.setdefault(p, []).append((k, i))
+
+    # ------------------------------ evaluation ----------------------------
+
+    def _add_type(self, individual: str, cls: str) -> None:
+        """Store ``individual a cls`` with every superclass (cax-sco)."""
+        types = self._types.setdefault(individual, set())
+        if cls in types:
+            return
+        for c in (cls, *self.ont._ancestors.get(cls, ())):
+            if c not in types:
+                types.add(c)
+                self._members.setdefault(c, set()).add(individual)
+
+    def _emit(self, s: str, p: str, o: str, agenda: list[tuple[str, str, str]]) -> None:
+        """Store a new edge and queue it as a delta; known edges are dropped."""
+        objects = self._out.setdefault(p, {}).setdefault(s, set())
+        if o in objects:
+            return
+        objects.add(o)
+        self._in.setdefault(p, {}).setdefault(o, set()).add(s)
+        agenda.append((s, p, o))
+
+    def _run(self, agenda: list[tuple[str, str, str]]) -> None:
+        """Semi-naive fixpoint: join each delta edge against what is stored.
+
+        An edge is in the indexes from the moment it is emitted, so of any
+        two edges a rule joins, the one processed second finds the first.
+        """
+        emit = self._emit
+        out, in_ = self._out, self._in
+        while agenda:
+            s, p, o = agenda.pop()
+            if p in self._domain:
+                self._add_type(s, self._domain[p])
+            if p in self._range:
+                self._add_type(o, self._range[p])
+            for q in self._super.get(p, ()):
+                emit(s, q, o, agenda)
+            for q in self._inverse.get(p, ()):
+                emit(o, q, s, agenda)
+            if p in self._symmetric:
+                emit(o, p, s, agenda)
+            if p in self._transitive:
+                # s p o, o p z => s p z;  w p s, s p o => w p o
+                for z in list(out[p].get(o, ())):
+                    emit(s, p, z, agenda)
+                for w in list(in_[p].get(s, ())):
+                    emit(w, p, o, agenda)
+            for k, i in self._chain_index.get(p, ()):
+                result, chain = self._chains[k]
+                for start in self._walk(s, chain[i - 1::-1] if i else (), in_):
+                    for end in self._walk(o, chain[i + 1:], out):
+                        emit(start, result, end, agenda)
+
+    @staticmethod
+    def _walk(node: str, path: Iterable[str], index: _Index) -> set[str]:
+        """Nodes reached from `node` by following `path` through `index`."""
+        frontier = {node}
+        for p in path:
+            edges = index.get(p, {})
+            frontier = {n for f in frontier for n in edges.get(f, ())}
+            if not frontier:
+                break
+        return frontier
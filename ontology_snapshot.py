@@ -0,0 +1,369 @@
+"""
+Ontology Snapshots
+==================
+
+A memory-mapped binary format for read-only `Ontology` instances.
+
+``save_snapshot(ont, path)`` writes any ontology (plain, `CompactOntology`,
+`DuckDBOntology`) as one file:
+
+  * a small JSON T-Box section, including the precomputed subclass closure,
+    so opening does not re-walk the class hierarchy;
+  * a string table of every individual, class and property name, with a
+    sort permutation for lookups by binary search;
+  * the integer triple columns of `CompactOntology` (SPO, POS, OSP and the
+    data-value index) as flat native ``int32`` arrays;
+  * a literal table for data values.
+
+``SnapshotOntology(path)`` (or ``Ontology.open_snapshot(path)``) maps the
+file read-only and points a `CompactOntology` at memoryviews of those
+sections. Opening costs O(size of T-Box), independent of the A-Box; A-Box
+pages are faulted in as queries touch them. Every process that opens the
+same file shares one copy through the OS page cache, so several Streamlit
+workers can serve one ontology without each rebuilding it from JSON.
+
+`save_snapshot` writes to a temporary file and renames it into place, so
+processes that already have the old snapshot open keep reading it safely.
+
+Usage:
+    from ontology_builder import Ontology, build_manufacturing_ontology
+
+    build_manufacturing_ontology().save_snapshot("ontology/mfg.snap")
+    ont = Ontology.open_snapshot("ontology/mfg.snap")
+    ont.related("CNC_001", "locatedIn", transitive=True)
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator
+
+from ontology_builder import DataProperty, ObjectProperty, OntClass, Ontology
+from ontology_store import _ID, CompactOntology, IndividualsView, TripleIndex
+
+_MAGIC = b"ONTSNAP1"
+_HEADER = struct.Struct("<8s1sI")          # magic, byte order ("l"/"b"), section count
+_ENTRY = struct.Struct("<16sQQ")           # section name, offset, length
+_ALIGN = 8
+
+# Literal kinds in the ``lit_kind`` section.
+_STR, _INT, _FLOAT, _BOOL = range(4)
+
+_INDEXES = ("spo", "pos", "osp", "data")
+
+
+# ---------------------------------------------------------------------------
+# Mapped tables
+# ---------------------------------------------------------------------------
+
+class _MappedStrings(Sequence):
+    """``list[str]``-like view over an offsets array and a UTF-8 blob."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._off = offsets
+        self._blob = blob
+
+    def __getitem__(self, i: int) -> str:       # type: ignore[override]
+        return str(self._blob[self._off[i]:self._off[i + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+
+class _SortedNames(Sequence):
+    """`_MappedStrings` seen through a sort permutation."""
+
+    def __init__(self, names: _MappedStrings, order: memoryview):
+        self._names = names
+        self._order = order
+
+    def __getitem__(self, i: int) -> str:       # type: ignore[override]
+        return self._names[self._order[i]]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class _SortedIds(Mapping):
+    """``str -> id`` by binary search over the sort permutation."""
+
+    def __init__(self, names: _MappedStrings, order: memoryview):
+        self._names = names
+        self._order = order
+        self._sorted = _SortedNames(names, order)
+
+    def __getitem__(self, term: str) -> int:
+        k = bisect_left(self._sorted, term)
+        if k == len(self._sorted) or self._sorted[k] != term:
+            raise KeyError(term)
+        return self._order[k]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class MappedTermTable:
+    """Read-only stand-in for `TermTable`."""
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self, names: _MappedStrings, order: memoryview):
+        self.names = names
+        self.ids = _SortedIds(names, order)
+
+    def intern(self, term: str) -> int:
+        i = self.lookup(term)
+        if i is None:
+            raise ValueError(f"Term '{term}' is not in the snapshot (read-only)")
+        return i
+
+    def lookup(self, term: str) -> int | None:
+        return self.ids.get(term)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class _MappedLiterals(Sequence):
+    """Data values, decoded from their kind byte and lexical form on access."""
+
+    def __init__(self, kinds: memoryview, text: _MappedStrings):
+        self._kinds = kinds
+        self._text = text
+
+    def __getitem__(self, i: int) -> Any:       # type: ignore[override]
+        kind, lexical = self._kinds[i], self._text[i]
+        if kind == _INT:
+            return int(lexical)
+        if kind == _FLOAT:
+            return float(lexical)
+        if kind == _BOOL:
+            return lexical == "true"
+        return lexical
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+def _string_sections(strings: list[str]) -> tuple[bytes, bytes]:
+    offsets = array("q", [0])
+    blob = bytearray()
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def _literal(value: Any) -> tuple[int, str]:
+    if isinstance(value, bool):
+        return _BOOL, "true" if value else "false"
+    if isinstance(value, int):
+        return _INT, str(value)
+    if isinstance(value, float):
+        return _FLOAT, repr(value)
+    return _STR, str(value)
+
+
+def _columns(keys: list[int]) -> tuple[bytes, bytes, bytes]:
+    """Split sorted packed ``a << 64 | b << 32 | c`` keys into three columns."""
+    m = 0xFFFFFFFF
+    return (array(_ID, (k >> 64 for k in keys)).tobytes(),
+            array(_ID, ((k >> 32) & m for k in keys)).tobytes(),
+            array(_ID, (k & m for k in keys)).tobytes())
+
+
+def save_snapshot(ont: Ontology, path: str | os.PathLike) -> None:
+    """Write `ont` as a memory-mappable snapshot at `path`."""
+    type_pred = CompactOntology._TYPE
+    individuals = list(ont.individuals)
+    types = {n: ont._types_of(n) for n in individuals}
+
+    # Ids follow declaration order (properties first), which is the order
+    # the exporters list predicates in; `term_sorted` serves lookups.
+    ids: dict[str, int] = {}
+    for n in (type_pred, *ont.object_properties, *ont.data_properties, *ont.classes):
+        ids.setdefault(n, len(ids))
+    for n, ts in types.items():
+        ids.setdefault(n, len(ids))
+        for c in ts:
+            ids.setdefault(c, len(ids))
+    names = list(ids)
+
+    t = ids[type_pred]
+    spo: list[int] = []
+    for n, ts in types.items():
+        s = ids[n] << 64
+        spo.extend(s | t << 32 | ids[c] for c in ts)
+    for pred in ont.object_properties:
+        p = ids[pred] << 32
+        spo.extend(ids[s] << 64 | p | ids[o] for s, o in ont._edges(pred))
+    data: list[int] = []
+    kinds = bytearray()
+    lexical: list[str] = []
+    for n in individuals:
+        s = ids[n] << 64
+        for pred in ont.data_properties:
+            p = ids[pred] << 32
+            for v in ont._values(n, pred):
+                kind, text = _literal(v)
+                data.append(s | p | len(kinds))
+                kinds.append(kind)
+                lexical.append(text)
+
+    m = 0xFFFFFFFF
+    spo.sort()
+    data.sort()
+    pos = sorted((k >> 32 & m) << 64 | (k & m) << 32 | k >> 64 for k in spo)
+    osp = sorted((k & m) << 64 | (k >> 64) << 32 | (k >> 32 & m) for k in spo)
+
+    header = ont._dict_header()
+    header["ancestors"] = {c: sorted(a) for c, a in ont._ancestors.items()}
+    header["children"] = {c: sorted(k) for c, k in ont._children.items()}
+
+    sections: dict[str, bytes] = {"tbox": json.dumps(header).encode("utf-8")}
+    sections["term_off"], sections["term_blob"] = _string_sections(names)
+    sections["term_sorted"] = array(_ID, sorted(range(len(names)),
+                                                key=names.__getitem__)).tobytes()
+    sections["order"] = array(_ID, (ids[n] for n in individuals)).tobytes()
+    flags = bytearray(len(names))
+    for n in individuals:
+        flags[ids[n]] = 1
+    sections["flags"] = bytes(flags)
+    for name, keys in zip(_INDEXES, (spo, pos, osp, data)):
+        for col, raw in zip("abc", _columns(keys)):
+            sections[f"{name}_{col}"] = raw
+    sections["lit_kind"] = bytes(kinds)
+    sections["lit_off"], sections["lit_blob"] = _string_sections(lexical)
+
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    entries = []
+    for name, raw in sections.items():
+        offset += -offset % _ALIGN
+        entries.append((name, offset, len(raw)))
+        offset += len(raw)
+
+    path = os.fspath(path)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, sys.byteorder[0].encode(), len(sections)))
+        for name, off, size in entries:
+            f.write(_ENTRY.pack(name.encode(), off, size))
+        for (name, off, _), raw in zip(entries, sections.values()):
+            f.write(bytes(off - f.tell()))
+            f.write(raw)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+class SnapshotOntology(CompactOntology):
+    """
+    Read-only `CompactOntology` over a memory-mapped snapshot file.
+
+    Queries, reasoning, consistency checks and every exporter work as usual;
+    any write raises ValueError. Call `close()` (or use ``with``) to unmap.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = [memoryview(self._mm)]
+        try:
+            sec = self._sections()
+            header = json.loads(str(sec["tbox"], "utf-8"))
+        except Exception:
+            self.close()
+            raise
+
+        Ontology.__init__(self, iri=header["iri"], prefix=header["prefix"])
+        for n, c in header["classes"].items():
+            self.classes[n] = OntClass(name=n, parents=set(c["parents"]), comment=c["comment"],
+                                       disjoint_with=set(c["disjoint_with"]))
+        for n, p in header["object_properties"].items():
+            self.object_properties[n] = ObjectProperty(**p)
+        for n, p in header["data_properties"].items():
+            self.data_properties[n] = DataProperty(**p)
+        for c, ancestors in header["ancestors"].items():
+            self._ancestors[c] = frozenset(ancestors)
+            for a in ancestors:
+                self._descendants.setdefault(a, set()).add(c)
+        self._children = {c: set(k) for c, k in header["children"].items()}
+
+        self.terms = MappedTermTable(_MappedStrings(self._cast(sec["term_off"], "q"),
+                                                    sec["term_blob"]),
+                                     self._cast(sec["term_sorted"], _ID))
+        self._type_id = self.terms.ids[self._TYPE]
+        self._spo, self._pos, self._osp, self._data = (
+            TripleIndex.frozen(*(self._cast(sec[f"{name}_{col}"], _ID) for col in "abc"))
+            for name in _INDEXES)
+        self._literals = _MappedLiterals(sec["lit_kind"], _MappedStrings(
+            self._cast(sec["lit_off"], "q"), sec["lit_blob"]))
+        self._order = self._cast(sec["order"], _ID)
+        self._flags = sec["flags"]
+        self.individuals = IndividualsView(self)   # type: ignore[assignment]
+
+    def _sections(self) -> dict[str, memoryview]:
+        whole = self._views[0]
+        magic, order, count = _HEADER.unpack_from(whole)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not an ontology snapshot")
+        if order != sys.byteorder[0].encode():
+            raise ValueError(f"{self.path} was written on a machine with a different byte order")
+        sections = {}
+        for k in range(count):
+            name, off, size = _ENTRY.unpack_from(whole, _HEADER.size + k * _ENTRY.size)
+            sections[name.rstrip(b"\0").decode()] = self._keep(whole[off:off + size])
+        return sections
+
+    def _keep(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _cast(self, view: memoryview, fmt: str) -> memoryview:
+        return self._keep(view.cast(fmt))
+
+    def close(self) -> None:
+        """Release the mapping. The ontology is unusable afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mm.close()
+
+    def __enter__(self) -> "SnapshotOntology":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------ writes --------------------------------
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise ValueError(f"{self.path} is a read-only ontology snapshot")
+
+    add_class = add_object_property = add_data_property = _read_only
+    _store_individual = _store_type = _store_value = _read_only
+    _add_edge = _add_edges = _read_only
+    _remove_individual = _remove_type = _remove_value = _remove_edge = _read_only
+    _drop_schema = _read_only
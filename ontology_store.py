@@ -0,0 +1,591 @@
+"""
+Compact Ontology Store
+======================
+
+An alternative A-Box backend for the `Ontology` engine in
+``ontology_builder.py``, sized for plant-floor ontologies with tens of
+millions of triples.
+
+The default `Ontology` keeps each individual as a dataclass holding dicts of
+Python string sets, which costs hundreds of bytes per edge. `CompactOntology`
+keeps the exact same public API (``add_individual``, ``assert_object``,
+``related``, ``instances_of``, ``check_consistency``, every exporter) but:
+
+  * interns every IRI, class name and property name once in a `TermTable`;
+  * stores object-property edges and rdf:type assertions as integer triples
+    in three sorted permutations (SPO, POS, OSP) backed by ``array('i')``
+    columns — 12 bytes per triple per permutation;
+  * stores data values in a fourth index keyed (subject, property, literal#).
+
+Usage:
+    from ontology_store import CompactOntology
+
+    ont = CompactOntology(iri="https://example.org/mfg/", prefix="mfg")
+    ont.add_class("Machine")
+    ont.add_individual("CNC_001", types=["Machine"])
+    ...
+
+No third-party dependencies.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+from ontology_builder import Individual, Ontology
+
+# 32-bit signed term ids: up to 2**31 distinct terms per store.
+_ID = "i"
+
+
+# ---------------------------------------------------------------------------
+# Interning
+# ---------------------------------------------------------------------------
+
+class TermTable:
+    """Bidirectional ``str <-> int`` interning table."""
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def intern(self, term: str) -> int:
+        i = self.ids.get(term)
+        if i is None:
+            i = self.ids[term] = len(self.names)
+            self.names.append(term)
+        return i
+
+    def lookup(self, term: str) -> int | None:
+        return self.ids.get(term)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+# ---------------------------------------------------------------------------
+# Sorted integer triple index
+# ---------------------------------------------------------------------------
+
+class TripleIndex:
+    """
+    A set of integer triples ``(a, b, c)`` kept in lexicographic order across
+    three parallel ``array`` columns, plus a small unsorted write buffer.
+
+    Writes land in the buffer (and deletes in a tombstone set) and are merged
+    into the sorted columns once either exceeds 1/16 of the index, so the
+    amortized cost per write stays constant. Prefix lookups bisect the
+    columns and come back as C-level slices.
+    """
+
+    MERGE_MIN = 4096
+
+    def __init__(self) -> None:
+        self.a = array(_ID)
+        self.b = array(_ID)
+        self.c = array(_ID)
+        self._buf: dict[int, set[tuple[int, int]]] = {}
+        self._buf_len = 0
+        self._dead: set[tuple[int, int, int]] = set()
+        self._merge_at = self.MERGE_MIN
+
+    @classmethod
+    def frozen(cls, a: Any, b: Any, c: Any) -> "TripleIndex":
+        """Read-only index over already sorted columns, e.g. memoryviews of a
+        mapped file (see ``ontology_snapshot``). Do not write to it."""
+        idx = cls()
+        idx.a, idx.b, idx.c = a, b, c
+        return idx
+
+    def __len__(self) -> int:
+        return len(self.a) - len(self._dead) + self._buf_len
+
+    def _range(self, a: int, b: int | None = None) -> tuple[int, int]:
+        """Slice of the sorted columns whose rows start with (a[, b])."""
+        lo = bisect_left(self.a, a)
+        hi = bisect_right(self.a, a, lo)
+        if b is not None:
+            lo = bisect_left(self.b, b, lo, hi)
+            hi = bisect_right(self.b, b, lo, hi)
+        return lo, hi
+
+    def _in_main(self, a: int, b: int, c: int) -> bool:
+        if not self.a:
+            return False
+        lo, hi = self._range(a, b)
+        i = bisect_left(self.c, c, lo, hi)
+        return i < hi and self.c[i] == c
+
+    def __contains__(self, triple: tuple[int, int, int]) -> bool:
+        a, b, c = triple
+        bc = self._buf.get(a)
+        if bc is not None and (b, c) in bc:
+            return True
+        return self._in_main(a, b, c) and triple not in self._dead
+
+    def add(self, a: int, b: int, c: int) -> bool:
+        """Insert a triple. Returns False if it was already present."""
+        t = (a, b, c)
+        if self._dead and t in self._dead:
+            self._dead.discard(t)
+            return True
+        if t in self:
+            return False
+        self.add_new(a, b, c)
+        return True
+
+    def add_new(self, a: int, b: int, c: int) -> None:
+        """Insert a triple the caller knows is absent (skips the lookup)."""
+        if self._dead and (a, b, c) in self._dead:
+            self._dead.discard((a, b, c))
+            return
+        bc = self._buf.get(a)
+        if bc is None:
+            bc = self._buf[a] = set()
+        bc.add((b, c))
+        self._buf_len += 1
+        if self._buf_len > self._merge_at:
+            self.merge()
+
+    def add_keys(self, keys: Iterable[int], new: bool = False) -> list[int]:
+        """
+        Insert a large batch with one pass over the columns instead of
+        buffered merges.
+
+        Rows come packed as ``a << 64 | b << 32 | c`` (ids are non-negative
+        and below 2**31), so the batch deduplicates and sorts as plain ints.
+        Each row's place in the sorted columns is then found by bisection
+        and the columns are rebuilt from C-level slices between those
+        places, as in `merge`; existing rows never become Python objects.
+        Returns the sorted keys that were not present. With `new` the caller
+        guarantees that none were.
+        """
+        self.merge()
+        mask = 0xFFFFFFFF
+        batch = sorted(set(keys))
+        A, B, C = self.a, self.b, self.c
+        if not A:
+            self.a = array(_ID, [k >> 64 for k in batch])
+            self.b = array(_ID, [k >> 32 & mask for k in batch])
+            self.c = array(_ID, [k & mask for k in batch])
+            self._merge_at = max(self.MERGE_MIN, len(batch) >> 4)
+            return batch
+
+        added: list[int] = []
+        na, nb, nc = array(_ID), array(_ID), array(_ID)
+        prev = 0
+        # The batch is sorted, so the (a) and (a, b) ranges are looked up
+        # once per run of equal prefixes, each starting where the last ended.
+        cur_a = cur_ab = -1
+        alo = ahi = lo = hi = 0
+        for k in batch:
+            a, b, c = k >> 64, k >> 32 & mask, k & mask
+            if a != cur_a:
+                cur_a, cur_ab = a, -1
+                alo = bisect_left(A, a, prev)
+                ahi = bisect_right(A, a, alo)
+            if k >> 32 != cur_ab:
+                cur_ab = k >> 32
+                lo = bisect_left(B, b, max(alo, prev), ahi)
+                hi = bisect_right(B, b, lo, ahi)
+            pos = bisect_left(C, c, max(lo, prev), hi)
+            if not new and pos < hi and C[pos] == c:
+                continue
+            added.append(k)
+            if pos > prev:
+                na += A[prev:pos]
+                nb += B[prev:pos]
+                nc += C[prev:pos]
+                prev = pos
+            na.append(a)
+            nb.append(b)
+            nc.append(c)
+        na += A[prev:]
+        nb += B[prev:]
+        nc += C[prev:]
+        self.a, self.b, self.c = na, nb, nc
+        self._merge_at = max(self.MERGE_MIN, len(na) >> 4)
+        return added
+
+    def discard(self, a: int, b: int, c: int) -> bool:
+        """Remove a triple. Returns False if it was not present."""
+        bc = self._buf.get(a)
+        if bc is not None and (b, c) in bc:
+            bc.discard((b, c))
+            self._buf_len -= 1
+            if not bc:
+                del self._buf[a]
+            return True
+        t = (a, b, c)
+        if t in self._dead or not self._in_main(a, b, c):
+            return False
+        self._dead.add(t)
+        if len(self._dead) > self._merge_at:
+            self.merge()
+        return True
+
+    def scan(self, a: int, b: int | None = None) -> Iterator[tuple[int, int]]:
+        """Yield ``(b, c)`` for every triple starting with ``a`` (and ``b``)."""
+        lo, hi = self._range(a, b)
+        if lo < hi:
+            pairs: Iterable[tuple[int, int]] = zip(self.b[lo:hi], self.c[lo:hi])
+            if self._dead:
+                dead = self._dead
+                pairs = [(x, y) for x, y in pairs if (a, x, y) not in dead]
+            yield from pairs
+        bc = self._buf.get(a)
+        if bc:
+            yield from sorted(bc) if b is None else sorted(p for p in bc if p[0] == b)
+
+    def count(self, a: int) -> int:
+        """Number of triples starting with ``a``."""
+        lo, hi = self._range(a)
+        n = hi - lo + len(self._buf.get(a, ()))
+        if self._dead:
+            n -= sum(1 for t in self._dead if t[0] == a)
+        return n
+
+    def values(self, a: int, b: int) -> list[int]:
+        """Every ``c`` such that ``(a, b, c)`` is in the index."""
+        lo, hi = self._range(a, b)
+        out = self.c[lo:hi].tolist()
+        if self._dead and out:
+            dead = self._dead
+            out = [c for c in out if (a, b, c) not in dead]
+        bc = self._buf.get(a)
+        if bc:
+            out.extend(sorted(c for x, c in bc if x == b))
+        return out
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        self.merge()
+        return zip(self.a, self.b, self.c)
+
+    def merge(self) -> None:
+        """Fold the write buffer and tombstones into the sorted columns."""
+        if not self._buf_len and not self._dead:
+            return
+        A, B, C = self.a, self.b, self.c
+        # (position, 0=insert row / 1=drop row, a, b, c). Inserts sort before
+        # a drop at the same position because bisect_left puts them first.
+        events: list[tuple[int, int, int, int, int]] = []
+        for a, bc in self._buf.items():
+            glo = bisect_left(A, a)
+            ghi = bisect_right(A, a, glo)
+            if glo == ghi:
+                events.extend((glo, 0, a, b, c) for b, c in bc)
+                continue
+            for b, c in bc:
+                lo = bisect_left(B, b, glo, ghi)
+                hi = bisect_right(B, b, lo, ghi)
+                events.append((bisect_left(C, c, lo, hi), 0, a, b, c))
+        for a, b, c in self._dead:
+            lo, hi = self._range(a, b)
+            events.append((bisect_left(C, c, lo, hi), 1, a, b, c))
+        events.sort()
+
+        na, nb, nc = array(_ID), array(_ID), array(_ID)
+        prev = 0
+        for pos, kind, a, b, c in events:
+            na += A[prev:pos]
+            nb += B[prev:pos]
+            nc += C[prev:pos]
+            if kind == 0:
+                na.append(a)
+                nb.append(b)
+                nc.append(c)
+                prev = pos
+            else:
+                prev = pos + 1
+        na += A[prev:]
+        nb += B[prev:]
+        nc += C[prev:]
+        self.a, self.b, self.c = na, nb, nc
+        self._buf.clear()
+        self._buf_len = 0
+        self._dead.clear()
+        self._merge_at = max(self.MERGE_MIN, len(na) >> 4)
+
+    def nbytes(self) -> int:
+        """Bytes held by the sorted columns (buffer excluded)."""
+        return sum(col.itemsize * len(col) for col in (self.a, self.b, self.c))
+
+
+# ---------------------------------------------------------------------------
+# Read-only individuals view
+# ---------------------------------------------------------------------------
+
+class IndividualsView(Mapping):
+    """
+    ``name -> Individual`` mapping over a `CompactOntology`.
+
+    Values are snapshots assembled from the indexes on access; mutate through
+    the ontology (add_individual, add_type, assert_object, assert_data).
+    """
+
+    def __init__(self, ont: "CompactOntology"):
+        self._ont = ont
+
+    def __getitem__(self, name: str) -> Individual:
+        i = self._ont.terms.lookup(name)
+        if i is None or not self._ont._is_individual(i):
+            raise KeyError(name)
+        return self._ont._snapshot(i)
+
+    def __contains__(self, name: object) -> bool:
+        # Hot in bulk_load's per-triple checks, so the lookups are inlined.
+        flags = self._ont._flags
+        i = self._ont.terms.ids.get(name) if isinstance(name, str) else None
+        return i is not None and i < len(flags) and flags[i] == 1
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._ont.terms.names
+        for i in self._ont._order:
+            yield names[i]
+
+    def __len__(self) -> int:
+        return len(self._ont._order)
+
+
+# ---------------------------------------------------------------------------
+# The compact ontology
+# ---------------------------------------------------------------------------
+
+class CompactOntology(Ontology):
+    """
+    `Ontology` with an interned, integer-ID A-Box.
+
+    The T-Box (classes, properties, subclass closure) is inherited unchanged.
+    Only the storage hooks of the base class are overridden, so reasoning,
+    validation and queries give the same answers and every exporter writes
+    the same triples. Within an individual, though, properties are listed
+    in term-id order (first use anywhere in the store) rather than the order
+    they were asserted on it, so export text can differ in line order.
+    ``individuals`` is a read-only `IndividualsView`.
+    """
+
+    # Internal predicate used for rdf:type rows; never a valid identifier.
+    _TYPE = "rdf:type"
+
+    def __init__(self, iri: str = "https://example.org/ont/", prefix: str = "ex"):
+        super().__init__(iri=iri, prefix=prefix)
+        self.terms = TermTable()
+        self._type_id = self.terms.intern(self._TYPE)
+        self._spo = TripleIndex()
+        self._pos = TripleIndex()
+        self._osp = TripleIndex()
+        self._data = TripleIndex()          # (subject, property, literal#)
+        self._literals: list[Any] = []
+        self._order = array(_ID)            # individuals in declaration order
+        self._flags = bytearray()           # term id -> 1 if it names an individual
+        self.individuals = IndividualsView(self)   # type: ignore[assignment]
+
+    # ------------------------------ helpers -------------------------------
+
+    def _is_individual(self, i: int) -> bool:
+        return i < len(self._flags) and self._flags[i] == 1
+
+    def _link(self, s: int, p: int, o: int) -> bool:
+        if not self._spo.add(s, p, o):
+            return False
+        # SPO is the source of truth; the other permutations cannot hold
+        # the triple already, so they skip the duplicate check.
+        self._pos.add_new(p, o, s)
+        self._osp.add_new(o, s, p)
+        return True
+
+    def _unlink(self, s: int, p: int, o: int) -> bool:
+        if not self._spo.discard(s, p, o):
+            return False
+        self._pos.discard(p, o, s)
+        self._osp.discard(o, s, p)
+        return True
+
+    def _snapshot(self, i: int) -> Individual:
+        names = self.terms.names
+        types: set[str] = set()
+        object_props: dict[str, set[str]] = {}
+        for p, o in self._spo.scan(i):
+            if p == self._type_id:
+                types.add(names[o])
+            else:
+                object_props.setdefault(names[p], set()).add(names[o])
+        data_props: dict[str, list[Any]] = {}
+        for p, lit in sorted(self._data.scan(i)):
+            data_props.setdefault(names[p], []).append(self._literals[lit])
+        return Individual(name=names[i], types=types,
+                          object_props=object_props, data_props=data_props)
+
+    def optimize(self) -> None:
+        """Merge every write buffer into the sorted columns."""
+        for idx in (self._spo, self._pos, self._osp, self._data):
+            idx.merge()
+
+    def edge_columns(self) -> tuple[array, array, array]:
+        """
+        Subject, predicate and object term-id columns of every object-property
+        edge (``rdf:type`` rows excluded), grouped by predicate. Ids index
+        ``terms.names``; the columns are contiguous, so they can be handed to
+        Arrow or numpy without a per-edge Python object.
+        """
+        pos = self._pos
+        pos.merge()
+        lo, hi = pos._range(self._type_id)
+        out = []
+        for col in (pos.c, pos.a, pos.b):
+            ids = array(_ID)
+            for part in (col[:lo], col[hi:]):
+                ids.frombytes(memoryview(part).cast("B"))
+            out.append(ids)
+        return out[0], out[1], out[2]
+
+    def triple_count(self) -> int:
+        """A-Box triples held: rdf:type rows, object edges and data values."""
+        return len(self._spo) + len(self._data)
+
+    # ------------------------------ storage -------------------------------
+
+    def _store_individual(self, name: str, types: set[str]) -> Individual:
+        i = self.terms.intern(name)
+        if self._is_individual(i):
+            for p, o in list(self._spo.scan(i)):
+                self._unlink(i, p, o)
+            for p, lit in list(self._data.scan(i)):
+                self._data.discard(i, p, lit)
+        else:
+            if len(self._flags) <= i:
+                self._flags.extend(bytes(i + 1 - len(self._flags)))
+            self._flags[i] = 1
+            self._order.append(i)
+        for t in types:
+            self._link(i, self._type_id, self.terms.intern(t))
+        return self._snapshot(i)
+
+    def _store_type(self, individual: str, cls: str) -> None:
+        self._link(self.terms.ids[individual], self._type_id, self.terms.intern(cls))
+
+    def _store_value(self, subject: str, predicate: str, value: Any) -> None:
+        lit = len(self._literals)
+        self._literals.append(value)
+        self._data.add(self.terms.ids[subject], self.terms.intern(predicate), lit)
+
+    def _add_edge(self, subject: str, predicate: str, object_: str) -> bool:
+        ids = self.terms
+        if not self._link(ids.ids[subject], ids.intern(predicate), ids.ids[object_]):
+            return False
+        self._edge_added(subject, predicate, object_)
+        return True
+
+    def _add_edges(self, predicate: str, pairs: Iterable[tuple[str, str]]) -> int:
+        self._closures.pop((predicate, False), None)
+        self._closures.pop((predicate, True), None)
+        ids = self.terms.ids
+        p = self.terms.intern(predicate)
+        pairs = [(ids[s], ids[o]) for s, o in pairs]
+        if len(pairs) < TripleIndex.MERGE_MIN or len(pairs) << 4 < len(self._spo):
+            return sum(self._link(s, p, o) for s, o in pairs)
+        # A batch this large is cheaper to sort in than to buffer and merge.
+        mask, pp = 0xFFFFFFFF, p << 32
+        added = self._spo.add_keys([s << 64 | pp | o for s, o in pairs])
+        self._pos.add_keys([pp << 32 | (k & mask) << 32 | k >> 64 for k in added], new=True)
+        self._osp.add_keys([(k & mask) << 64 | (k >> 64) << 32 | p for k in added], new=True)
+        return len(added)
+
+    def _remove_individual(self, name: str) -> None:
+        i = self.terms.ids[name]
+        for p, o in list(self._spo.scan(i)):
+            self._unlink(i, p, o)
+        for s, p in list(self._osp.scan(i)):
+            self._unlink(s, p, i)
+        for p, lit in list(self._data.scan(i)):
+            self._data.discard(i, p, lit)
+        self._flags[i] = 0
+        self._order.remove(i)
+        self._closures.clear()
+
+    def _remove_type(self, individual: str, cls: str) -> None:
+        c = self.terms.lookup(cls)
+        if c is not None:
+            self._unlink(self.terms.ids[individual], self._type_id, c)
+
+    def _remove_value(self, subject: str, predicate: str, value: Any) -> bool:
+        p = self.terms.lookup(predicate)
+        if p is None:
+            return False
+        i = self.terms.ids[subject]
+        for lit in sorted(self._data.values(i, p)):
+            v = self._literals[lit]
+            if type(v) is type(value) and v == value:
+                return self._data.discard(i, p, lit)
+        return False
+
+    def _remove_edge(self, subject: str, predicate: str, object_: str) -> bool:
+        ids = self.terms
+        p = ids.lookup(predicate)
+        if p is None or not self._unlink(ids.ids[subject], p, ids.ids[object_]):
+            return False
+        self._edge_removed(predicate)
+        return True
+
+    def _types_of(self, individual: str) -> set[str]:
+        names = self.terms.names
+        return {names[o] for o in self._spo.values(self.terms.ids[individual], self._type_id)}
+
+    def _direct_instances(self, cls: str) -> Iterable[str]:
+        c = self.terms.lookup(cls)
+        if c is None:
+            return ()
+        names = self.terms.names
+        return [names[s] for s in self._pos.values(self._type_id, c)]
+
+    def _objects(self, subject: str, predicate: str) -> Iterable[str]:
+        p = self.terms.lookup(predicate)
+        if p is None:
+            return ()
+        names = self.terms.names
+        return [names[o] for o in self._spo.values(self.terms.ids[subject], p)]
+
+    def _subjects(self, object_: str, predicate: str) -> Iterable[str]:
+        p = self.terms.lookup(predicate)
+        if p is None:
+            return ()
+        names = self.terms.names
+        return [names[s] for s in self._pos.values(p, self.terms.ids[object_])]
+
+    def _edges(self, predicate: str) -> Iterator[tuple[str, str]]:
+        p = self.terms.lookup(predicate)
+        if p is None:
+            return
+        names = self.terms.names
+        for o, s in self._pos.scan(p):
+            yield names[s], names[o]
+
+    def _edge_count(self, predicate: str) -> int:
+        p = self.terms.lookup(predicate)
+        return 0 if p is None else self._pos.count(p)
+
+    def _values(self, subject: str, predicate: str) -> Iterable[Any]:
+        p = self.terms.lookup(predicate)
+        if p is None:
+            return ()
+        literals = self._literals
+        return [literals[lit] for lit in sorted(self._data.values(self.terms.ids[subject], p))]
+
+    def incoming(self, object_: str) -> dict[str, set[str]]:
+        o = self.terms.lookup(object_)
+        if o is None or not self._is_individual(o):
+            return {}
+        names = self.terms.names
+        out: dict[str, set[str]] = {}
+        for s, p in self._osp.scan(o):
+            if p != self._type_id:
+                out.setdefault(names[p], set()).add(names[s])
+        return out
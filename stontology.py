@@ -28,14 +28,22 @@ from llm_ontology_generator import (
     slugify,
     spec_to_ontology,
 )
+from ontology_artifacts import ArtifactWriter
 from ontology_builder import Ontology
+from ontology_context import DEFAULT_BUDGET, assemble_context, join_sections
+from ontology_duckdb import DuckDBOntology
 from ontology_intake_processor import (
-    build_intake_context,
-    build_uploaded_context,
+    intake_sections,
+    uploaded_sections,
     scan_intake_folder,
     INTAKE_SYSTEM_PROMPT_ADDENDUM,
 )
 
+try:
+    from duckdb import Error as DuckDBError
+except ImportError:     # no DuckDB copy is attempted, so nothing raises it
+    DuckDBError = OSError
+
 
 # ---------------------------------------------------------------------------
 # Page config + Material Design 3 (light) styling
@@ -216,10 +224,14 @@ if "dataset_label" not in st.session_state:
     st.session_state.dataset_label = None
 if "intake_context" not in st.session_state:
     st.session_state.intake_context = None   # combined text from intake files
+if "intake_sections" not in st.session_state:
+    st.session_state.intake_sections = None  # per-file sections, budgeted per prompt
 if "intake_label" not in st.session_state:
     st.session_state.intake_label = None     # summary label for loaded intake
 if "intake_files_summary" not in st.session_state:
     st.session_state.intake_files_summary = None  # list of loaded file names
+if "artifact_writer" not in st.session_state:
+    st.session_state.artifact_writer = ArtifactWriter("ontology")  # background exports
 
 
 # ---------------------------------------------------------------------------
@@ -246,7 +258,7 @@ with hdr_r:
         if st.button("Reset", use_container_width=True):
             for k in ("spec", "ont", "name", "messages",
                       "dataset_text", "dataset_label",
-                      "intake_context", "intake_label",
+                      "intake_context", "intake_sections", "intake_label",
                       "intake_files_summary"):
                 st.session_state[k] = [] if k == "messages" else None
             st.rerun()
@@ -256,6 +268,7 @@ with hdr_r:
 # ---------------------------------------------------------------------------
 
 INTAKE_FOLDER = Path("OntologyIntake")
+CONTEXT_TOKEN_BUDGET = DEFAULT_BUDGET   # intake tokens per prompt
 
 with st.expander("📂 **Data Intake** — Upload files or load OntologyIntake folder",
                  expanded=st.session_state.intake_context is None):
@@ -270,9 +283,11 @@ with st.expander("📂 **Data Intake** — Upload files or load OntologyIntake f
                  "DOCX (data dictionary) files.",
         )
         if uploaded_files:
-            ctx = build_uploaded_context(uploaded_files)
+            sections = uploaded_sections(uploaded_files)
+            ctx = join_sections(sections)
             if ctx.strip():
                 st.session_state.intake_context = ctx
+                st.session_state.intake_sections = sections
                 names = [f.name for f in uploaded_files]
                 st.session_state.intake_label = f"{len(names)} uploaded file(s)"
                 st.session_state.intake_files_summary = names
@@ -293,9 +308,11 @@ with st.expander("📂 **Data Intake** — Upload files or load OntologyIntake f
             )
             if st.button("📥 Load OntologyIntake folder",
                          use_container_width=True):
-                ctx = build_intake_context(INTAKE_FOLDER)
+                sections = intake_sections(INTAKE_FOLDER)
+                ctx = join_sections(sections)
                 if ctx.strip():
                     st.session_state.intake_context = ctx
+                    st.session_state.intake_sections = sections
                     all_names = (
                         [f.name for f in files_info["csv"]]
                         + [f.name for f in files_info["pdf"]]
@@ -485,7 +502,7 @@ with tab_overview:
             st.markdown(f"**Prefix:** `{spec.get('prefix', '—')}`")
             st.markdown(f"**Description:** {spec.get('description', '—')}")
         with col2:
-            issues = ont.check_consistency()
+            issues = ont.check_consistency(incremental=True)
             if not issues:
                 st.markdown('<span class="m3-status-ok">● Consistency OK</span>',
                             unsafe_allow_html=True)
@@ -525,24 +542,57 @@ with tab_individuals:
 # Edit tab — add classes / properties / individuals / assertions manually
 # ---------------------------------------------------------------------------
 
+def _use_ontology(o: Ontology, name: str, spec: dict | None) -> None:
+    """Make `o` the session ontology, kept in ``ontology/<name>.duckdb``.
+
+    The copy into DuckDB happens once, here; edits then write through and
+    `_persist_artifacts` only flushes them. The previous session ontology is
+    closed first, with its pending exports dropped, as it may hold the same
+    file. Without duckdb, or if the file cannot be opened, `o` stays in memory.
+    """
+    prev = st.session_state.ont
+    st.session_state.artifact_writer.cancel()
+    if isinstance(prev, DuckDBOntology) and prev is not o:
+        try:
+            prev.close()
+        except (OSError, DuckDBError):
+            pass
+    if not isinstance(o, DuckDBOntology):
+        out = Path("ontology")
+        out.mkdir(parents=True, exist_ok=True)
+        db = out / f"{name}.duckdb"
+        try:
+            o = DuckDBOntology.from_ontology(o, db, overwrite=True)
+        except ImportError:
+            pass
+        except (OSError, DuckDBError) as e:
+            st.warning(f"Keeping {name} in memory; DuckDB store not written ({db.name}): {e}")
+    st.session_state.ont = o
+    st.session_state.spec = spec
+    st.session_state.name = name
+
+
 def _persist_artifacts() -> Path | None:
-    """Re-write the four ontology files for the current in-memory ontology."""
+    """Schedule the ontology files for the current in-memory ontology.
+
+    The exports are written by the session's background `ArtifactWriter`
+    (debounced, unchanged formats skipped, N-Triples appended), so an edit
+    returns without waiting for a full re-export.
+    """
     o = st.session_state.ont
     if not o:
         return None
     name = st.session_state.name or "ontology"
     out = Path("ontology")
     out.mkdir(parents=True, exist_ok=True)
-    (out / f"{name}.ttl").write_text(o.to_turtle(), encoding="utf-8")
-    (out / f"{name}.jsonld").write_text(
-        json.dumps(o.to_jsonld(), indent=2), encoding="utf-8")
-    (out / f"{name}.rdf").write_text(o.to_rdf_xml(), encoding="utf-8")
-    (out / f"{name}.nt").write_text(o.to_ntriples(), encoding="utf-8")
-    (out / f"{name}.json").write_text(
-        json.dumps(o.to_dict(), indent=2), encoding="utf-8")
-    if st.session_state.spec is not None:
-        (out / f"{name}.raw.json").write_text(
-            json.dumps(st.session_state.spec, indent=2), encoding="utf-8")
+    # The DuckDB store is written through; a failed flush (the file locked
+    # by another session, a full disk) never loses the edit in memory.
+    if isinstance(o, DuckDBOntology):
+        try:
+            o.flush()
+        except (OSError, DuckDBError) as e:
+            st.warning(f"DuckDB store not updated ({Path(o.path).name}): {e}")
+    st.session_state.artifact_writer.schedule(o, name, st.session_state.spec)
     return out
 
 
@@ -567,16 +617,45 @@ with tab_edit:
                                         value="https://example.org/ont/",
                                         key="new_ont_iri")
             if st.button("✨ Create empty ontology", use_container_width=True):
-                st.session_state.ont = Ontology(iri=new_iri, prefix=new_prefix)
-                st.session_state.spec = {
+                _use_ontology(Ontology(iri=new_iri, prefix=new_prefix), slugify(new_name), {
                     "ontology_name": new_name, "iri_base": new_iri,
                     "prefix": new_prefix, "description": "",
                     "classes": [], "object_properties": [],
                     "data_properties": [], "individuals": [],
-                }
-                st.session_state.name = slugify(new_name)
+                })
                 _persist_artifacts()
                 st.rerun()
+
+            # Reopen a previously persisted ontology straight from disk —
+            # the DuckDB store is preferred, then the native JSON dump, then
+            # N-Triples, then Turtle.
+            saved: dict[str, Path] = {}
+            for ext in ("ttl", "nt", "json", "duckdb"):
+                for f in sorted(Path("ontology").glob(f"*.{ext}")):
+                    if not f.name.endswith(".raw.json"):
+                        saved[f.stem] = f
+            if saved:
+                st.markdown("**📂 Open saved ontology**")
+                co1, co2 = st.columns([0.7, 0.3])
+                with co1:
+                    pick = st.selectbox("Saved ontology", sorted(saved),
+                                        key="open_saved_name",
+                                        label_visibility="collapsed")
+                with co2:
+                    if st.button("Open", use_container_width=True):
+                        path = saved[pick]
+                        try:
+                            loaded = (DuckDBOntology(path) if path.suffix == ".duckdb"
+                                      else Ontology.load(path))
+                        except Exception as e:  # noqa: BLE001 — duckdb raises its own types
+                            st.error(f"Could not open {path.name}: {e}")
+                        else:
+                            raw_spec = path.with_name(f"{pick}.raw.json")
+                            _use_ontology(loaded, pick, (
+                                json.loads(raw_spec.read_text(encoding="utf-8"))
+                                if raw_spec.exists() else
+                                {"iri_base": loaded.iri, "prefix": loaded.prefix}))
+                            st.rerun()
         else:
             class_names = sorted(ont.classes.keys())
             obj_prop_names = sorted(ont.object_properties.keys())
@@ -774,32 +853,39 @@ with tab_edit:
 with tab_artifacts:
     if ont:
         name = st.session_state.name or "ontology"
-        ttl = ont.to_turtle()
-        jld = json.dumps(ont.to_jsonld(), indent=2)
-        rdfxml = ont.to_rdf_xml()
-        nt = ont.to_ntriples()
-        nat = json.dumps(ont.to_dict(), indent=2)
-        raw = json.dumps(st.session_state.spec or {}, indent=2)
-
-        d1, d2, d3, d4, d5, d6 = st.columns(6)
-        with d1:
-            st.download_button("⬇ Turtle", ttl, file_name=f"{name}.ttl",
-                               mime="text/turtle", use_container_width=True)
-        with d2:
-            st.download_button("⬇ RDF/XML", rdfxml, file_name=f"{name}.rdf",
-                               mime="application/rdf+xml", use_container_width=True)
-        with d3:
-            st.download_button("⬇ N-Triples", nt, file_name=f"{name}.nt",
-                               mime="application/n-triples", use_container_width=True)
-        with d4:
-            st.download_button("⬇ JSON-LD", jld, file_name=f"{name}.jsonld",
-                               mime="application/ld+json", use_container_width=True)
-        with d5:
-            st.download_button("⬇ JSON", nat, file_name=f"{name}.json",
-                               mime="application/json", use_container_width=True)
-        with d6:
-            st.download_button("⬇ Raw spec", raw, file_name=f"{name}.raw.json",
-                               mime="application/json", use_container_width=True)
+        writer = st.session_state.artifact_writer
+        if writer.last_error is not None:
+            st.warning(f"Saving to ontology/ failed: {writer.last_error}")
+
+        view = st.radio(
+            "Preview",
+            ["Turtle", "RDF/XML", "N-Triples", "JSON-LD", "JSON", "Raw"],
+            horizontal=True, label_visibility="collapsed",
+        )
+        fmt, mime, lang = {
+            "Turtle": ("ttl", "text/turtle", "turtle"),
+            "RDF/XML": ("rdf", "application/rdf+xml", "xml"),
+            "N-Triples": ("nt", "application/n-triples", "text"),
+            "JSON-LD": ("jsonld", "application/ld+json", "json"),
+            "JSON": ("json", "application/json", "json"),
+            "Raw": ("raw.json", "application/json", "json"),
+        }[view]
+        # Only the selected format is shown, read from the file the
+        # background writer saved; it is exported here only on request while
+        # that file is stale, so reruns after an edit do no export work.
+        body = None
+        if view == "Raw":
+            body = json.dumps(st.session_state.spec or {}, indent=2)
+        elif (path := writer.written(ont, name, fmt)) is not None:
+            body = path.read_text(encoding="utf-8")
+        elif st.button(f"Render {view}"):
+            body = ont.export(fmt)
+        elif writer.pending:
+            st.info(f"Saving `ontology/{name}.{fmt}` in the background; "
+                    "it shows here once written.")
+        if body is not None:
+            st.download_button(f"⬇ {view}", body, file_name=f"{name}.{fmt}",
+                               mime=mime)
 
         st.caption(
             "All three of **Turtle**, **RDF/XML**, **N-Triples** and **JSON-LD** "
@@ -808,17 +894,9 @@ with tab_artifacts:
             "Neo4j n10s, or any other RDF-compatible triplestore."
         )
 
-        view = st.radio(
-            "Preview",
-            ["Turtle", "RDF/XML", "N-Triples", "JSON-LD", "JSON", "Raw"],
-            horizontal=True, label_visibility="collapsed",
-        )
-        body = {"Turtle": ttl, "RDF/XML": rdfxml, "N-Triples": nt,
-                "JSON-LD": jld, "JSON": nat, "Raw": raw}[view]
-        lang = {"Turtle": "turtle", "RDF/XML": "xml", "N-Triples": "text",
-                "JSON-LD": "json", "JSON": "json", "Raw": "json"}[view]
-        with st.container(height=PANEL_HEIGHT - 60):
-            st.code(body, language=lang)
+        if body is not None:
+            with st.container(height=PANEL_HEIGHT - 60):
+                st.code(body, language=lang)
     else:
         st.info("Generate an ontology to see exports.")
 
@@ -833,9 +911,17 @@ prompt = st.chat_input("Describe a domain or ask to create an ontology from uplo
 if prompt:
     st.session_state.messages.append({"role": "user", "content": prompt})
 
-    # Use intake context (multi-file) if available, fallback to single CSV
-    combined_context = (st.session_state.intake_context
-                        or st.session_state.dataset_text)
+    # Use intake context (multi-file) if available, fallback to single CSV.
+    # Intake sections are fitted to the token budget, most relevant first.
+    context_note = ""
+    if st.session_state.intake_sections:
+        combined_context, context_report = assemble_context(
+            st.session_state.intake_sections, budget=CONTEXT_TOKEN_BUDGET, query=prompt)
+        if context_report.truncated or context_report.dropped:
+            context_note = f"  \nIntake context: {context_report.summary()}"
+    else:
+        combined_context = (st.session_state.intake_context
+                            or st.session_state.dataset_text)
     # Use enriched system prompt when intake data is loaded
     system_prompt = SYSTEM_PROMPT
     if st.session_state.intake_context:
@@ -853,25 +939,22 @@ if prompt:
             ont_obj = spec_to_ontology(spec)
             name = slugify(spec.get("ontology_name") or prompt[:32])
 
-            # Persist artifacts to ./ontology/
             out_dir = Path("ontology")
             out_dir.mkdir(parents=True, exist_ok=True)
-            (out_dir / f"{name}.raw.json").write_text(
-                json.dumps(spec, indent=2), encoding="utf-8")
-            (out_dir / f"{name}.ttl").write_text(
-                ont_obj.to_turtle(), encoding="utf-8")
-            (out_dir / f"{name}.jsonld").write_text(
-                json.dumps(ont_obj.to_jsonld(), indent=2), encoding="utf-8")
-            (out_dir / f"{name}.rdf").write_text(
-                ont_obj.to_rdf_xml(), encoding="utf-8")
-            (out_dir / f"{name}.nt").write_text(
-                ont_obj.to_ntriples(), encoding="utf-8")
-            (out_dir / f"{name}.json").write_text(
-                json.dumps(ont_obj.to_dict(), indent=2), encoding="utf-8")
-
-        st.session_state.spec = spec
-        st.session_state.ont = ont_obj
-        st.session_state.name = name
+
+            # Regeneration in the same namespace: record what the LLM changed.
+            prev = st.session_state.ont
+            changes = ""
+            if prev is not None and prev.iri == ont_obj.iri:
+                patch = prev.diff(ont_obj)
+                patch.write(out_dir / f"{name}.patch")
+                changes = (f"  \nChanges vs previous: +{len(patch.added)} / "
+                           f"−{len(patch.removed)} triples (`ontology/{name}.patch`)")
+
+        # The exports go through the session's writer, after its pending
+        # pass for the previous ontology has been dropped.
+        _use_ontology(ont_obj, name, spec)
+        _persist_artifacts()
         st.session_state.last_out_dir = str(out_dir.resolve())
 
         issues = ont_obj.check_consistency()
@@ -882,6 +965,7 @@ if prompt:
             f"{len(ont_obj.individuals)} individuals. "
             f"Consistency: {'OK ✅' if not issues else f'{len(issues)} issue(s) ⚠️'}  \n"
             f"Saved to `ontology/{name}.{{ttl,jsonld,rdf,nt,json,raw.json}}`"
+            f"{changes}{context_note}"
         )
         st.session_state.messages.append({"role": "assistant", "content": summary})
         st.rerun()
@@ -0,0 +1,97 @@
+from ontology_artifacts import ArtifactWriter
+from ontology_builder import Ontology
+
+
+def _ontology(located: bool = True) -> Ontology:
+    ont = Ontology(prefix="mfg")
+    ont.add_class("Equipment")
+    ont.add_class("Robot", parents=["Equipment"])
+    ont.add_class("Line")
+    ont.add_object_property("locatedIn", domain="Equipment", range_="Line")
+    ont.add_individual("Line_A", ["Line"])
+    ont.add_individual("CNC_001", ["Equipment"])
+    if located:
+        ont.assert_object("CNC_001", "locatedIn", "Line_A")
+    return ont
+
+
+def _nt_lines(path) -> set[str]:
+    return {line for line in path.read_text(encoding="utf-8").splitlines() if line}
+
+
+def _fail_once(ont: Ontology, method: str) -> None:
+    real = getattr(ont, method)
+
+    def fail(*args, **kwargs):
+        setattr(ont, method, real)
+        raise RuntimeError("dictionary changed size during iteration")
+
+    setattr(ont, method, fail)
+
+
+def test_files_match_memory(tmp_path):
+    ont = _ontology()
+    writer = ArtifactWriter(tmp_path, delay=0)
+    writer.schedule(ont, "mfg", {"classes": []})
+    assert writer.flush(timeout=10)
+    ont.add_individual("CNC_002", ["Robot"])
+    ont.assert_object("CNC_002", "locatedIn", "Line_A")
+    writer.schedule(ont, "mfg", {"classes": []})
+    assert writer.flush(timeout=10)
+
+    assert writer.last_error is None
+    assert _nt_lines(tmp_path / "mfg.nt") == set(ont.to_ntriples().splitlines())
+    assert (tmp_path / "mfg.ttl").read_text(encoding="utf-8") == ont.to_turtle()
+    assert (tmp_path / "mfg.raw.json").exists()
+
+
+def test_failed_rewrite_is_redone(tmp_path):
+    ont = _ontology()
+    writer = ArtifactWriter(tmp_path, delay=0)
+    writer.schedule(ont, "mfg")
+    assert writer.flush(timeout=10)
+    ont.apply_patch(ont.diff(_ontology(located=False)))    # a removal: rewrite, not append
+    ont.add_individual("CNC_002", ["Robot"])
+    _fail_once(ont, "write_ntriples")
+    writer.schedule(ont, "mfg")
+    assert writer.flush(timeout=10)
+
+    assert writer.last_error is None
+    assert _nt_lines(tmp_path / "mfg.nt") == set(ont.to_ntriples().splitlines())
+
+
+def test_failed_append_is_redone(tmp_path):
+    ont = _ontology()
+    writer = ArtifactWriter(tmp_path, delay=0)
+    writer.schedule(ont, "mfg")
+    assert writer.flush(timeout=10)
+    ont.add_individual("CNC_002", ["Robot"])
+    _fail_once(ont, "delta_ntriples")
+    writer.schedule(ont, "mfg")
+    assert writer.flush(timeout=10)
+
+    assert writer.last_error is None
+    assert _nt_lines(tmp_path / "mfg.nt") == set(ont.to_ntriples().splitlines())
+
+
+def test_written_tracks_the_current_version(tmp_path):
+    ont = _ontology()
+    writer = ArtifactWriter(tmp_path, delay=0)
+    assert writer.written(ont, "mfg", "ttl") is None
+    writer.schedule(ont, "mfg")
+    assert writer.flush(timeout=10)
+    assert writer.written(ont, "mfg", "ttl") == tmp_path / "mfg.ttl"
+    assert writer.written(_ontology(), "mfg", "ttl") is None
+    ont.add_individual("CNC_002", ["Robot"])
+    assert writer.written(ont, "mfg", "ttl") is None
+
+
+def test_cancel_drops_the_pending_request(tmp_path):
+    ont = _ontology()
+    writer = ArtifactWriter(tmp_path, delay=0.2)
+    writer.schedule(ont, "mfg")
+    assert writer.cancel(timeout=10)
+    assert not writer.pending
+    writer.schedule(ont, "other")
+    assert writer.flush(timeout=10)
+    assert sorted(p.name for p in tmp_path.glob("*.ttl")) == ["other.ttl"]
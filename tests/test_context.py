@@ -0,0 +1,58 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from ontology_context import Section, _words, assemble_context, count_tokens
+from ontology_intake_processor import profile_csv_text
+
+INTAKE = Path(__file__).resolve().parent.parent / "OntologyIntake"
+
+
+@pytest.fixture
+def csv_sections(monkeypatch):
+    monkeypatch.setattr("ontology_intake_processor.CACHE", None)
+    return [Section("csv", p.name, profile_csv_text(p, p.name))
+            for p in sorted(INTAKE.glob("*.csv"))]
+
+
+def _filler(rnd: random.Random, lines: int) -> str:
+    words = "entity relationship cardinality attribute key column table status".split()
+    return "\n".join(" ".join(rnd.choice(words) for _ in range(rnd.randrange(3, 15)))
+                     for _ in range(lines))
+
+
+def _docx(rnd: random.Random, tables: int) -> str:
+    out = ["=== DOCX: dictionary.docx ==="]
+    for t in range(tables):
+        out += [f"# Table {t}", "[TABLE]"]
+        out += [f"col_{t}_{k} | varchar | {_filler(rnd, 1)}" for k in range(rnd.randrange(1, 12))]
+        out += ["[/TABLE]", _filler(rnd, rnd.randrange(1, 4))]
+    return "\n".join(out)
+
+
+def test_budget_is_never_exceeded(csv_sections):
+    rnd = random.Random(11)
+    for _ in range(60):
+        sections = rnd.sample(csv_sections, rnd.randrange(1, len(csv_sections) + 1))
+        sections += [Section("pdf", f"model{k}.pdf", "=== PDF: model.pdf ===\n"
+                             + _filler(rnd, rnd.randrange(1, 300)))
+                     for k in range(rnd.randrange(3))]
+        sections += [Section("docx", "dictionary.docx", _docx(rnd, rnd.randrange(1, 20)))]
+        budget = rnd.randrange(20, 6000)
+        text, report = assemble_context(sections, budget=budget, query="orders and returns")
+        assert report.tokens == count_tokens(text) <= budget
+
+
+def test_plural_query_keeps_the_matching_table(csv_sections):
+    rnd = random.Random(2)
+    sections = csv_sections + [Section("pdf", "model.pdf", _filler(rnd, 2000))]
+    text, report = assemble_context(sections, budget=2000, query="orders and returns")
+    assert "order.csv" not in [name for name, _ in report.dropped]
+    assert "=== CSV: order.csv ===" in text
+    assert "- order_id: integer; 20 distinct; 70001 .. 70020; primary key candidate" in text
+
+
+def test_words_fold_plurals():
+    assert {"order", "return", "orderline"} <= _words("orders and returns; order_lines")
+    assert {"address", "category", "status"} <= _words("addresses categories status")
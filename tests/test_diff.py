@@ -0,0 +1,137 @@
+import pytest
+
+from ontology_builder import Ontology
+from ontology_diff import Patch
+from ontology_store import CompactOntology
+
+IRI, PREFIX = "https://example.org/mfg/", "mfg"
+
+
+def _backends() -> list:
+    backends = [Ontology, CompactOntology]
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return backends
+    from ontology_duckdb import DuckDBOntology
+
+    return backends + [DuckDBOntology]
+
+
+def _schema(ont: Ontology) -> Ontology:
+    ont.add_class("Equipment")
+    ont.add_class("Machine", parents=["Equipment"], comment="A production machine")
+    ont.add_class("Line")
+    ont.add_object_property("locatedIn", domain="Equipment", range_="Line")
+    ont.add_object_property("hosts", inverse_of="locatedIn")
+    ont.add_object_property("near", symmetric=True)
+    ont.add_data_property("status", domain="Equipment")
+    ont.add_data_property("speed", domain="Machine", datatype="xsd:double")
+    ont.add_data_property("serviced", datatype="xsd:boolean")
+    return ont
+
+
+def _build(new: bool = False) -> Ontology:
+    ont = _schema(Ontology(iri=IRI, prefix=PREFIX))
+    if new:
+        ont.add_class("Robot", parents=["Machine"])
+        ont.add_class("Machine", parents=["Equipment"], comment="Any machine on a line")
+        ont.add_data_property("notes")
+    ont.add_individual("Line_A", ["Line"])
+    ont.add_individual("Line_B", ["Line"])
+    for k in range(1, 6):
+        name = f"CNC_{k:03d}"
+        if new and k == 4:
+            continue
+        ont.add_individual(name, ["Machine"])
+        ont.assert_object(name, "locatedIn", "Line_A")
+        ont.assert_data(name, "status", "running" if new and k == 1 else "idle")
+        ont.assert_data(name, "speed", 1.5 * k)
+    ont.assert_object("CNC_001", "near", "CNC_002")
+    ont.assert_data("CNC_003", "serviced", True)
+    if new:
+        ont.add_individual("ARM_001", ["Robot"])
+        ont.assert_object("ARM_001", "locatedIn", "Line_B")
+        ont.assert_object("ARM_001", "near", "CNC_001")
+        ont.assert_data("ARM_001", "notes", 'says "hi"\nand\tleaves \\ a slash')
+        ont.add_type("CNC_005", "Robot")
+    return ont
+
+
+def _triples(ont: Ontology) -> set[str]:
+    return set(ont.to_ntriples().splitlines())
+
+
+def _replica(cls, source: Ontology) -> Ontology:
+    ont = cls(iri=source.iri, prefix=source.prefix)
+    ont.apply_patch(Patch.parse(ont.diff(source).to_text()))
+    return ont
+
+
+@pytest.mark.parametrize("cls", _backends(), ids=lambda c: c.__name__)
+def test_patch_round_trip(cls):
+    old, new = _build(), _build(new=True)
+    patch = old.diff(new)
+    assert patch and patch.summary()["removed"] and patch.summary()["added"]
+    parsed = Patch.parse(patch.to_text())
+    assert (parsed.removed, parsed.added) == (patch.removed, patch.added)
+
+    replica = _replica(cls, old)
+    try:
+        assert _triples(replica) == _triples(old)
+        replica.apply_patch(parsed)
+        assert _triples(replica) == _triples(new)
+        assert not replica.diff(new)
+        assert replica.instances_of("Machine") == new.instances_of("Machine")
+
+        replica.apply_patch(Patch.parse(parsed.inverse().to_text()))
+        assert _triples(replica) == _triples(old)
+        assert not replica.diff(old)
+    finally:
+        getattr(replica, "close", lambda: None)()
+
+
+def test_patch_is_idempotent():
+    old, new = _build(), _build(new=True)
+    patch = old.diff(new)
+    old.apply_patch(patch)
+    old.apply_patch(patch)
+    assert _triples(old) == _triples(new)
+
+
+def test_parse_rejects_bad_rows():
+    with pytest.raises(ValueError, match="line 2"):
+        Patch.parse("TX .\nA <s> <p> .\nTC .\n")
+    with pytest.raises(ValueError, match="unsupported row"):
+        Patch.parse("TX .\nX <s> <p> <o> .\n")
+
+
+@pytest.mark.parametrize("cls", _backends(), ids=lambda c: c.__name__)
+def test_patch_changes_a_datatype(cls):
+    old, new = (Ontology(iri=IRI, prefix=PREFIX) for _ in range(2))
+    old.add_data_property("d")
+    new.add_data_property("d", datatype="xsd:dateTime")
+    for ont in (old, new):
+        ont.add_individual("x")
+        ont.assert_data("x", "d", "2024-01-01")
+
+    replica = _replica(cls, old)
+    try:
+        replica.apply_patch(Patch.parse(old.diff(new).to_text()))
+        assert replica.individuals["x"].data_props["d"] == ["2024-01-01"]
+        assert replica.to_ntriples() == new.to_ntriples()
+    finally:
+        getattr(replica, "close", lambda: None)()
+
+
+def test_patch_removes_every_copy_of_a_value():
+    old, new = (Ontology(iri=IRI, prefix=PREFIX) for _ in range(2))
+    for ont, values in ((old, [1, 1, 2]), (new, [2])):
+        ont.add_data_property("n", datatype="xsd:integer")
+        ont.add_individual("x")
+        for v in values:
+            ont.assert_data("x", "n", v)
+
+    old.apply_patch(Patch.parse(old.diff(new).to_text()))
+    assert old.individuals["x"].data_props["n"] == [2]
+    assert old.to_ntriples() == new.to_ntriples()
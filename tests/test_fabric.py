@@ -0,0 +1,81 @@
+import pytest
+
+from ontology_builder import FabricAdapter, Ontology
+from ontology_store import CompactOntology
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+IRI, PREFIX = "https://example.org/mfg/", "mfg"
+
+
+def _schema(ont: Ontology) -> Ontology:
+    ont.add_class("Equipment")
+    ont.add_class("Machine", parents=["Equipment"])
+    ont.add_class("Line")
+    ont.add_object_property("locatedIn", domain="Equipment", range_="Line")
+    ont.add_object_property("feeds", domain="Machine", range_="Machine")
+    ont.add_data_property("status", domain="Equipment")
+    ont.add_data_property("speed", domain="Machine", datatype="xsd:double")
+    return ont
+
+
+def _source(cls) -> Ontology:
+    ont = _schema(cls(iri=IRI, prefix=PREFIX))
+    for line in ("Line_A", "Line_B"):
+        ont.add_individual(line, ["Line"])
+    for k in range(250):
+        name = f"CNC_{k:03d}"
+        ont.add_individual(name, ["Machine"])
+        ont.assert_object(name, "locatedIn", "Line_A" if k % 3 else "Line_B")
+        if k:
+            ont.assert_object(f"CNC_{k - 1:03d}", "feeds", name)
+        ont.assert_data(name, "status", "idle" if k % 2 else "running")
+        ont.assert_data(name, "speed", 1.5 * k)
+    return ont
+
+
+def _write_entities(ont: Ontology, path) -> None:
+    rows = [(name, sorted(ind.types)[0], (ind.data_props.get("status") or [None])[0],
+             (ind.data_props.get("speed") or [None])[0])
+            for name, ind in ont.individuals.items()]
+    path.mkdir(parents=True)
+    pq.write_table(pa.table({"asset_id": [r[0] for r in rows],
+                             "class_name": [r[1] for r in rows],
+                             "status": [r[2] for r in rows],
+                             "speed": [r[3] for r in rows]}), str(path / "part-0.parquet"))
+
+
+def _triples(ont: Ontology) -> set[str]:
+    return set(ont.to_ntriples().splitlines())
+
+
+@pytest.mark.parametrize("cls", [Ontology, CompactOntology], ids=lambda c: c.__name__)
+def test_lakehouse_round_trip(cls, tmp_path):
+    source = _source(cls)
+    adapter = FabricAdapter(source, root=tmp_path, batch_size=100)
+    edges = sum(len(v) for ind in source.individuals.values()
+                for v in ind.object_props.values())
+    assert adapter.to_lakehouse_triples("relations") == edges
+    assert pq.read_table(str(tmp_path / "Tables" / "relations")).num_rows == edges
+    _write_entities(source, tmp_path / "Tables" / "equipment")
+
+    replica = _schema(cls(iri=IRI, prefix=PREFIX))
+    reader = FabricAdapter(replica, root=tmp_path, batch_size=100)
+    assert reader.from_lakehouse("equipment").data_triples == 2 * 250
+    assert reader.from_lakehouse_triples("relations").object_triples == edges
+    assert _triples(replica) == _triples(source)
+    assert not replica.check_consistency()
+
+
+def test_export_batches_respect_the_size():
+    batches = list(FabricAdapter(_source(Ontology), batch_size=64).iter_triple_batches())
+    assert all(b.num_rows == 64 for b in batches[:-1]) and 0 < batches[-1].num_rows <= 64
+    assert {p for b in batches for p in b.column("predicate").to_pylist()} \
+        == {"locatedIn", "feeds"}
+
+
+def test_without_spark_or_root_the_error_says_what_to_pass():
+    adapter = FabricAdapter(_source(Ontology))
+    with pytest.raises((ImportError, ValueError), match="root="):
+        adapter.to_lakehouse_triples()
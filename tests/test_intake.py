@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+import ontology_intake_processor as intake
+from ontology_intake_processor import ExtractionCache, sample_csv_rows, sample_csv_text
+
+ROWS = 60_000
+
+
+@pytest.fixture(scope="module")
+def big_csv(tmp_path_factory):
+    rnd = random.Random(4)
+    path = tmp_path_factory.mktemp("intake") / "order_line.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("line_id,order_id,note\n")
+        for k in range(ROWS):
+            # Uneven row widths, so the estimate has to average them out.
+            note = "x" * rnd.randrange(0, 40)
+            f.write(f'{k},{k // 3},"{note}, quoted"\n')
+    return path
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    monkeypatch.setattr(intake, "CSV_FULL_SCAN_BYTES", 256 << 10)
+    monkeypatch.setattr(intake, "CSV_CHUNK_BYTES", 16 << 10)
+
+
+def test_estimate_is_close(big_csv, small_limits):
+    sample = sample_csv_rows(big_csv, max_rows=8)
+    assert not sample.exact
+    assert abs(sample.row_count - ROWS) <= 0.05 * ROWS
+    assert sample.row_count_text().startswith("~")
+    assert sample.header == ["line_id", "order_id", "note"]
+
+
+def test_sample_spans_the_file(big_csv, small_limits):
+    sample = sample_csv_rows(big_csv, max_rows=8)
+    ids = [int(r[0]) for r in sample.rows]
+    assert len(ids) == 8 and ids == sorted(ids)
+    assert all(len(r) == 3 for r in sample.rows)
+    assert ids[0] < ROWS // 8 and ids[-1] >= ROWS * 7 // 8
+    assert sample_csv_rows(big_csv, max_rows=8).rows == sample.rows
+    assert sample_csv_rows(big_csv.read_bytes(), max_rows=8).rows == sample.rows
+
+
+def test_full_scan_is_exact(big_csv):
+    sample = sample_csv_rows(big_csv, max_rows=5, seed=3)
+    assert sample.exact and sample.row_count == ROWS
+    assert len(sample.rows) == 5
+
+
+def test_large_files_bypass_the_cache(big_csv, small_limits, monkeypatch, tmp_path):
+    cache = ExtractionCache(tmp_path / "cache")
+    monkeypatch.setattr(intake, "CACHE", cache)
+    text = sample_csv_text(big_csv, "order_line.csv")
+    assert "rows: ~" in text and "(estimated)" in text
+    assert not list((tmp_path / "cache").glob("*.txt"))
+    sample_csv_text(b"a,b\n1,2\n", "small.csv")
+    assert len(list((tmp_path / "cache").glob("*.txt"))) == 1
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from ontology_profiler import _parse, link_references, profile_csv
+
+INTAKE = Path(__file__).resolve().parent.parent / "OntologyIntake"
+
+CASES = {
+    "empty": b"",
+    "header_only": b"a,b\n",
+    "ragged": b"a,b\n1,x\n2\n3,y,extra\n",
+    "blank_line": b"a,b\n1,x\n\n2,y\n",
+    "date_then_timestamp": b"d\n2024-01-01\n2024-01-02 10:00:00\n",
+    "timestamp_then_date": b"d\n2024-01-02 10:00:00\n2024-01-01\n",
+    "zoned": b"t\n2026-04-18T20:01:00Z\n2026-03-19T11:11:00+02:00\n",
+    "digits": b"code\n0042\n0043\n",
+    "times": b"t\n10:30\n11:00:05\n",
+    "nulls": b"a,b\n1,NULL\n2,NA\n3,\n",
+    "quoted": b'a,b\n"x, y",1\n"say ""hi""",2\n',
+    "double_forms": b"x\n1.5\n1.50\n2\n",
+    "timestamp_forms": b"t\n2024-01-02T10:00:00Z\n2024-01-02 10:00:00\n",
+    "widened": b"x\n1\n1.0\n2\n",
+    "turns_varchar": b"x\n1.5\n1.50\nn/a\n",
+}
+
+
+def _engines_agree(source, name=None):
+    pytest.importorskip("duckdb")
+    fast = profile_csv(source, name=name, engine="duckdb")
+    slow = profile_csv(source, name=name, engine="python")
+    assert (fast.engine, slow.engine) == ("duckdb", "python")
+    fast.engine = slow.engine
+    assert fast == slow
+    return slow
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_engines_agree_on_edge_cases(name):
+    _engines_agree(CASES[name], name)
+
+
+@pytest.mark.parametrize("path", sorted(INTAKE.glob("*.csv")), ids=lambda p: p.name)
+def test_engines_agree_on_intake(path):
+    _engines_agree(path)
+
+
+def test_edge_case_profiles():
+    assert profile_csv(CASES["empty"], engine="python").columns == []
+    ragged = profile_csv(CASES["ragged"], engine="python")
+    assert [c.name for c in ragged.columns] == ["a", "b"] and ragged.columns[1].nulls == 1
+    types = {name: profile_csv(CASES[name], engine="python").columns[0].type
+             for name in ("date_then_timestamp", "timestamp_then_date", "digits", "times")}
+    assert types == {"date_then_timestamp": "varchar", "timestamp_then_date": "timestamp",
+                     "digits": "varchar", "times": "time"}
+    assert _parse("time", "0042") is None
+    distinct = {name: profile_csv(CASES[name], engine="python").columns[0].distinct
+                for name in ("double_forms", "timestamp_forms", "widened", "turns_varchar")}
+    assert distinct == {"double_forms": 2, "timestamp_forms": 1, "widened": 2,
+                        "turns_varchar": 3}
+
+
+def test_references_need_a_matching_table():
+    profiles = [profile_csv(p) for p in sorted(INTAKE.glob("*.csv"))]
+    link_references(profiles)
+    refs = {(p.name, c.name): c.references for p in profiles for c in p.columns if c.references}
+    assert refs[("order_line", "order_id")] == "order"
+    assert refs[("return", "order_id")] == "order"
+    assert refs[("account", "customer_id")] == "customer"
+    for column in (("customer", "external_id"), ("order_line", "line_id"),
+                   ("payment_method", "payment_id")):
+        assert column not in refs
+
+    alone = profile_csv(INTAKE / "order_line.csv")
+    link_references([alone])
+    assert all(c.references is None for c in alone.columns)
@@ -0,0 +1,63 @@
+import pytest
+
+from ontology_benchmark import SyntheticSpec, synthetic_abox, synthetic_tbox
+from ontology_builder import Ontology
+from ontology_query import query
+from ontology_store import CompactOntology
+
+
+@pytest.fixture(scope="module", params=[Ontology, CompactOntology], ids=lambda c: c.__name__)
+def ont(request):
+    ont = request.param()
+    spec = SyntheticSpec(individuals=400, edge_density=2.0, seed=9)
+    abox = synthetic_abox(spec, synthetic_tbox(ont, spec))
+    ont.bulk_load(abox.edges, abox.values, validate="off",
+                  types=[(name, c) for name, classes in abox.types for c in classes])
+    return ont
+
+
+def _rows(ont, text):
+    return sorted(tuple(row.values()) for row in query(ont, text))
+
+
+def test_typed_join_matches_naive(ont):
+    sources, targets = ont.instances_of("C1_0"), set(ont.instances_of("C2_1"))
+    expected = sorted((x, y) for x in sources for y in ont.related(x, "linksTo")
+                      if y in targets)
+    assert expected
+    assert _rows(ont, "SELECT ?x ?y WHERE { ?x a C1_0 . ?x linksTo ?y . ?y a C2_1 . }") \
+        == expected
+
+
+def test_transitive_join_matches_naive(ont):
+    targets = set(ont.instances_of("C1_2"))
+    expected = sorted({(x, z) for x in ont.individuals for y in ont.related(x, "linksTo")
+                       for z in ont.related(y, "partOf", transitive=True) if z in targets})
+    assert expected
+    assert _rows(ont, "SELECT DISTINCT ?x ?z WHERE "
+                      "{ ?z a C1_2 . ?x linksTo ?y . ?y partOf ?z }") == expected
+    assert {row["z"] for row in query(ont, "SELECT ?z WHERE { i0 partOf ?z }")} \
+        == ont.related("i0", "partOf", transitive=True)
+
+
+def test_filter_matches_naive(ont):
+    expected = sorted((x, v) for x in ont.instances_of("C2_3")
+                      for v in ont.individuals[x].data_props.get("reading", ())
+                      if 20 < v <= 60)
+    assert expected
+    assert _rows(ont, "SELECT ?x ?v WHERE "
+                      "{ ?x reading ?v . ?x a C2_3 . FILTER(?v > 20 && ?v <= 60) }") == expected
+
+
+def test_distinct_and_limit(ont):
+    everything = _rows(ont, "SELECT DISTINCT ?y WHERE { ?x linksTo ?y }")
+    assert len(everything) == len(set(everything))
+    some = _rows(ont, "SELECT DISTINCT ?y WHERE { ?x linksTo ?y } LIMIT 5")
+    assert len(some) == 5 and set(some) <= set(everything)
+
+
+def test_bad_queries_raise(ont):
+    with pytest.raises(ValueError, match="does not appear"):
+        list(query(ont, "SELECT ?q WHERE { ?x linksTo ?y }"))
+    with pytest.raises(ValueError, match="Predicate"):
+        list(query(ont, "SELECT ?x WHERE { ?x ?p ?y }"))
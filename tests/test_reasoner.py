@@ -0,0 +1,91 @@
+import random
+
+from ontology_builder import Ontology
+from ontology_reasoner import Reasoner
+
+
+def _closure(r: Reasoner) -> tuple[dict, dict]:
+    r.update()
+    types = {x: set(c) for x, c in r._types.items() if c}
+    edges = {(p, s): set(o) for p, index in r._out.items() for s, o in index.items() if o}
+    return types, edges
+
+
+def _full(ont: Ontology, reasoner: Reasoner) -> tuple[dict, dict]:
+    fresh = Reasoner(ont)
+    fresh._sub_props = {k: set(v) for k, v in reasoner._sub_props.items()}
+    fresh._chains = list(reasoner._chains)
+    try:
+        return _closure(fresh)
+    finally:
+        fresh.close()
+
+
+def _schema() -> Ontology:
+    ont = Ontology(prefix="t")
+    ont.add_class("Thing")
+    ont.add_class("Equipment", parents=["Thing"])
+    ont.add_class("Machine", parents=["Equipment"])
+    ont.add_class("Place", parents=["Thing"])
+    ont.add_object_property("locatedIn", domain="Equipment", range_="Place", transitive=True)
+    ont.add_object_property("contains", inverse_of="locatedIn")
+    ont.add_object_property("partOf", transitive=True)
+    ont.add_object_property("near", symmetric=True)
+    ont.add_object_property("hosts")
+    return ont
+
+
+def test_incremental_matches_materialize():
+    rnd = random.Random(7)
+    ont = _schema()
+    r = Reasoner(ont)
+    r.add_sub_property("contains", "hosts")
+    r.add_chain("locatedIn", ["locatedIn", "partOf"])
+    names = [f"n{k}" for k in range(40)]
+    for name in names[:10]:
+        ont.add_individual(name, [rnd.choice(["Machine", "Place"])])
+    assert _closure(r) == _full(ont, r)
+
+    for step in range(300):
+        kind = rnd.random()
+        if kind < 0.2:
+            ont.add_individual(rnd.choice(names), [rnd.choice(["Thing", "Machine", "Place"])])
+        elif kind < 0.3:
+            known = list(ont.individuals)
+            ont.add_type(rnd.choice(known), rnd.choice(["Equipment", "Place"]))
+        else:
+            known = list(ont.individuals)
+            p = rnd.choice(["locatedIn", "partOf", "near", "contains"])
+            try:
+                ont.assert_object(rnd.choice(known), p, rnd.choice(known))
+            except ValueError:
+                continue        # domain / range violation
+        if step % 25 == 0:
+            assert _closure(r) == _full(ont, r), step
+    assert _closure(r) == _full(ont, r)
+    r.close()
+
+
+def test_declaring_a_used_parent_reclassifies_members():
+    ont = Ontology(prefix="t")
+    ont.add_class("C", parents=["X"])
+    ont.add_individual("i", ["C"])
+    r = Reasoner(ont)
+    assert r.types_of("i") == {"C", "X"}
+    ont.add_class("Y")
+    ont.add_class("X", parents=["Y"])
+    assert r.types_of("i") == {"C", "X", "Y"}
+    assert r.instances_of("Y") == ["i"]
+    assert _closure(r) == _full(ont, r)
+    r.close()
+
+
+def test_new_leaf_class_keeps_incremental_state():
+    ont = _schema()
+    ont.add_individual("m", ["Machine"])
+    r = Reasoner(ont)
+    r.update()
+    ont.add_class("Robot", parents=["Machine"])
+    assert not r._stale
+    assert r.types_of("m") == {"Machine", "Equipment", "Thing"}
+    r.close()
@@ -0,0 +1,68 @@
+import pytest
+
+from ontology_benchmark import SyntheticSpec, synthetic_abox, synthetic_tbox
+from ontology_builder import Ontology
+from ontology_snapshot import SnapshotOntology, save_snapshot
+from ontology_store import CompactOntology
+
+
+def _build(cls) -> Ontology:
+    ont = cls(iri="https://example.org/snap/", prefix="snap")
+    spec = SyntheticSpec(individuals=500, edge_density=2.0, seed=3)
+    abox = synthetic_abox(spec, synthetic_tbox(ont, spec))
+    ont.bulk_load(abox.edges, abox.values, validate="off",
+                  types=[(name, c) for name, classes in abox.types for c in classes])
+    ont.add_data_property("label")
+    ont.add_data_property("count", datatype="xsd:integer")
+    ont.add_data_property("flag", datatype="xsd:boolean")
+    ont.assert_data("i1", "label", 'Grüße "quoted"\nline')
+    ont.assert_data("i1", "count", 42)
+    ont.assert_data("i2", "flag", False)
+    ont.add_individual("untyped")
+    return ont
+
+
+def _triples(ont: Ontology) -> set[str]:
+    return set(ont.to_ntriples().splitlines())
+
+
+@pytest.mark.parametrize("cls", [Ontology, CompactOntology], ids=lambda c: c.__name__)
+def test_snapshot_matches_source(cls, tmp_path):
+    source = _build(cls)
+    path = tmp_path / "snap.snap"
+    save_snapshot(source, path)
+    with SnapshotOntology(path) as snap:
+        assert _triples(snap) == _triples(source)
+        assert list(snap.individuals) == list(source.individuals)
+        for name in ("i1", "i2", "untyped", "i250"):
+            assert snap.individuals[name] == source.individuals[name]
+        for c in ("Entity", "C1_2", "C3_7"):
+            assert snap.instances_of(c) == source.instances_of(c)
+        assert snap.related("i0", "partOf", transitive=True) == \
+            source.related("i0", "partOf", transitive=True)
+        assert snap.related_inverse("i5", "linksTo") == source.related_inverse("i5", "linksTo")
+        assert sorted(snap.check_consistency()) == sorted(source.check_consistency())
+
+
+def test_snapshot_is_read_only(tmp_path):
+    path = tmp_path / "snap.snap"
+    save_snapshot(_build(Ontology), path)
+    with SnapshotOntology(path) as snap:
+        with pytest.raises(ValueError, match="read-only"):
+            snap.add_individual("new", ["Entity"])
+        with pytest.raises(ValueError, match="read-only"):
+            snap.add_class("New")
+
+
+def test_replacing_a_snapshot_keeps_open_readers(tmp_path):
+    path = tmp_path / "snap.snap"
+    first = _build(Ontology)
+    save_snapshot(first, path)
+    with SnapshotOntology(path) as snap:
+        changed = _build(Ontology)
+        changed.add_individual("later", ["Entity"])
+        save_snapshot(changed, path)
+        assert "later" not in snap.individuals
+        assert _triples(snap) == _triples(first)
+    with Ontology.open_snapshot(path) as snap:
+        assert "later" in snap.individuals
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from ontology_benchmark import SyntheticSpec, synthetic_abox, synthetic_tbox
+from ontology_builder import Ontology
+from ontology_store import CompactOntology, TripleIndex
+
+
+def _backends() -> list:
+    backends = [Ontology, CompactOntology]
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return backends
+    from ontology_duckdb import DuckDBOntology
+
+    return backends + [DuckDBOntology]
+
+
+def _build(cls) -> Ontology:
+    """Bulk batches large enough to take `TripleIndex.add_keys`, into an
+    empty index and then a filled one, followed by single edits."""
+    ont = cls()
+    spec = SyntheticSpec(individuals=3000, edge_density=2.0, seed=5)
+    abox = synthetic_abox(spec, synthetic_tbox(ont, spec))
+    ont.bulk_load(abox.edges[:2500], abox.values, validate="off",
+                  types=[(name, c) for name, classes in abox.types for c in classes])
+    ont.bulk_load(abox.edges[2500:] + abox.edges[:100], validate="off")
+    ont.add_individual("extra", ["C3_5"])
+    ont.assert_object("extra", "linksTo", "i1")
+    ont.assert_object("i2", "partOf", "extra")
+    ont.assert_data("extra", "reading", 1.5)
+    ont.add_type("i3", "C3_9")
+    return ont
+
+
+@pytest.fixture(scope="module")
+def reference() -> Ontology:
+    return _build(Ontology)
+
+
+@pytest.mark.parametrize("cls", _backends()[1:], ids=lambda c: c.__name__)
+def test_backends_agree(cls, reference):
+    ont = _build(cls)
+    try:
+        assert len(ont.individuals) == len(reference.individuals)
+        assert set(ont.to_ntriples().splitlines()) == set(reference.to_ntriples().splitlines())
+        for c in reference.classes:
+            assert ont.instances_of(c) == reference.instances_of(c), c
+        rnd = random.Random(1)
+        for name in rnd.sample(sorted(reference.individuals), 200) + ["extra", "i1"]:
+            for p in ("linksTo", "partOf"):
+                assert ont.related(name, p) == reference.related(name, p)
+                assert ont.related(name, p, transitive=True) == \
+                    reference.related(name, p, transitive=True)
+                assert ont.related_inverse(name, p) == reference.related_inverse(name, p)
+            assert ont.individuals[name] == reference.individuals[name]
+        assert sorted(ont.check_consistency()) == sorted(reference.check_consistency())
+    finally:
+        getattr(ont, "close", lambda: None)()
+
+
+def test_add_keys_matches_a_set():
+    rnd = random.Random(3)
+
+    def pack(t):
+        return t[0] << 64 | t[1] << 32 | t[2]
+
+    for _ in range(200):
+        idx, ref = TripleIndex(), set()
+        for _ in range(rnd.randrange(1, 4)):
+            batch = [(rnd.randrange(20), rnd.randrange(5), rnd.randrange(30))
+                     for _ in range(rnd.randrange(300))]
+            for t in batch[:rnd.randrange(20)]:
+                idx.add(*t)
+                ref.add(t)
+            for t in sorted(ref)[:rnd.randrange(5)]:
+                idx.discard(*t)
+                ref.discard(t)
+            added = idx.add_keys(pack(t) for t in batch)
+            assert added == sorted(pack(t) for t in set(batch) - ref)
+            ref.update(batch)
+            assert list(idx) == sorted(ref)
+            assert len(idx) == len(ref)